@@ -12,7 +12,7 @@ echo "Backend port: $BACKEND_PORT"
 # Function to handle shutdown
 cleanup() {
     echo "Shutting down services..."
-    kill $BACKEND_PID $FRONTEND_PID 2>/dev/null || true
+    kill $BACKEND_PID $FRONTEND_PID $WORKER_PID 2>/dev/null || true
     exit 0
 }
 
@@ -24,10 +24,18 @@ echo "Starting backend on port $BACKEND_PORT..."
 echo "Testing Python imports..."
 python -c "import main; print('Backend imports OK')" 2>&1 || echo "Backend import failed!"
 echo "Starting uvicorn..."
-uvicorn main:app --host 0.0.0.0 --port $BACKEND_PORT 2>&1 &
+uvicorn main:app --host 0.0.0.0 --port $BACKEND_PORT --workers ${UVICORN_WORKERS:-1} 2>&1 &
 BACKEND_PID=$!
 echo "Backend PID: $BACKEND_PID"
 
+# Start batch worker (BATCH_EXECUTION=queue only)
+if [ "$BATCH_EXECUTION" = "queue" ]; then
+    echo "Starting batch worker..."
+    python batch_worker.py --processes ${BATCH_WORKER_PROCESSES:-1} 2>&1 &
+    WORKER_PID=$!
+    echo "Batch worker PID: $WORKER_PID"
+fi
+
 # Wait for backend to be ready (max 60 seconds)
 echo "Waiting for backend to be ready..."
 for i in $(seq 1 60); do
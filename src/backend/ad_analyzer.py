@@ -2,18 +2,56 @@
 의료 광고 위반 분석 모듈
 """
 
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import os
 import re
 import json
 import asyncio
-from openai import OpenAI, AsyncOpenAI
+import hashlib
+import unicodedata
+from openai import AsyncOpenAI
 from medical_keywords import keyword_db
+from result_cache import get_llm_cache, make_cache_key
+from provider_limits import (
+    PROVIDER_OPENAI_RESPONSES,
+    estimate_tokens,
+    get_provider_limiter,
+    response_total_tokens,
+)
+from resilience import call_with_retry
+from prompts import (
+    ANALYSIS_CACHE_KEY,
+    ANALYSIS_INSTRUCTIONS,
+    ANALYSIS_PROMPT_VERSION,
+    JUDGMENT_INSTRUCTIONS,
+    JUDGMENT_PROMPT_VERSION,
+    STRUCTURED_CACHE_KEY,
+    STRUCTURED_INSTRUCTIONS,
+    STRUCTURED_PROMPT_VERSION,
+    build_analysis_input,
+    build_judgment_input,
+    get_prompt_usage_stats,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
 
 
+# ============================================
+# LLM 모델 (프롬프트와 프롬프트 버전은 prompts.py에서 관리)
+# ============================================
+
+ANALYSIS_MODEL = "gpt-5.2"
+JUDGMENT_MODEL = "gpt-4.1-mini"
+
+# 비동기 분석 파이프라인 방식
+# - two_stage: 1차 자유 형식 분석 + 2차 판정 추출 (기본)
+# - structured: 분석/위험점수/위반사항을 JSON 스키마 출력 1회 호출로 생성
+PIPELINE_TWO_STAGE = "two_stage"
+PIPELINE_STRUCTURED = "structured"
+ANALYSIS_PIPELINE = os.getenv("ANALYSIS_PIPELINE", PIPELINE_TWO_STAGE).lower()
+
+
 # ============================================
 # 위험점수 → 위험도 → 판정 자동 계산 함수
 # ============================================
@@ -75,29 +113,97 @@ _rag_initialized = False
 _rag_retriever = None
 
 
-def _get_rag_context(text: str) -> str:
-    """RAG를 사용하여 관련 법규 컨텍스트 검색"""
+def _ensure_rag_retriever():
+    """RAG 리트리버 지연 초기화"""
     global _rag_initialized, _rag_retriever
 
-    try:
-        if not _rag_initialized:
-            from rag.retriever import get_retriever
-            from rag.vector_store import initialize_vector_store
+    if not _rag_initialized:
+        from rag.retriever import get_retriever
+        from rag.vector_store import initialize_vector_store
 
-            initialize_vector_store()
-            _rag_retriever = get_retriever()
-            _rag_initialized = True
+        initialize_vector_store()
+        _rag_retriever = get_retriever()
+        _rag_initialized = True
 
-        if _rag_retriever:
-            return _rag_retriever.build_rag_context(text, top_k=5)
+    return _rag_retriever
+
+
+def _get_rag_context(text: str) -> str:
+    """RAG를 사용하여 관련 법규 컨텍스트 검색"""
+    try:
+        retriever = _ensure_rag_retriever()
+        if retriever:
+            return retriever.build_rag_context(text, top_k=5)
     except Exception as e:
         print(f"[RAG] 컨텍스트 검색 실패: {e}")
 
     return ""
 
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def _get_rag_contexts_batch(texts: List[str]) -> List[str]:
+    """여러 텍스트의 관련 법규 컨텍스트 일괄 검색 (임베딩 1회 호출)"""
+    if not texts:
+        return []
+
+    try:
+        retriever = _ensure_rag_retriever()
+        if retriever:
+            return retriever.build_rag_context_batch(texts, top_k=5)
+    except Exception as e:
+        print(f"[RAG] 일괄 컨텍스트 검색 실패: {e}")
+
+    return ["" for _ in texts]
+
+
+def normalize_ad_text(text: str) -> str:
+    """캐시 키용 광고 텍스트 정규화 (유니코드 NFKC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _analysis_cache_key(text: str, rag_context: str, keyword_context: str) -> str:
+    """1차 AI 분석 캐시 키 (정규화 텍스트 + 컨텍스트 해시 + 프롬프트 버전 + 모델)"""
+    context_hash = hashlib.sha256(
+        f"{rag_context}\n{keyword_context}".encode("utf-8")
+    ).hexdigest()
+    return make_cache_key(
+        "analysis",
+        ANALYSIS_MODEL,
+        ANALYSIS_PROMPT_VERSION,
+        context_hash,
+        normalize_ad_text(text),
+    )
+
+
+def _structured_cache_key(text: str, rag_context: str, keyword_context: str) -> str:
+    """구조화 분석 캐시 키 (정규화 텍스트 + 컨텍스트 해시 + 프롬프트 버전 + 모델)"""
+    context_hash = hashlib.sha256(
+        f"{rag_context}\n{keyword_context}".encode("utf-8")
+    ).hexdigest()
+    return make_cache_key(
+        "structured",
+        ANALYSIS_MODEL,
+        STRUCTURED_PROMPT_VERSION,
+        context_hash,
+        normalize_ad_text(text),
+    )
+
+
+def _judgment_cache_key(
+    ai_analysis_text: str, keyword_count: int, keyword_risk_score: int
+) -> str:
+    """2차 판정 캐시 키 (정규화 분석 텍스트 + 키워드 결과 + 프롬프트 버전 + 모델)"""
+    return make_cache_key(
+        "judgment",
+        JUDGMENT_MODEL,
+        JUDGMENT_PROMPT_VERSION,
+        keyword_count,
+        keyword_risk_score,
+        normalize_ad_text(ai_analysis_text),
+    )
+
+
+# 재시도는 resilience 모듈에서 서킷 브레이커와 함께 처리 (SDK 자체 재시도 비활성화)
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
 
 
 class ViolationResult:
@@ -152,39 +258,35 @@ def analyze_keywords(text: str) -> ViolationResult:
     """
     result = ViolationResult()
 
-    # 텍스트를 소문자로 변환하여 검색
-    text_lower = text.lower()
-
-    # 각 키워드 검색
-    for keyword in keyword_db.get_all_keywords():
-        keyword_lower = keyword.lower()
-
-        # 키워드 출현 횟수 계산
-        count = text_lower.count(keyword_lower)
-
-        if count > 0:
-            category, severity, law, description = keyword_db.get_keyword_info(keyword)
-            base_score = keyword_db.get_severity_score(severity)
-
-            # 반복 가산점: 첫 번째는 기본 점수, 이후 +5점/회
-            repetition_bonus = (count - 1) * 5 if count > 1 else 0
-            total_keyword_score = base_score + repetition_bonus
-
-            # 위반 항목 추가
-            violation = {
-                "keyword": keyword,
-                "category": category,
-                "severity": severity,
-                "score": base_score,
-                "count": count,
-                "repetition_bonus": repetition_bonus,
-                "total_score": total_keyword_score,
-                "law": law,
-                "description": description,
-                "context": _extract_context(text, keyword),
-            }
-            result.violations.append(violation)
-            result.total_score += total_keyword_score
+    # 전체 키워드를 한 번의 텍스트 순회로 검색 (Aho-Corasick)
+    matches = keyword_db.get_matcher().find_all(text)
+
+    for keyword, positions in matches.items():
+        # 키워드 출현 횟수
+        count = len(positions)
+
+        category, severity, law, description = keyword_db.get_keyword_info(keyword)
+        base_score = keyword_db.get_severity_score(severity)
+
+        # 반복 가산점: 첫 번째는 기본 점수, 이후 +5점/회
+        repetition_bonus = (count - 1) * 5 if count > 1 else 0
+        total_keyword_score = base_score + repetition_bonus
+
+        # 위반 항목 추가
+        violation = {
+            "keyword": keyword,
+            "category": category,
+            "severity": severity,
+            "score": base_score,
+            "count": count,
+            "repetition_bonus": repetition_bonus,
+            "total_score": total_keyword_score,
+            "law": law,
+            "description": description,
+            "context": _extract_context(text, positions[0], len(keyword)),
+        }
+        result.violations.append(violation)
+        result.total_score += total_keyword_score
 
     # 위험도 계산
     result.risk_level = _calculate_risk_level(result.total_score)
@@ -195,17 +297,10 @@ def analyze_keywords(text: str) -> ViolationResult:
     return result
 
 
-def _extract_context(text: str, keyword: str, window: int = 30) -> str:
-    """키워드 주변 문맥 추출"""
-    text_lower = text.lower()
-    keyword_lower = keyword.lower()
-
-    idx = text_lower.find(keyword_lower)
-    if idx == -1:
-        return ""
-
+def _extract_context(text: str, idx: int, length: int, window: int = 30) -> str:
+    """키워드 출현 위치 주변 문맥 추출"""
     start = max(0, idx - window)
-    end = min(len(text), idx + len(keyword) + window)
+    end = min(len(text), idx + length + window)
 
     context = text[start:end]
     if start > 0:
@@ -253,84 +348,82 @@ def _generate_summary(result: ViolationResult) -> str:
     return summary
 
 
-def analyze_with_ai(
-    text: str, keyword_result: Optional[ViolationResult] = None, use_rag: bool = True
-) -> str:
+def _build_keyword_context(keyword_result: Optional["ViolationResult"]) -> str:
+    """1차 분석 프롬프트용 키워드 분석 결과 (상위 10개)"""
+    if not keyword_result or not keyword_result.violations:
+        return ""
+    violations_text = "\n".join(
+        [
+            f"- {v['keyword']} ({v['category']}, {v['severity']})"
+            for v in keyword_result.violations[:10]  # 상위 10개만
+        ]
+    )
+    return f"## 키워드 분석 결과\n다음 위반 키워드가 발견되었습니다:\n{violations_text}"
+
+
+def build_analysis_request(
+    text: str, keyword_result: Optional["ViolationResult"] = None, rag_context: str = ""
+) -> Tuple[Dict[str, Any], str]:
     """
-    OpenAI를 사용한 심층 광고 분석 (RAG 지원)
+    1차 AI 분석 요청 본문(Responses API)과 캐시 키 생성
+    실시간/스트리밍/Batch API 제출이 같은 요청과 캐시를 공유하도록 한 곳에서 구성
 
     Args:
         text: 분석할 텍스트
-        keyword_result: 키워드 분석 결과 (선택)
-        use_rag: RAG 사용 여부
+        keyword_result: 키워드 분석 결과
+        rag_context: 검색된 RAG 컨텍스트 (없으면 빈 문자열)
 
     Returns:
-        str: AI 분석 결과
+        (요청 본문, 캐시 키)
     """
+    keyword_context = _build_keyword_context(keyword_result)
+
+    # 고정 접두부(instructions)는 모든 요청이 동일 → 제공자 측 프롬프트 캐시 적중
+    prompt = build_analysis_input(text, rag_context, keyword_context)
+    body = {
+        "model": ANALYSIS_MODEL,
+        "instructions": ANALYSIS_INSTRUCTIONS,
+        "input": [{"role": "user", "content": prompt}],
+        "max_output_tokens": 1500,  # reasoning 토큰 + 실제 응답 토큰
+        "prompt_cache_key": ANALYSIS_CACHE_KEY,
+    }
+    return body, _analysis_cache_key(text, rag_context, keyword_context)
 
-    # 키워드 분석 결과를 컨텍스트로 포함
-    keyword_context = ""
-    if keyword_result and keyword_result.violations:
-        violations_text = "\n".join(
-            [
-                f"- {v['keyword']} ({v['category']}, {v['severity']})"
-                for v in keyword_result.violations[:10]  # 상위 10개만
-            ]
-        )
-        keyword_context = f"\n\n## 키워드 분석 결과\n다음 위반 키워드가 발견되었습니다:\n{violations_text}"
-
-    # RAG로 관련 법규 검색
-    rag_context = ""
-    if use_rag:
-        rag_context = _get_rag_context(text)
-        if rag_context:
-            rag_context = f"\n\n{rag_context}"
-
-    prompt = f"""당신은 대한민국 의료법 전문가입니다. 다음 의료 광고 텍스트를 분석하여 의료법 위반 여부를 판단하세요.
-{rag_context}
-{keyword_context}
-
-## 분석 대상 광고 텍스트
-{text}
-
-## 요청사항
-위 법규 조항을 근거로 광고의 위반 여부를 판정하고, 각 판정에 대해 정확한 법규 조항을 인용해주세요.
 
-다음 형식으로 분석 결과를 제공하세요:
+def estimate_request_tokens(body: Dict[str, Any]) -> int:
+    """Responses 요청 본문의 예상 토큰 수 (입력 + 최대 출력)"""
+    prompt = "".join(message["content"] for message in body["input"])
+    return estimate_tokens(body.get("instructions", "") + prompt) + body["max_output_tokens"]
 
-**위반 사항:**
-- 발견된 위반 내용을 구체적으로 나열
 
-**법적 근거:**
-- 해당하는 의료법 조항 명시 (RAG 검색 결과 활용)
+def analyze_with_ai(
+    text: str, keyword_result: Optional[ViolationResult] = None, use_rag: bool = True
+) -> str:
+    """
+    OpenAI를 사용한 심층 광고 분석 (동기 래퍼, analyze_with_ai_async를 분석 엔진 이벤트 루프에서 실행)
 
-**권고 사항:**
-- 광고 수정 방안 제시
+    Args:
+        text: 분석할 텍스트
+        keyword_result: 키워드 분석 결과 (선택)
+        use_rag: RAG 사용 여부
 
-**전체 평가:**
-- 위험도 (안전/낮음/보통/높음/매우높음)
-- 종합 의견
-"""
+    Returns:
+        str: AI 분석 결과
 
-    try:
-        response = client.responses.create(
-            model="gpt-5.2",
-            instructions="당신은 대한민국 의료법 전문가입니다. 제공된 법규 조항을 정확히 인용하여 분석하세요.",
-            input=[{"role": "user", "content": prompt}],
-            max_output_tokens=1500,  # reasoning 토큰 + 실제 응답 토큰
-        )
+    Raises:
+        Exception: 재시도 후에도 OpenAI 호출이 실패하거나 서킷이 열린 경우
+    """
+    from analysis_engine import run_sync
 
-        return response.output_text or ""
-
-    except Exception as e:
-        return f"AI 분석 중 오류 발생: {str(e)}"
+    return run_sync(analyze_with_ai_async(text, keyword_result, use_rag=use_rag))
 
 
 def analyze_complete(
     text: str, use_ai: bool = True, use_rag: bool = True
 ) -> ViolationResult:
     """
-    완전한 광고 분석 (키워드 + AI)
+    완전한 광고 분석 (동기 래퍼, 키워드 → RAG → 1차 AI → 2차 판정)
+    CLI/스크립트용이며, 비동기 코드에서는 analyze_complete_async를 사용
 
     Args:
         text: 분석할 텍스트
@@ -340,26 +433,32 @@ def analyze_complete(
     Returns:
         ViolationResult: 종합 분석 결과
     """
-    # 1. 키워드 기반 분석
-    result = analyze_keywords(text)
-
-    # 2. AI 분석 (옵션)
-    if use_ai and os.getenv("OPENAI_API_KEY"):
-        try:
-            result.ai_analysis = analyze_with_ai(text, result, use_rag=use_rag)
-        except Exception as e:
-            result.ai_analysis = f"AI 분석 실패: {str(e)}"
+    from analysis_engine import get_sync_analysis_engine
 
-    return result
+    return get_sync_analysis_engine().analyze_text(text, use_ai=use_ai, use_rag=use_rag)
 
 
-async def _get_rag_context_async(text: str) -> str:
+async def get_rag_context_async(text: str) -> str:
     """비동기 RAG 컨텍스트 검색"""
     # RAG는 CPU-bound이므로 executor에서 실행
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, _get_rag_context, text)
 
 
+async def get_rag_contexts_batch_async(texts: List[str]) -> List[str]:
+    """
+    비동기 RAG 컨텍스트 일괄 검색 (배치 분석용)
+
+    Args:
+        texts: 분석할 텍스트 리스트
+
+    Returns:
+        텍스트 순서와 동일한 RAG 컨텍스트 리스트 (실패 시 빈 문자열)
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, _get_rag_contexts_batch, texts)
+
+
 async def analyze_with_ai_async(
     text: str,
     keyword_result: Optional[ViolationResult] = None,
@@ -377,63 +476,114 @@ async def analyze_with_ai_async(
 
     Returns:
         str: AI 분석 결과
-    """
-    # 키워드 분석 결과를 컨텍스트로 포함
-    keyword_context = ""
-    if keyword_result and keyword_result.violations:
-        violations_text = "\n".join(
-            [
-                f"- {v['keyword']} ({v['category']}, {v['severity']})"
-                for v in keyword_result.violations[:10]
-            ]
-        )
-        keyword_context = f"\n\n## 키워드 분석 결과\n다음 위반 키워드가 발견되었습니다:\n{violations_text}"
 
+    Raises:
+        Exception: 재시도 후에도 OpenAI 호출이 실패하거나 서킷이 열린 경우
+    """
     # RAG 컨텍스트 (미리 제공되지 않은 경우 검색)
     if use_rag and not rag_context:
-        rag_context = await _get_rag_context_async(text)
+        rag_context = await get_rag_context_async(text)
 
-    if rag_context:
-        rag_context = f"\n\n{rag_context}"
+    body, cache_key = build_analysis_request(text, keyword_result, rag_context)
 
-    prompt = f"""당신은 대한민국 의료법 전문가입니다. 다음 의료 광고 텍스트를 분석하여 의료법 위반 여부를 판단하세요.
-{rag_context}
-{keyword_context}
+    # 캐시 조회 (동일 텍스트/컨텍스트 재분석 시 API 호출 생략)
+    cache = get_llm_cache()
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
 
-## 분석 대상 광고 텍스트
-{text}
+    limiter = get_provider_limiter(PROVIDER_OPENAI_RESPONSES)
+    estimated = estimate_request_tokens(body)
 
-## 요청사항
-위 법규 조항을 근거로 광고의 위반 여부를 판정하고, 각 판정에 대해 정확한 법규 조항을 인용해주세요.
+    async def request():
+        await limiter.acquire(estimated)
+        return await async_client.responses.create(**body)
 
-다음 형식으로 분석 결과를 제공하세요:
+    # 실패 시 예외를 그대로 전달 (오류 문자열이 2차 판정에 입력되지 않도록)
+    response = await call_with_retry(PROVIDER_OPENAI_RESPONSES, request)
+    await limiter.settle(estimated, response_total_tokens(response))
+    get_prompt_usage_stats().record("analysis", response)
 
-**위반 사항:**
-- 발견된 위반 내용을 구체적으로 나열
+    output_text = response.output_text or ""
+    if cache is not None and output_text:
+        await cache.aset(cache_key, output_text)
 
-**법적 근거:**
-- 해당하는 의료법 조항 명시 (RAG 검색 결과 활용)
+    return output_text
 
-**권고 사항:**
-- 광고 수정 방안 제시
 
-**전체 평가:**
-- 위험도 (안전/낮음/보통/높음/매우높음)
-- 종합 의견
-"""
+async def stream_with_ai_async(
+    text: str,
+    keyword_result: Optional[ViolationResult] = None,
+    use_rag: bool = True,
+    rag_context: str = "",
+) -> AsyncIterator[str]:
+    """
+    1차 AI 분석 스트리밍 (Responses API stream=True)
+    analyze_with_ai_async와 같은 프롬프트/캐시를 사용하며, 출력 텍스트 조각을 도착 순서대로 반환
 
-    try:
-        response = await async_client.responses.create(
-            model="gpt-5.2",
-            instructions="당신은 대한민국 의료법 전문가입니다. 제공된 법규 조항을 정확히 인용하여 분석하세요.",
-            input=[{"role": "user", "content": prompt}],
-            max_output_tokens=1500,
-        )
+    Args:
+        text: 분석할 텍스트
+        keyword_result: 키워드 분석 결과
+        use_rag: RAG 사용 여부
+        rag_context: 미리 검색된 RAG 컨텍스트
 
-        return response.output_text or ""
+    Yields:
+        str: AI 분석 텍스트 조각 (캐시 적중 시 전체 텍스트 1개)
 
-    except Exception as e:
-        return f"AI 분석 중 오류 발생: {str(e)}"
+    Raises:
+        Exception: 재시도 후에도 OpenAI 호출이 실패하거나 서킷이 열린 경우
+    """
+    if use_rag and not rag_context:
+        rag_context = await get_rag_context_async(text)
+
+    body, cache_key = build_analysis_request(text, keyword_result, rag_context)
+
+    cache = get_llm_cache()
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    limiter = get_provider_limiter(PROVIDER_OPENAI_RESPONSES)
+    estimated = estimate_request_tokens(body)
+
+    async def request():
+        await limiter.acquire(estimated)
+        return await async_client.responses.create(**body, stream=True)
+
+    # 스트림 연결까지만 재시도 (출력이 시작된 뒤에는 재시도하지 않음)
+    stream = await call_with_retry(PROVIDER_OPENAI_RESPONSES, request)
+
+    # 소비 측이 중간에 멈춰도(클라이언트 연결 종료) 업스트림 연결을 닫음
+    chunks = []
+    async with stream:
+        async for event in stream:
+            if event.type == "response.output_text.delta":
+                chunks.append(event.delta)
+                yield event.delta
+            elif event.type == "response.completed":
+                await limiter.settle(estimated, response_total_tokens(event.response))
+                get_prompt_usage_stats().record("analysis", event.response)
+            elif event.type == "response.incomplete":
+                # max_output_tokens 등으로 잘린 분석은 캐시하지 않고 실패 처리
+                await limiter.settle(estimated, response_total_tokens(event.response))
+                get_prompt_usage_stats().record("analysis", event.response)
+                details = event.response.incomplete_details
+                reason = getattr(details, "reason", None) or "unknown"
+                raise RuntimeError(f"AI 분석 응답이 완료되지 않았습니다 ({reason})")
+            elif event.type == "response.failed":
+                await limiter.settle(estimated, response_total_tokens(event.response))
+                error = event.response.error
+                message = getattr(error, "message", None) or event.type
+                raise RuntimeError(f"AI 분석 스트림 오류: {message}")
+            elif event.type == "error":
+                raise RuntimeError(f"AI 분석 스트림 오류: {event.message}")
+
+    output_text = "".join(chunks)
+    if cache is not None and output_text:
+        await cache.aset(cache_key, output_text)
 
 
 # ============================================
@@ -495,137 +645,283 @@ async def extract_final_judgment(
             "summary": "한 줄 요약"
         }
     """
-    prompt = f"""다음은 의료광고에 대한 AI 분석 결과입니다. 이 분석을 바탕으로 위험점수와 위반사항을 JSON 형식으로 추출하세요.
-
-## AI 분석 결과
-{ai_analysis_text}
-
-## 키워드 분석 결과
-- 발견된 위반 키워드: {len(keyword_violations)}건
-- 키워드 위험점수: {keyword_risk_score}점
-
-## 요청사항
-1. 먼저 이 광고가 **의료광고인지** 판단하세요.
-   - 의료기관, 의료행위, 의료기기, 의약품 등 의료 관련 내용이 포함되어야 의료광고입니다.
-   - 의료 관련 문구가 없으면 의료광고가 아닙니다.
-
-2. 의료광고인 경우 **위험점수(0-100점)**를 산정하세요.
-3. 의료광고가 아닌 경우 **위험점수를 -1**로 설정하세요.
-
-반드시 다음 JSON 형식으로만 응답하세요:
-
-```json
-{{
-  "is_medical_ad": true|false,
-  "risk_score": -1 또는 0-100,
-  "violations": [
-    {{"type": "위반유형", "description": "설명", "severity": "HIGH|MEDIUM|LOW"}}
-  ],
-  "summary": "한 줄 요약"
-}}
-```
-
-위험점수 산정 기준:
-- -1점: 의료광고 아님 (불필요)
-- 0-10점: 위반 없음, 안전 (통과)
-- 11-30점: 경미한 위반, 주의 필요 (주의)
-- 31-60점: 중간 수준 위반, 수정 필요 (수정제안)
-- 61-80점: 심각한 위반, 반드시 수정 (수정권고)
-- 81-100점: 매우 심각한 위반, 게재 불가 (게재불가)
-
-※ 위험도와 판정은 위험점수 기반으로 시스템이 자동 계산합니다.
-"""
+    prompt = build_judgment_input(
+        ai_analysis_text, len(keyword_violations), keyword_risk_score
+    )
 
-    try:
-        response = await async_client.responses.create(
-            model="gpt-4.1-mini",  # 간단한 추출 작업이므로 빠른 모델 사용
-            instructions="JSON 형식으로만 응답하세요. 다른 텍스트 없이 JSON만 출력합니다.",
+    # 캐시 조회 (동일한 1차 분석 결과면 2차 호출 생략)
+    cache = get_llm_cache()
+    cache_key = _judgment_cache_key(
+        ai_analysis_text, len(keyword_violations), keyword_risk_score
+    )
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    limiter = get_provider_limiter(PROVIDER_OPENAI_RESPONSES)
+    estimated = estimate_tokens(JUDGMENT_INSTRUCTIONS + prompt) + 500
+
+    async def request():
+        await limiter.acquire(estimated)
+        return await async_client.responses.create(
+            model=JUDGMENT_MODEL,  # 간단한 추출 작업이므로 빠른 모델 사용
+            instructions=JUDGMENT_INSTRUCTIONS,
             input=[{"role": "user", "content": prompt}],
             max_output_tokens=500,
         )
 
+    try:
+        response = await call_with_retry(PROVIDER_OPENAI_RESPONSES, request)
+        await limiter.settle(estimated, response_total_tokens(response))
+        get_prompt_usage_stats().record("judgment", response)
+
         response_text = response.output_text or ""
-        return parse_judgment_json(response_text)
+        judgment = parse_judgment_json(response_text)
+        if cache is not None and judgment is not None:
+            await cache.aset(cache_key, judgment)
+
+        return judgment
 
     except Exception as e:
         print(f"[2차 LLM] 판정 추출 실패: {e}")
         return None
 
 
+# ============================================
+# 구조화 출력 단일 호출 분석 (ANALYSIS_PIPELINE=structured)
+# ============================================
+
+# OpenAI structured outputs(strict) 스키마: 모든 필드 필수, 추가 필드 불가
+STRUCTURED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {
+            "type": "string",
+            "description": "위반 사항, 법적 근거, 권고 사항, 전체 평가를 포함한 상세 분석 (마크다운)",
+        },
+        "is_medical_ad": {"type": "boolean"},
+        "risk_score": {
+            "type": "integer",
+            "description": "의료광고가 아니면 -1, 의료광고면 0-100",
+        },
+        "violations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "type": {"type": "string"},
+                    "description": {"type": "string"},
+                    "severity": {"type": "string", "enum": ["HIGH", "MEDIUM", "LOW"]},
+                },
+                "required": ["type", "description", "severity"],
+                "additionalProperties": False,
+            },
+        },
+        "summary": {"type": "string"},
+    },
+    "required": ["analysis", "is_medical_ad", "risk_score", "violations", "summary"],
+    "additionalProperties": False,
+}
+
+
+def validate_structured_analysis(data: Dict) -> Dict:
+    """
+    구조화 분석 결과 검증 및 정규화
+
+    Args:
+        data: 스키마 출력으로 받은 JSON 객체
+
+    Returns:
+        검증된 딕셔너리 (위험점수는 -1 또는 0-100 범위로 보정)
+
+    Raises:
+        ValueError: 필수 필드 누락 또는 타입 오류
+    """
+    if not isinstance(data, dict):
+        raise ValueError("구조화 분석 결과가 JSON 객체가 아닙니다.")
+
+    missing = [key for key in STRUCTURED_ANALYSIS_SCHEMA["required"] if key not in data]
+    if missing:
+        raise ValueError(f"구조화 분석 결과 필드 누락: {', '.join(missing)}")
+
+    risk_score = data["risk_score"]
+    if isinstance(risk_score, bool) or not isinstance(risk_score, (int, float)):
+        raise ValueError(f"risk_score 형식 오류: {risk_score!r}")
+    if not isinstance(data["violations"], list):
+        raise ValueError("violations 형식 오류")
+
+    is_medical_ad = bool(data["is_medical_ad"])
+    risk_score = -1 if not is_medical_ad or risk_score < 0 else min(100, int(risk_score))
+
+    return {
+        "analysis": str(data["analysis"]),
+        "is_medical_ad": is_medical_ad,
+        "risk_score": risk_score,
+        "violations": [v for v in data["violations"] if isinstance(v, dict)],
+        "summary": str(data["summary"]),
+    }
+
+
+async def analyze_structured_async(
+    text: str,
+    keyword_result: Optional[ViolationResult] = None,
+    use_rag: bool = True,
+    rag_context: str = "",
+) -> Dict:
+    """
+    상세 분석 + 위험점수 + 위반사항을 한 번의 구조화 출력 호출로 생성
+
+    Args:
+        text: 분석할 텍스트
+        keyword_result: 키워드 분석 결과
+        use_rag: RAG 사용 여부
+        rag_context: 미리 검색된 RAG 컨텍스트 (병렬 처리 시)
+
+    Returns:
+        validate_structured_analysis 형식의 딕셔너리
+
+    Raises:
+        Exception: OpenAI 호출 실패 또는 스키마 검증 실패
+    """
+    keyword_context = _build_keyword_context(keyword_result)
+
+    if use_rag and not rag_context:
+        rag_context = await get_rag_context_async(text)
+
+    prompt = build_analysis_input(text, rag_context, keyword_context)
+
+    cache = get_llm_cache()
+    cache_key = _structured_cache_key(text, rag_context, keyword_context)
+    if cache is not None:
+        cached = await cache.aget(cache_key)
+        if cached is not None:
+            return cached
+
+    limiter = get_provider_limiter(PROVIDER_OPENAI_RESPONSES)
+    estimated = estimate_tokens(STRUCTURED_INSTRUCTIONS + prompt) + 2000
+
+    async def request():
+        await limiter.acquire(estimated)
+        return await async_client.responses.create(
+            model=ANALYSIS_MODEL,
+            instructions=STRUCTURED_INSTRUCTIONS,
+            input=[{"role": "user", "content": prompt}],
+            prompt_cache_key=STRUCTURED_CACHE_KEY,
+            text={
+                "format": {
+                    "type": "json_schema",
+                    "name": "medical_ad_review",
+                    "schema": STRUCTURED_ANALYSIS_SCHEMA,
+                    "strict": True,
+                }
+            },
+            max_output_tokens=2000,  # 상세 분석 + JSON 필드
+        )
+
+    response = await call_with_retry(PROVIDER_OPENAI_RESPONSES, request)
+    await limiter.settle(estimated, response_total_tokens(response))
+    get_prompt_usage_stats().record("structured", response)
+
+    analysis = validate_structured_analysis(json.loads(response.output_text or ""))
+    if cache is not None:
+        await cache.aset(cache_key, analysis)
+
+    return analysis
+
+
+def apply_final_judgment(result: ViolationResult, final_judgment: Dict):
+    """2차 판정/구조화 분석 결과를 최종 결과에 반영 (위험도/판정은 위험점수 기반 자동 계산)"""
+    # 위험점수 설정 (LLM 결과)
+    result.risk_score = int(final_judgment.get("risk_score", result.keyword_risk_score))
+
+    # 위험도 자동 계산 (위험점수 기반)
+    result.risk_level = calculate_risk_level(result.risk_score)
+
+    # 판정 자동 계산 (위험도 기반)
+    result.judgment = calculate_judgment(result.risk_level)
+
+    # AI 위반 사항
+    result.ai_violations = final_judgment.get("violations", [])
+
+    # 요약 업데이트
+    if final_judgment.get("summary"):
+        result.summary = final_judgment["summary"]
+
+
+async def finalize_ai_analysis(result: ViolationResult, ai_analysis_text: str):
+    """
+    1차 AI 분석 결과로 2차 판정을 추출해 최종 결과에 반영
+    실시간/스트리밍/Batch API 경로가 같은 판정 단계를 사용
+
+    Args:
+        result: 키워드 분석 결과 (keyword_risk_score 설정됨, 갱신됨)
+        ai_analysis_text: 1차 AI 분석 텍스트
+    """
+    result.ai_analysis = ai_analysis_text  # 상세 표시용 유지
+
+    final_judgment = await extract_final_judgment(
+        ai_analysis_text, result.violations, result.keyword_risk_score
+    )
+
+    # 최종 결과 통합
+    if final_judgment:
+        apply_final_judgment(result, final_judgment)
+    else:
+        # 2차 LLM 실패 시 키워드 결과 유지
+        print("[분석] 2차 LLM 판정 추출 실패, 키워드 분석 결과 사용")
+
+
 async def analyze_complete_async(
-    text: str, use_ai: bool = True, use_rag: bool = True
+    text: str,
+    use_ai: bool = True,
+    use_rag: bool = True,
+    rag_context: Optional[str] = None,
+    pipeline: Optional[str] = None,
 ) -> ViolationResult:
     """
-    비동기 완전한 광고 분석 (3단계: 키워드 → 1차 AI → 2차 LLM 판정)
+    비동기 완전한 광고 분석 (AnalysisEngine: 키워드 → RAG → 1차 AI → 2차 LLM 판정)
+    structured 파이프라인은 1차 AI/2차 판정을 구조화 출력 1회 호출로 처리
 
     Args:
         text: 분석할 텍스트
         use_ai: AI 분석 사용 여부
         use_rag: RAG 사용 여부
+        rag_context: 미리 검색된 RAG 컨텍스트 (배치 일괄 검색 시, None이면 직접 검색)
+        pipeline: two_stage 또는 structured (None이면 ANALYSIS_PIPELINE 설정)
 
     Returns:
         ViolationResult: 종합 분석 결과
     """
-    # ============================================
-    # 1단계: 키워드 분석 (CPU-bound, 빠름)
-    # ============================================
-    result = analyze_keywords(text)
-    result.keyword_risk_score = result.risk_score  # 키워드 점수 백업
-
-    # ============================================
-    # 2단계: 1차 AI 심층분석 (자유 형식)
-    # ============================================
-    if use_ai and os.getenv("OPENAI_API_KEY"):
-        try:
-            if use_rag:
-                # RAG 검색
-                rag_context = await _get_rag_context_async(text)
-                # RAG 컨텍스트를 미리 제공하여 AI 분석
-                ai_analysis_text = await analyze_with_ai_async(
-                    text, result, use_rag=True, rag_context=rag_context
-                )
-            else:
-                ai_analysis_text = await analyze_with_ai_async(
-                    text, result, use_rag=False
-                )
-
-            result.ai_analysis = ai_analysis_text  # 상세 표시용 유지
-
-            # ============================================
-            # 3단계: 2차 LLM 위험점수 추출 (JSON)
-            # ============================================
-            final_judgment = await extract_final_judgment(
-                ai_analysis_text, result.violations, result.keyword_risk_score
-            )
-
-            # 최종 결과 통합
-            if final_judgment:
-                # 위험점수 설정 (2차 LLM 결과)
-                result.risk_score = int(
-                    final_judgment.get("risk_score", result.keyword_risk_score)
-                )
-
-                # 위험도 자동 계산 (위험점수 기반)
-                result.risk_level = calculate_risk_level(result.risk_score)
-
-                # 판정 자동 계산 (위험도 기반)
-                result.judgment = calculate_judgment(result.risk_level)
-
-                # AI 위반 사항
-                result.ai_violations = final_judgment.get("violations", [])
-
-                # 요약 업데이트
-                if final_judgment.get("summary"):
-                    result.summary = final_judgment["summary"]
-            else:
-                # 2차 LLM 실패 시 키워드 결과 유지
-                print("[분석] 2차 LLM 판정 추출 실패, 키워드 분석 결과 사용")
-
-        except Exception as e:
-            result.ai_analysis = f"AI 분석 실패: {str(e)}"
-            print(f"[분석] AI 분석 오류: {e}")
+    from analysis_engine import get_analysis_engine
 
-    return result
+    return await get_analysis_engine().analyze_text(
+        text, use_ai=use_ai, use_rag=use_rag, rag_context=rag_context, pipeline=pipeline
+    )
+
+
+async def analyze_complete_stream(
+    text: str, use_ai: bool = True, use_rag: bool = True
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    단계별 결과를 바로 전달하는 광고 분석 (단건 스트리밍 응답용)
+    키워드 분석 결과를 먼저 보내고, 1차 AI 분석은 토큰 단위로, 마지막에 2차 판정을 반영한 최종 결과를 보냄
+
+    Args:
+        text: 분석할 텍스트
+        use_ai: AI 분석 사용 여부
+        use_rag: RAG 사용 여부
+
+    Yields:
+        (이벤트 종류, 데이터)
+        - ("keywords", 키워드 분석 결과 dict)
+        - ("ai_delta", {"delta": 텍스트 조각})
+        - ("result", 최종 분석 결과 dict)
+    """
+    from analysis_engine import get_analysis_engine
+
+    async for event in get_analysis_engine().stream_text(text, use_ai=use_ai, use_rag=use_rag):
+        yield event
 
 
 if __name__ == "__main__":
@@ -0,0 +1,450 @@
+"""
+광고 분석 엔진
+OCR → 키워드 → RAG → 1차 LLM → 2차 판정 단계를 하나의 비동기 엔진으로 묶고,
+동기 코드(CLI/스크립트)는 얇은 래퍼(SyncAnalysisEngine)로 같은 엔진을 사용
+
+- 단계 함수는 생성자 인자로 교체 가능 (테스트 스텁, 다른 OCR/LLM 구현 등)
+- 결과 캐시, 호출 한도, 재시도/서킷 브레이커는 각 단계 구현(ocr_service, ad_analyzer)에 있으므로
+  API 서버/배치 워커/CLI 어느 진입점에서 호출해도 동일하게 적용
+- 단계별 호출 수/실패 수/소요 시간을 기록 (worker_metrics의 analysis_stages)
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import os
+import threading
+import time
+
+from ad_analyzer import (
+    ANALYSIS_PIPELINE,
+    PIPELINE_STRUCTURED,
+    ViolationResult,
+    analyze_keywords,
+    analyze_structured_async,
+    analyze_with_ai_async,
+    apply_final_judgment,
+    finalize_ai_analysis,
+    get_rag_context_async,
+    get_rag_contexts_batch_async,
+    stream_with_ai_async,
+)
+from ocr_service import OCREngine, perform_ocr
+
+# 단계 이름
+STAGE_OCR = "ocr"
+STAGE_KEYWORDS = "keywords"
+STAGE_RAG = "rag"
+STAGE_LLM = "llm"
+STAGE_JUDGMENT = "judgment"
+STAGE_STRUCTURED = "structured"
+
+T = TypeVar("T")
+
+# 단계 함수 형식
+OCRStage = Callable[[Path, OCREngine], Awaitable[Dict[str, Any]]]
+KeywordStage = Callable[[str], ViolationResult]
+RAGStage = Callable[[str], Awaitable[str]]
+RAGBatchStage = Callable[[List[str]], Awaitable[List[str]]]
+LLMStage = Callable[[str, ViolationResult, str], Awaitable[str]]
+LLMStreamStage = Callable[[str, ViolationResult, str], AsyncIterator[str]]
+JudgmentStage = Callable[[ViolationResult, str], Awaitable[None]]
+StructuredStage = Callable[[str, ViolationResult, str], Awaitable[Dict]]
+
+
+def keyword_stage(text: str) -> ViolationResult:
+    """키워드 분석 (2차 판정 전 키워드 점수 백업 포함)"""
+    result = analyze_keywords(text)
+    result.keyword_risk_score = result.risk_score
+    return result
+
+
+async def llm_stage(text: str, keyword_result: ViolationResult, rag_context: str) -> str:
+    """1차 AI 분석 (RAG는 엔진이 먼저 수행)"""
+    return await analyze_with_ai_async(
+        text, keyword_result, use_rag=False, rag_context=rag_context
+    )
+
+
+async def llm_stream_stage(
+    text: str, keyword_result: ViolationResult, rag_context: str
+) -> AsyncIterator[str]:
+    """1차 AI 분석 스트리밍"""
+    async for delta in stream_with_ai_async(
+        text, keyword_result, use_rag=False, rag_context=rag_context
+    ):
+        yield delta
+
+
+async def structured_stage(text: str, keyword_result: ViolationResult, rag_context: str) -> Dict:
+    """구조화 출력 단일 호출 분석"""
+    return await analyze_structured_async(
+        text, keyword_result, use_rag=False, rag_context=rag_context
+    )
+
+
+class StageMetrics:
+    """단계별 호출 수/실패 수/소요 시간 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, stage: str, seconds: float, ok: bool = True):
+        with self._lock:
+            stats = self._stats.setdefault(
+                stage, {"calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["calls"] += 1
+            if not ok:
+                stats["errors"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                stage: {
+                    "calls": int(stats["calls"]),
+                    "errors": int(stats["errors"]),
+                    "avg_seconds": round(stats["total_seconds"] / stats["calls"], 3),
+                    "max_seconds": round(stats["max_seconds"], 3),
+                }
+                for stage, stats in self._stats.items()
+            }
+
+
+class AnalysisEngine:
+    """
+    비동기 광고 분석 엔진
+
+    Args:
+        ocr: 이미지 → OCR 결과 dict (perform_ocr 형식)
+        keywords: 텍스트 → 키워드 분석 결과
+        rag: 텍스트 → 관련 법규 컨텍스트
+        rag_batch: 텍스트 목록 → 관련 법규 컨텍스트 목록 (임베딩 일괄 호출)
+        llm: (텍스트, 키워드 결과, RAG 컨텍스트) → 1차 AI 분석 텍스트
+        llm_stream: llm의 스트리밍 버전 (텍스트 조각 반환)
+        judgment: (결과, 1차 분석 텍스트) → 2차 판정 반영
+        structured: (텍스트, 키워드 결과, RAG 컨텍스트) → 구조화 분석 dict
+        pipeline: two_stage 또는 structured (None이면 ANALYSIS_PIPELINE 설정)
+    """
+
+    def __init__(
+        self,
+        ocr: OCRStage = perform_ocr,
+        keywords: KeywordStage = keyword_stage,
+        rag: RAGStage = get_rag_context_async,
+        rag_batch: RAGBatchStage = get_rag_contexts_batch_async,
+        llm: LLMStage = llm_stage,
+        llm_stream: LLMStreamStage = llm_stream_stage,
+        judgment: JudgmentStage = finalize_ai_analysis,
+        structured: StructuredStage = structured_stage,
+        pipeline: Optional[str] = None,
+    ):
+        self.ocr_stage = ocr
+        self.keyword_stage = keywords
+        self.rag_stage = rag
+        self.rag_batch_stage = rag_batch
+        self.llm_stage = llm
+        self.llm_stream_stage = llm_stream
+        self.judgment_stage = judgment
+        self.structured_stage = structured
+        self.pipeline = pipeline or ANALYSIS_PIPELINE
+        self.metrics = StageMetrics()
+
+    @contextmanager
+    def _measure(self, stage: str):
+        """단계 소요 시간 기록 (예외 발생 시 실패로 기록 후 그대로 전달)"""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.metrics.record(stage, time.perf_counter() - start, ok=False)
+            raise
+        self.metrics.record(stage, time.perf_counter() - start)
+
+    @staticmethod
+    def ai_available(use_ai: bool) -> bool:
+        return use_ai and bool(os.getenv("OPENAI_API_KEY"))
+
+    # ----------------------------------------
+    # 개별 단계
+    # ----------------------------------------
+
+    async def ocr(self, image_path: Path, engine: OCREngine = OCREngine.NAVER) -> Dict[str, Any]:
+        """OCR 단계 (실패는 결과의 success=False로 반환)"""
+        start = time.perf_counter()
+        try:
+            result = await self.ocr_stage(image_path, engine)
+        except Exception as e:
+            result = {"success": False, "error": f"OCR 처리 중 오류: {str(e)}"}
+        self.metrics.record(STAGE_OCR, time.perf_counter() - start, ok=bool(result.get("success")))
+        return result
+
+    def keywords(self, text: str) -> ViolationResult:
+        """키워드 분석 단계"""
+        with self._measure(STAGE_KEYWORDS):
+            return self.keyword_stage(text)
+
+    async def retrieve(self, text: str) -> str:
+        """RAG 단계 (관련 법규 컨텍스트, 실패 시 빈 문자열)"""
+        with self._measure(STAGE_RAG):
+            return await self.rag_stage(text)
+
+    async def retrieve_batch(self, texts: List[str]) -> List[str]:
+        """RAG 단계 일괄 처리 (배치 분석용)"""
+        if not texts:
+            return []
+        with self._measure(STAGE_RAG):
+            return await self.rag_batch_stage(texts)
+
+    async def analyze_llm(
+        self, text: str, keyword_result: ViolationResult, rag_context: str = ""
+    ) -> str:
+        """1차 LLM 단계 (실패 시 예외 전달)"""
+        with self._measure(STAGE_LLM):
+            return await self.llm_stage(text, keyword_result, rag_context)
+
+    async def judge(self, result: ViolationResult, ai_analysis_text: str):
+        """2차 판정 단계 (결과에 반영)"""
+        with self._measure(STAGE_JUDGMENT):
+            await self.judgment_stage(result, ai_analysis_text)
+
+    async def analyze_structured(
+        self, text: str, keyword_result: ViolationResult, rag_context: str = ""
+    ) -> Dict:
+        """구조화 출력 단계 (1차 분석 + 판정을 1회 호출로)"""
+        with self._measure(STAGE_STRUCTURED):
+            return await self.structured_stage(text, keyword_result, rag_context)
+
+    # ----------------------------------------
+    # 전체 파이프라인
+    # ----------------------------------------
+
+    async def analyze_text(
+        self,
+        text: str,
+        use_ai: bool = True,
+        use_rag: bool = True,
+        rag_context: Optional[str] = None,
+        pipeline: Optional[str] = None,
+    ) -> ViolationResult:
+        """
+        텍스트 광고 분석 (키워드 → RAG → 1차 AI → 2차 판정)
+        structured 파이프라인은 1차 AI/2차 판정을 구조화 출력 1회 호출로 처리
+
+        Args:
+            text: 분석할 텍스트
+            use_ai: AI 분석 사용 여부
+            use_rag: RAG 사용 여부
+            rag_context: 미리 검색된 RAG 컨텍스트 (배치 일괄 검색 시, None이면 직접 검색)
+            pipeline: two_stage 또는 structured (None이면 엔진 설정)
+
+        Returns:
+            ViolationResult: 종합 분석 결과 (AI 실패 시 키워드 결과 유지)
+        """
+        result = self.keywords(text)
+
+        if not self.ai_available(use_ai):
+            return result
+
+        try:
+            if use_rag and rag_context is None:
+                rag_context = await self.retrieve(text)
+            rag_context = (rag_context or "") if use_rag else ""
+
+            if (pipeline or self.pipeline) == PIPELINE_STRUCTURED:
+                structured = await self.analyze_structured(text, result, rag_context)
+                result.ai_analysis = structured["analysis"]
+                apply_final_judgment(result, structured)
+                return result
+
+            ai_analysis_text = await self.analyze_llm(text, result, rag_context)
+            await self.judge(result, ai_analysis_text)
+
+        except Exception as e:
+            result.ai_analysis = f"AI 분석 실패: {str(e)}"
+            print(f"[분석] AI 분석 오류: {e}")
+
+        return result
+
+    async def analyze_texts(
+        self, texts: List[str], use_ai: bool = True, use_rag: bool = True
+    ) -> List[ViolationResult]:
+        """
+        여러 텍스트 분석 (RAG는 임베딩 1회로 일괄 검색, AI 분석은 병렬 실행)
+
+        Returns:
+            텍스트 순서와 동일한 분석 결과 목록
+        """
+        rag_contexts: List[Optional[str]] = [None] * len(texts)
+        if self.ai_available(use_ai) and use_rag:
+            rag_contexts = await self.retrieve_batch(texts)
+        return list(
+            await asyncio.gather(
+                *[
+                    self.analyze_text(text, use_ai, use_rag, rag_context)
+                    for text, rag_context in zip(texts, rag_contexts)
+                ]
+            )
+        )
+
+    async def analyze_image(
+        self,
+        image_path: Path,
+        engine: OCREngine = OCREngine.NAVER,
+        use_ai: bool = True,
+        use_rag: bool = True,
+    ) -> Tuple[Dict[str, Any], Optional[ViolationResult]]:
+        """
+        이미지 광고 분석 (OCR → 텍스트 분석)
+
+        Returns:
+            (OCR 결과, 분석 결과 - OCR 실패 시 None)
+        """
+        ocr_result = await self.ocr(Path(image_path), engine)
+        if not ocr_result.get("success"):
+            return ocr_result, None
+        return ocr_result, await self.analyze_text(ocr_result["text"], use_ai, use_rag)
+
+    async def stream_text(
+        self,
+        text: str,
+        use_ai: bool = True,
+        use_rag: bool = True,
+        pipeline: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        단계별 결과를 바로 전달하는 텍스트 분석 (단건 스트리밍 응답용)
+        structured 파이프라인은 JSON 출력을 조각으로 보낼 수 없으므로
+        구조화 출력 1회 호출 후 1차 분석 본문을 ai_delta 한 번으로 전달
+
+        Args:
+            pipeline: two_stage 또는 structured (None이면 엔진 설정)
+
+        Yields:
+            (이벤트 종류, 데이터)
+            - ("keywords", 키워드 분석 결과 dict)
+            - ("ai_delta", {"delta": 텍스트 조각})
+            - ("result", 최종 분석 결과 dict)
+        """
+        result = self.keywords(text)
+        yield "keywords", result.to_dict()
+
+        if self.ai_available(use_ai):
+            try:
+                rag_context = await self.retrieve(text) if use_rag else ""
+
+                if (pipeline or self.pipeline) == PIPELINE_STRUCTURED:
+                    structured = await self.analyze_structured(text, result, rag_context)
+                    result.ai_analysis = structured["analysis"]
+                    apply_final_judgment(result, structured)
+                    yield "ai_delta", {"delta": structured["analysis"]}
+                else:
+                    chunks = []
+                    with self._measure(STAGE_LLM):
+                        async for delta in self.llm_stream_stage(text, result, rag_context):
+                            chunks.append(delta)
+                            yield "ai_delta", {"delta": delta}
+
+                    await self.judge(result, "".join(chunks))
+
+            except Exception as e:
+                result.ai_analysis = f"AI 분석 실패: {str(e)}"
+                print(f"[분석] AI 분석 오류: {e}")
+
+        yield "result", result.to_dict()
+
+    def stats(self) -> Dict[str, Any]:
+        """단계별 호출/실패/소요 시간 통계"""
+        return self.metrics.stats()
+
+
+# ============================================
+# 동기 래퍼 (CLI/스크립트용)
+# ============================================
+
+# 동기 호출이 공유하는 전용 이벤트 루프 (AsyncOpenAI/httpx 커넥션 풀 재사용)
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_sync_loop.run_forever, name="analysis-engine", daemon=True
+            ).start()
+    return _sync_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    동기 코드에서 엔진 코루틴 실행 (전용 이벤트 루프 스레드에서 실행 후 결과 대기)
+
+    Raises:
+        RuntimeError: 이벤트 루프 안에서 호출한 경우 (await로 직접 호출해야 함)
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run_coroutine_threadsafe(coro, _get_sync_loop()).result()
+    coro.close()
+    raise RuntimeError("이벤트 루프 안에서는 AnalysisEngine 메서드를 await로 호출하세요.")
+
+
+class SyncAnalysisEngine:
+    """AnalysisEngine 동기 래퍼 (CLI, 테스트 스크립트, 기존 동기 API용)"""
+
+    def __init__(self, engine: AnalysisEngine):
+        self.engine = engine
+
+    def ocr(self, image_path: Path, engine: OCREngine = OCREngine.NAVER) -> Dict[str, Any]:
+        return run_sync(self.engine.ocr(Path(image_path), engine))
+
+    def analyze_text(
+        self, text: str, use_ai: bool = True, use_rag: bool = True
+    ) -> ViolationResult:
+        return run_sync(self.engine.analyze_text(text, use_ai, use_rag))
+
+    def analyze_texts(
+        self, texts: List[str], use_ai: bool = True, use_rag: bool = True
+    ) -> List[ViolationResult]:
+        return run_sync(self.engine.analyze_texts(texts, use_ai, use_rag))
+
+    def analyze_image(
+        self,
+        image_path: Path,
+        engine: OCREngine = OCREngine.NAVER,
+        use_ai: bool = True,
+        use_rag: bool = True,
+    ) -> Tuple[Dict[str, Any], Optional[ViolationResult]]:
+        return run_sync(self.engine.analyze_image(Path(image_path), engine, use_ai, use_rag))
+
+    def stats(self) -> Dict[str, Any]:
+        return self.engine.stats()
+
+
+# 싱글톤 인스턴스
+_analysis_engine: Optional[AnalysisEngine] = None
+_sync_analysis_engine: Optional[SyncAnalysisEngine] = None
+
+
+def get_analysis_engine() -> AnalysisEngine:
+    """기본 단계로 구성된 분석 엔진 싱글톤"""
+    global _analysis_engine
+    if _analysis_engine is None:
+        _analysis_engine = AnalysisEngine()
+    return _analysis_engine
+
+
+def get_sync_analysis_engine() -> SyncAnalysisEngine:
+    """분석 엔진 동기 래퍼 싱글톤 (비동기 엔진과 단계/통계 공유)"""
+    global _sync_analysis_engine
+    if _sync_analysis_engine is None:
+        _sync_analysis_engine = SyncAnalysisEngine(get_analysis_engine())
+    return _sync_analysis_engine
@@ -0,0 +1,122 @@
+"""
+배치 진행 이벤트 로그
+배치별로 파일 상태 변화/결과를 순번(seq)이 붙은 이벤트로 기록하여
+SSE 스트림과 증분 상태 조회에서 각 변경을 한 번씩만 전달
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import asyncio
+
+
+# 이벤트 종류
+EVENT_FILE_STATUS = "file_status"  # 파일별 상태 변화
+EVENT_RESULT = "result"  # 파일 처리 결과 + 배치 진행률
+EVENT_STATUS = "status"  # 배치 상태 변화 (completed, failed)
+
+# 배치 종료 상태
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class BatchEvent:
+    """배치 진행 이벤트"""
+
+    seq: int
+    type: str
+    data: Dict[str, Any]
+
+
+class BatchEventLog:
+    """배치 하나의 이벤트 로그 (이벤트 루프 내에서만 사용)"""
+
+    def __init__(self):
+        self.events: List[BatchEvent] = []
+        self.closed = False
+        self._changed = asyncio.Event()
+
+    @property
+    def last_seq(self) -> int:
+        """마지막 이벤트 순번 (이벤트가 없으면 0)"""
+        return self.events[-1].seq if self.events else 0
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> int:
+        """이벤트 추가 후 대기 중인 구독자 깨우기"""
+        seq = self.last_seq + 1
+        self.events.append(BatchEvent(seq=seq, type=event_type, data=data))
+
+        if event_type == EVENT_STATUS and data.get("status") in TERMINAL_STATUSES:
+            self.closed = True
+
+        self._changed.set()
+        self._changed = asyncio.Event()
+        return seq
+
+    def since(self, seq: int) -> List[BatchEvent]:
+        """seq 이후 이벤트 목록 (순번이 연속이므로 인덱스로 바로 접근)"""
+        if seq <= 0:
+            return list(self.events)
+        return self.events[seq:]
+
+    async def wait(self, seq: int, timeout: float) -> List[BatchEvent]:
+        """
+        seq 이후 이벤트가 생길 때까지 대기
+
+        Args:
+            seq: 마지막으로 받은 이벤트 순번
+            timeout: 최대 대기 시간 (초)
+
+        Returns:
+            List[BatchEvent]: 새 이벤트 (타임아웃 시 빈 리스트)
+        """
+        events = self.since(seq)
+        if events or self.closed:
+            return events
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+        return self.since(seq)
+
+
+class BatchEventHub:
+    """배치 ID별 이벤트 로그 저장소"""
+
+    def __init__(self):
+        self._logs: Dict[str, BatchEventLog] = {}
+
+    def get(self, batch_id: str) -> Optional[BatchEventLog]:
+        """배치 이벤트 로그 (없으면 None)"""
+        return self._logs.get(batch_id)
+
+    def log(self, batch_id: str) -> BatchEventLog:
+        """배치 이벤트 로그 (없으면 생성)"""
+        log = self._logs.get(batch_id)
+        if log is None:
+            log = self._logs[batch_id] = BatchEventLog()
+        return log
+
+    def publish(self, batch_id: str, event_type: str, data: Dict[str, Any]) -> int:
+        """이벤트 발행"""
+        return self.log(batch_id).append(event_type, data)
+
+    def last_seq(self, batch_id: str) -> int:
+        log = self._logs.get(batch_id)
+        return log.last_seq if log else 0
+
+    def discard(self, batch_id: str):
+        """배치 상태 정리 시 이벤트 로그도 제거"""
+        self._logs.pop(batch_id, None)
+
+
+# 싱글톤 인스턴스
+_batch_event_hub: Optional[BatchEventHub] = None
+
+
+def get_batch_event_hub() -> BatchEventHub:
+    """배치 이벤트 저장소 싱글톤"""
+    global _batch_event_hub
+    if _batch_event_hub is None:
+        _batch_event_hub = BatchEventHub()
+    return _batch_event_hub
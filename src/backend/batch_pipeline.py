@@ -0,0 +1,163 @@
+"""
+배치 단계별 파이프라인
+파일 하나의 OCR → RAG → 1차 LLM → 2차 판정 전체를 한 슬롯으로 묶지 않고,
+단계마다 크기 제한 대기열과 워커를 두어 파일 N의 LLM 분석 중에 파일 N+1의 OCR이 진행되도록 함
+
+- 대기열이 가득 차면 앞 단계 워커가 대기 (배압) → 느린 단계 앞에 작업이 무한히 쌓이지 않음
+- 배치 전체 처리 시간은 단계 합이 아니라 가장 느린 단계의 처리량에 수렴
+- batch_size > 1인 단계는 대기열에 쌓인 항목을 모아 한 번에 처리 (RAG 임베딩 일괄 호출)
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import asyncio
+import os
+import time
+
+# 단계 사이 대기열 크기 (배압 기준, 0이면 제한 없음)
+BATCH_PIPELINE_QUEUE_SIZE = int(os.getenv("BATCH_PIPELINE_QUEUE_SIZE", "8"))
+
+# 단계별 워커 수 (0이면 배치 스케줄러의 해당 자원 상한 사용)
+BATCH_OCR_WORKERS = int(os.getenv("BATCH_OCR_WORKERS", "0"))
+BATCH_RAG_WORKERS = int(os.getenv("BATCH_RAG_WORKERS", "1"))
+BATCH_LLM_WORKERS = int(os.getenv("BATCH_LLM_WORKERS", "0"))
+BATCH_JUDGMENT_WORKERS = int(os.getenv("BATCH_JUDGMENT_WORKERS", "0"))
+
+# RAG 단계 한 번에 묶어 검색할 최대 텍스트 수
+BATCH_RAG_BATCH_SIZE = int(os.getenv("BATCH_RAG_BATCH_SIZE", "16"))
+
+# 워커 종료 신호
+_DONE = object()
+
+
+class PipelineStage:
+    """
+    파이프라인 단계
+
+    Args:
+        name: 단계 이름 (통계/로그용)
+        handler: 항목 처리 함수. 다음 단계로 넘길 항목을 반환하고, None이면 여기서 종료
+                 (batch_size > 1이면 항목 목록을 받아 같은 길이의 목록 반환)
+        workers: 동시 실행 워커 수
+        batch_size: 한 번에 모아 처리할 최대 항목 수
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Awaitable[Any]],
+        workers: int = 1,
+        batch_size: int = 1,
+    ):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+
+
+async def _next_items(queue: asyncio.Queue, batch_size: int) -> Optional[List[Any]]:
+    """대기열에서 항목 1개를 기다린 뒤, 이미 쌓인 항목을 batch_size까지 추가로 가져옴"""
+    item = await queue.get()
+    if item is _DONE:
+        return None
+    items = [item]
+    while len(items) < batch_size:
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if item is _DONE:
+            # 같은 단계의 다른 워커를 위해 종료 신호를 되돌려 놓음
+            queue.put_nowait(_DONE)
+            break
+        items.append(item)
+    return items
+
+
+async def run_pipeline(
+    items: Sequence[Any],
+    stages: List[PipelineStage],
+    queue_size: int = BATCH_PIPELINE_QUEUE_SIZE,
+    on_error: Optional[Callable[[Any, BaseException], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    항목들을 단계별 파이프라인으로 처리
+
+    Args:
+        items: 첫 단계에 넣을 항목
+        stages: 순서대로 실행할 단계
+        queue_size: 단계 사이 대기열 크기 (배압)
+        on_error: 단계 처리 중 예외가 난 항목 보고 (항목은 이후 단계로 넘어가지 않음)
+
+    Returns:
+        단계별 통계 {이름: {"workers", "processed", "busy_seconds", "queue_peak"}}
+    """
+    # 첫 단계 입력은 미리 모두 넣으므로 제한 없음, 이후 단계는 queue_size로 제한
+    queues = [asyncio.Queue()] + [
+        asyncio.Queue(maxsize=max(0, queue_size)) for _ in stages[1:]
+    ]
+    stats = {
+        stage.name: {"workers": stage.workers, "processed": 0, "busy_seconds": 0.0, "queue_peak": 0}
+        for stage in stages
+    }
+
+    for item in items:
+        queues[0].put_nowait(item)
+    for _ in range(stages[0].workers):
+        queues[0].put_nowait(_DONE)
+
+    async def worker(index: int, stage: PipelineStage):
+        inbox = queues[index]
+        outbox = queues[index + 1] if index + 1 < len(stages) else None
+        stage_stats = stats[stage.name]
+
+        while True:
+            stage_stats["queue_peak"] = max(stage_stats["queue_peak"], inbox.qsize())
+            batch = await _next_items(inbox, stage.batch_size)
+            if batch is None:
+                return
+
+            started = time.monotonic()
+            try:
+                if stage.batch_size > 1:
+                    outputs = await stage.handler(batch)
+                else:
+                    outputs = [await stage.handler(batch[0])]
+            except Exception as e:
+                print(f"[Pipeline] {stage.name} 단계 오류: {e}")
+                if on_error is not None:
+                    for item in batch:
+                        on_error(item, e)
+                continue
+            finally:
+                stage_stats["busy_seconds"] += time.monotonic() - started
+                stage_stats["processed"] += len(batch)
+
+            if outbox is None:
+                continue
+            for output in outputs:
+                if output is not None:
+                    await outbox.put(output)  # 다음 단계 대기열이 가득 차면 대기 (배압)
+
+    workers = [
+        [asyncio.create_task(worker(index, stage)) for _ in range(stage.workers)]
+        for index, stage in enumerate(stages)
+    ]
+
+    async def close_stage(index: int):
+        """단계 워커가 모두 끝나면 다음 단계 워커 수만큼 종료 신호 전달"""
+        await asyncio.gather(*workers[index])
+        if index + 1 < len(stages):
+            for _ in range(stages[index + 1].workers):
+                await queues[index + 1].put(_DONE)
+
+    closers = [asyncio.create_task(close_stage(index)) for index in range(len(stages))]
+    try:
+        await asyncio.gather(*closers)
+    finally:
+        # 취소/예외 시 남은 워커 정리
+        for task in [task for stage_tasks in workers for task in stage_tasks] + closers:
+            task.cancel()
+
+    for stage_stats in stats.values():
+        stage_stats["busy_seconds"] = round(stage_stats["busy_seconds"], 2)
+    return stats
@@ -0,0 +1,383 @@
+"""
+OpenAI Batch API 기반 대량 재검토 (오프라인 분석 모드)
+급하지 않은 대량 배치의 1차 AI 분석 요청을 JSONL 파일 하나로 모아 Batch API에 제출하고,
+완료되면 결과를 받아 2차 판정은 실시간 경로와 동일하게 수행
+
+- 1차 분석 요청 본문/캐시 키는 실시간 분석(build_analysis_request)과 공유 (캐시 적중 파일은 제출 생략)
+- 제출한 Batch ID와 요청 custom_id 목록은 호출 측에서 저장해 두었다가 워커 재시작 시 다시 제출하지 않고 이어서 대기
+- custom_id는 파일별 고정 ID(file_id)를 사용하므로 재개 시 처리 순서/남은 파일이 달라도 결과가 섞이지 않음
+- OPENAI_BASE_URL 환경변수로 스텁 서버를 지정해 테스트 가능 (test_batch_review.py)
+
+사용법 (backend 폴더에서 실행, 보관 중인 광고 이미지 폴더 재검토):
+    python batch_review.py <이미지 폴더>
+    python batch_review.py <이미지 폴더> --ocr-engine paddle --no-rag
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, List, Optional
+import argparse
+import asyncio
+import io
+import json
+import os
+import time
+
+from ad_analyzer import (
+    ViolationResult,
+    analyze_keywords,
+    async_client,
+    build_analysis_request,
+    finalize_ai_analysis,
+)
+from batch_scheduler import RESOURCE_OPENAI, get_batch_scheduler
+from prompts import get_prompt_usage_stats
+from resilience import call_with_retry
+from result_cache import get_llm_cache
+
+# 배치 분석 방식 (batch-upload-analyze의 analysis_mode)
+ANALYSIS_MODE_REALTIME = "realtime"
+ANALYSIS_MODE_OFFLINE = "offline"
+
+# Batch API 설정
+OPENAI_BATCH_ENDPOINT = "/v1/responses"
+OPENAI_BATCH_COMPLETION_WINDOW = os.getenv("OPENAI_BATCH_COMPLETION_WINDOW", "24h")
+OPENAI_BATCH_POLL_SECONDS = float(os.getenv("OPENAI_BATCH_POLL_SECONDS", "30"))
+OPENAI_BATCH_MAX_REQUESTS = 50000  # Batch API 제출 1건당 최대 요청 수
+
+# 서킷 브레이커/재시도 단위 (Batch 관리 API는 응답 생성 호출과 분리)
+PROVIDER_OPENAI_BATCH = "openai_batch"
+
+# Batch 종료 상태
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def build_batch_jsonl(requests: Dict[str, Dict[str, Any]]) -> bytes:
+    """
+    Batch API 입력 파일(JSONL) 생성
+
+    Args:
+        requests: {custom_id: Responses 요청 본문}
+
+    Returns:
+        bytes: 요청 1건당 한 줄인 JSONL
+    """
+    lines = [
+        json.dumps(
+            {
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": OPENAI_BATCH_ENDPOINT,
+                "body": body,
+            },
+            ensure_ascii=False,
+        )
+        for custom_id, body in requests.items()
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def response_output_text(body: Dict[str, Any]) -> str:
+    """Batch 출력의 Responses 응답 본문(JSON)에서 출력 텍스트 추출"""
+    if body.get("output_text"):
+        return body["output_text"]
+
+    texts = []
+    for item in body.get("output") or []:
+        if item.get("type") != "message":
+            continue
+        for content in item.get("content") or []:
+            if content.get("type") == "output_text":
+                texts.append(content.get("text", ""))
+    return "".join(texts)
+
+
+def parse_batch_output(output_jsonl: str) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Batch 출력/오류 파일 파싱
+
+    Returns:
+        {custom_id: {"text": 출력 텍스트 또는 None, "error": 오류 메시지 또는 None}}
+    """
+    outputs: Dict[str, Dict[str, Optional[str]]] = {}
+    for line in output_jsonl.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        response = record.get("response") or {}
+        error = record.get("error")
+
+        if error:
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            outputs[custom_id] = {"text": None, "error": message or "Batch 요청 실패"}
+        elif response.get("status_code") != 200:
+            outputs[custom_id] = {
+                "text": None,
+                "error": f"Batch 요청 실패: HTTP {response.get('status_code')}",
+            }
+        else:
+            body = response.get("body") or {}
+            get_prompt_usage_stats().record("analysis_batch", body)
+            outputs[custom_id] = {
+                "text": response_output_text(body),
+                "error": None,
+            }
+    return outputs
+
+
+async def submit_batch(requests: Dict[str, Dict[str, Any]], metadata: Dict[str, str]) -> str:
+    """
+    1차 분석 요청을 JSONL로 업로드하고 Batch 생성
+
+    Returns:
+        str: OpenAI Batch ID
+    """
+    if len(requests) > OPENAI_BATCH_MAX_REQUESTS:
+        raise ValueError(
+            f"Batch API 제출 한도 초과: {len(requests)}건 (최대 {OPENAI_BATCH_MAX_REQUESTS}건)"
+        )
+
+    content = build_batch_jsonl(requests)
+
+    async def upload():
+        return await async_client.files.create(
+            file=("review_requests.jsonl", io.BytesIO(content)), purpose="batch"
+        )
+
+    input_file = await call_with_retry(PROVIDER_OPENAI_BATCH, upload)
+
+    async def create():
+        return await async_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=OPENAI_BATCH_ENDPOINT,
+            completion_window=OPENAI_BATCH_COMPLETION_WINDOW,
+            metadata=metadata,
+        )
+
+    batch = await call_with_retry(PROVIDER_OPENAI_BATCH, create)
+    print(f"[BatchAPI] 제출 완료: {batch.id} ({len(requests)}건)")
+    return batch.id
+
+
+async def wait_for_batch(
+    openai_batch_id: str, on_progress: Optional[Callable[[int, int], None]] = None
+) -> Any:
+    """
+    Batch 완료까지 주기적으로 상태 조회
+
+    Args:
+        openai_batch_id: OpenAI Batch ID
+        on_progress: (완료 요청 수, 전체 요청 수) 콜백
+
+    Returns:
+        종료 상태의 Batch 객체
+    """
+    while True:
+        batch = await call_with_retry(
+            PROVIDER_OPENAI_BATCH, lambda: async_client.batches.retrieve(openai_batch_id)
+        )
+        counts = getattr(batch, "request_counts", None)
+        if on_progress is not None and counts is not None:
+            on_progress(counts.completed + counts.failed, counts.total)
+
+        if batch.status in BATCH_TERMINAL_STATUSES:
+            return batch
+        await asyncio.sleep(OPENAI_BATCH_POLL_SECONDS)
+
+
+async def fetch_batch_outputs(batch: Any) -> Dict[str, Dict[str, Optional[str]]]:
+    """종료된 Batch의 출력/오류 파일을 받아 custom_id별 결과로 변환"""
+    outputs: Dict[str, Dict[str, Optional[str]]] = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if not file_id:
+            continue
+        content = await call_with_retry(
+            PROVIDER_OPENAI_BATCH, lambda: async_client.files.content(file_id)
+        )
+        outputs.update(parse_batch_output(content.text))
+    return outputs
+
+
+async def run_offline_analysis(
+    batch_id: str,
+    items: List[Dict[str, Any]],
+    openai_batch_id: Optional[str] = None,
+    submitted_ids: Optional[Collection[str]] = None,
+    on_submitted: Optional[Callable[[str, List[str]], None]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, ViolationResult]:
+    """
+    Batch API로 1차 AI 분석 후 2차 판정까지 수행
+
+    Args:
+        batch_id: 배치 ID (Batch 메타데이터, 판정 단계 스케줄러 배정 단위)
+        items: [{"custom_id": 파일별 고정 ID, "text": OCR 텍스트, "rag_context": 검색된 법규 컨텍스트}, ...]
+        openai_batch_id: 이전에 제출한 Batch ID (재개 시)
+        submitted_ids: openai_batch_id로 제출했던 custom_id 목록
+                       (분석할 요청이 모두 포함된 경우에만 다시 제출하지 않고 이어서 대기)
+        on_submitted: 새 Batch 제출 직후 호출 (Batch ID, 제출한 custom_id 목록 저장용)
+        on_progress: Batch 진행률 콜백 (완료 요청 수, 전체 요청 수)
+
+    Returns:
+        {custom_id: ViolationResult} (1차 분석 실패 파일은 키워드 결과 + 실패 사유)
+    """
+    cache = get_llm_cache()
+    results: Dict[str, ViolationResult] = {}
+    analyses: Dict[str, str] = {}
+    requests: Dict[str, Dict[str, Any]] = {}
+    cache_keys: Dict[str, str] = {}
+
+    # 1단계: 키워드 분석 + 1차 분석 요청 구성 (캐시 적중 시 제출 생략)
+    for item in items:
+        custom_id = item["custom_id"]
+        result = analyze_keywords(item["text"])
+        result.keyword_risk_score = result.risk_score
+        results[custom_id] = result
+
+        body, cache_key = build_analysis_request(
+            item["text"], result, item.get("rag_context") or ""
+        )
+        cached = await cache.aget(cache_key) if cache is not None else None
+        if cached is not None:
+            analyses[custom_id] = cached
+        else:
+            requests[custom_id] = body
+            cache_keys[custom_id] = cache_key
+
+    # 2단계: Batch 제출 및 완료 대기
+    if requests:
+        if openai_batch_id is not None and not set(requests) <= set(submitted_ids or ()):
+            # 제출 목록을 모르거나(이전 형식) 제출하지 않은 파일이 있으면 새로 제출
+            print(f"[BatchAPI] 제출된 Batch에 없는 요청이 있어 다시 제출: {openai_batch_id}")
+            openai_batch_id = None
+
+        if openai_batch_id is None:
+            openai_batch_id = await submit_batch(requests, {"batch_id": batch_id})
+            if on_submitted is not None:
+                on_submitted(openai_batch_id, list(requests))
+        else:
+            print(f"[BatchAPI] 제출된 Batch 이어서 대기: {openai_batch_id}")
+
+        batch = await wait_for_batch(openai_batch_id, on_progress)
+        print(f"[BatchAPI] 종료: {openai_batch_id} ({batch.status})")
+        # 만료/취소된 Batch도 끝난 요청의 출력/오류 파일이 있으므로 종료 상태와 관계없이 조회
+        outputs = await fetch_batch_outputs(batch)
+
+        # 이번에 분석할 요청의 출력만 사용 (이미 결과가 있는 파일 등 다른 custom_id는 무시)
+        for custom_id in requests:
+            output = outputs.get(custom_id)
+            if output and output["text"]:
+                analyses[custom_id] = output["text"]
+                if cache is not None:
+                    await cache.aset(cache_keys[custom_id], output["text"])
+            else:
+                error = (output or {}).get("error") or f"Batch {batch.status}"
+                results[custom_id].ai_analysis = f"AI 분석 실패: {error}"
+
+    # 3단계: 2차 판정 (실시간 경로와 동일, OpenAI 자원은 다른 배치와 공정 배정)
+    scheduler = get_batch_scheduler()
+
+    async def judge(custom_id: str, analysis_text: str):
+        async with scheduler.slot(RESOURCE_OPENAI, batch_id):
+            try:
+                await finalize_ai_analysis(results[custom_id], analysis_text)
+            except Exception as e:
+                results[custom_id].ai_analysis = f"AI 분석 실패: {str(e)}"
+                print(f"[BatchAPI] 판정 오류 ({custom_id}): {e}")
+
+    await asyncio.gather(
+        *[judge(custom_id, text) for custom_id, text in analyses.items()]
+    )
+    return results
+
+
+async def review_directory(directory: Path, ocr_engine: str, use_rag: bool) -> str:
+    """
+    보관된 광고 이미지 폴더를 오프라인 모드로 재검토 (결과는 일반 배치 결과 경로에 저장)
+
+    Returns:
+        str: 배치 ID
+    """
+    import main
+
+    image_paths = sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )
+    if not image_paths:
+        raise ValueError(f"이미지 파일이 없습니다: {directory}")
+
+    used_filenames: set = set()
+    file_paths = [
+        (path, main._dedupe_filename(path.name, used_filenames)) for path in image_paths
+    ]
+
+    batch_id = f"review_{time.strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
+    main.batch_status_store[batch_id] = main.BatchAnalysisStatus(
+        batch_id=batch_id,
+        status="processing",
+        total_files=len(file_paths),
+        processed_files=0,
+        progress_percent=0.0,
+        results=[],
+        errors=[],
+    )
+
+    # 다른 워커가 중단된 배치로 판단하지 않도록 소유권/heartbeat 유지
+    job_store = main.batch_status_store.job_store
+    job_store.claim(batch_id, main.WORKER_ID, main.JOB_STALE_SECONDS)
+    job_store.save_spec(
+        batch_id,
+        {
+            "file_paths": [[str(path), name] for path, name in file_paths],
+            "use_ai": True,
+            "ocr_engine": ocr_engine,
+            "use_rag": use_rag,
+            "analysis_mode": ANALYSIS_MODE_OFFLINE,
+        },
+    )
+
+    async def heartbeat():
+        while True:
+            await asyncio.to_thread(job_store.heartbeat, main.WORKER_ID, [batch_id])
+            await asyncio.sleep(main.JOB_HEARTBEAT_SECONDS)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    print(f"[BatchAPI] 재검토 시작: {batch_id} ({len(file_paths)}개 파일)")
+    try:
+        await main.batch_analyze_files(
+            batch_id,
+            file_paths,
+            True,
+            main.OCREngine(ocr_engine),
+            use_rag,
+            analysis_mode=ANALYSIS_MODE_OFFLINE,
+        )
+    finally:
+        heartbeat_task.cancel()
+        await main.close_naver_http_client()
+        main.shutdown_paddle_pool()
+
+    batch = main.batch_status_store[batch_id]
+    print(
+        f"[BatchAPI] 재검토 {batch.status}: {batch.processed_files}/{batch.total_files}개 처리, "
+        f"오류 {len(batch.errors)}건 → uploads/batch_results/{batch_id}.json"
+    )
+    return batch_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI Batch API 대량 재검토")
+    parser.add_argument("directory", type=Path, help="재검토할 광고 이미지 폴더")
+    parser.add_argument(
+        "--ocr-engine", choices=["naver", "paddle"], default="naver", help="OCR 엔진"
+    )
+    parser.add_argument("--no-rag", action="store_true", help="법규 검색(RAG) 미사용")
+    args = parser.parse_args()
+
+    asyncio.run(review_directory(args.directory, args.ocr_engine, not args.no_rag))
+
+
+if __name__ == "__main__":
+    main()
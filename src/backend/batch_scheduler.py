@@ -0,0 +1,162 @@
+"""
+배치 간 공정 스케줄러
+OCR 엔진/OpenAI 등 자원별로 프로세스 전체 동시 실행 수를 제한하고,
+대기 중인 작업은 배치 단위 라운드로빈으로 배정하여 큰 배치가 다른 배치를 막지 않도록 함
+"""
+
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import asyncio
+import os
+import time
+
+# 자원 이름
+RESOURCE_OCR_NAVER = "ocr:naver"
+RESOURCE_OCR_PADDLE = "ocr:paddle"
+RESOURCE_OPENAI = "openai"
+RESOURCE_OPENAI_JUDGMENT = "openai:judgment"
+
+# 자원별 동시 실행 상한 (모든 배치 합산)
+BATCH_NAVER_CONCURRENCY = int(os.getenv("BATCH_NAVER_CONCURRENCY", "5"))
+BATCH_PADDLE_CONCURRENCY = int(os.getenv("BATCH_PADDLE_CONCURRENCY", "8"))
+BATCH_OPENAI_CONCURRENCY = int(os.getenv("BATCH_OPENAI_CONCURRENCY", "8"))
+BATCH_JUDGMENT_CONCURRENCY = int(os.getenv("BATCH_JUDGMENT_CONCURRENCY", "8"))
+
+# 같은 상한을 나눠 쓰는 워커 프로세스 수 (batch_worker --processes N 실행 시 설정)
+BATCH_SCHEDULER_SHARE = max(1, int(os.getenv("BATCH_SCHEDULER_SHARE", "1")))
+
+# 대기 시간 통계에 사용할 최근 표본 수
+WAIT_SAMPLE_SIZE = 1000
+
+
+class FairScheduler:
+    """자원별 동시 실행 제한 + 배치 라운드로빈 배정"""
+
+    def __init__(self, limits: Dict[str, int]):
+        """
+        Args:
+            limits: {자원 이름: 최대 동시 실행 수}
+        """
+        self.limits = dict(limits)
+        self._active: Dict[str, int] = {name: 0 for name in limits}
+        # 자원 → {배치 ID: 대기 중인 Future 목록} (삽입 순서 = 라운드로빈 순서)
+        self._waiters: Dict[str, "OrderedDict[str, Deque[asyncio.Future]]"] = {
+            name: OrderedDict() for name in limits
+        }
+
+        # 통계
+        self._granted: Dict[str, int] = {name: 0 for name in limits}
+        self._wait_samples: Dict[str, Deque[float]] = {
+            name: deque(maxlen=WAIT_SAMPLE_SIZE) for name in limits
+        }
+
+    @asynccontextmanager
+    async def slot(self, resource: str, batch_id: str) -> AsyncIterator[None]:
+        """
+        자원 사용 슬롯 획득 (상한 초과 시 대기)
+
+        Args:
+            resource: 자원 이름 (ocr:naver, ocr:paddle, openai, openai:judgment)
+            batch_id: 요청한 배치 ID (공정 배정 단위)
+        """
+        started = time.monotonic()
+        await self._acquire(resource, batch_id)
+        self._wait_samples[resource].append(time.monotonic() - started)
+        self._granted[resource] += 1
+        try:
+            yield
+        finally:
+            self._release(resource)
+
+    async def _acquire(self, resource: str, batch_id: str):
+        waiters = self._waiters[resource]
+        if self._active[resource] < self.limits[resource] and not waiters:
+            self._active[resource] += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters.setdefault(batch_id, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # 슬롯을 받은 직후 취소된 경우 반납
+                self._release(resource)
+            else:
+                self._discard(resource, batch_id, future)
+            raise
+
+    def _discard(self, resource: str, batch_id: str, future: asyncio.Future):
+        queue = self._waiters[resource].get(batch_id)
+        if queue is None:
+            return
+        try:
+            queue.remove(future)
+        except ValueError:
+            pass
+        if not queue:
+            del self._waiters[resource][batch_id]
+
+    def _release(self, resource: str):
+        self._active[resource] -= 1
+        waiters = self._waiters[resource]
+
+        # 대기 중인 배치를 순서대로 돌며 하나씩 배정
+        while waiters and self._active[resource] < self.limits[resource]:
+            batch_id, queue = next(iter(waiters.items()))
+            future = queue.popleft()
+            del waiters[batch_id]
+            if queue:
+                # 남은 대기가 있으면 맨 뒤로 (라운드로빈)
+                waiters[batch_id] = queue
+            if future.done():
+                continue
+            self._active[resource] += 1
+            future.set_result(None)
+
+    def limit(self, resource: str) -> int:
+        return self.limits[resource]
+
+    def stats(self) -> Dict[str, Any]:
+        """자원별 사용량/대기열 깊이/대기 시간 통계"""
+        stats = {}
+        for name in self.limits:
+            samples = sorted(self._wait_samples[name])
+            waiting = sum(len(queue) for queue in self._waiters[name].values())
+            stats[name] = {
+                "limit": self.limits[name],
+                "active": self._active[name],
+                "waiting": waiting,
+                "waiting_batches": len(self._waiters[name]),
+                "granted": self._granted[name],
+                "wait_avg_ms": round(sum(samples) / len(samples) * 1000, 1) if samples else 0.0,
+                "wait_p95_ms": round(
+                    samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1
+                )
+                if samples
+                else 0.0,
+                "wait_max_ms": round(samples[-1] * 1000, 1) if samples else 0.0,
+            }
+        return stats
+
+
+# 싱글톤 인스턴스
+_batch_scheduler: Optional[FairScheduler] = None
+
+
+def get_batch_scheduler() -> FairScheduler:
+    """배치 스케줄러 싱글톤 반환 (워커 프로세스 수만큼 상한을 나눠 사용)"""
+    global _batch_scheduler
+    if _batch_scheduler is None:
+        _batch_scheduler = FairScheduler(
+            {
+                RESOURCE_OCR_NAVER: max(1, BATCH_NAVER_CONCURRENCY // BATCH_SCHEDULER_SHARE),
+                RESOURCE_OCR_PADDLE: max(1, BATCH_PADDLE_CONCURRENCY // BATCH_SCHEDULER_SHARE),
+                RESOURCE_OPENAI: max(1, BATCH_OPENAI_CONCURRENCY // BATCH_SCHEDULER_SHARE),
+                RESOURCE_OPENAI_JUDGMENT: max(
+                    1, BATCH_JUDGMENT_CONCURRENCY // BATCH_SCHEDULER_SHARE
+                ),
+            }
+        )
+    return _batch_scheduler
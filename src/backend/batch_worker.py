@@ -0,0 +1,125 @@
+"""
+배치 분석 워커 프로세스
+BATCH_EXECUTION=queue 설정 시 API 서버가 대기열에 넣은 배치를 작업 저장소에서 꺼내 처리
+
+- 프로세스마다 여러 배치를 동시에 처리하되, OCR 엔진/OpenAI 호출은
+  배치 스케줄러의 자원별 상한 내에서 배치 간 번갈아 실행
+- --processes N 으로 실행하면 자원별 상한을 N개 프로세스가 나눠 사용
+
+사용법 (backend 폴더에서 실행):
+    python batch_worker.py
+    python batch_worker.py --processes 2 --max-batches 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+# 대기열이 비었을 때 다시 확인하는 간격 (초)
+BATCH_WORKER_POLL_SECONDS = float(os.getenv("BATCH_WORKER_POLL_SECONDS", "1"))
+# 프로세스당 동시에 처리할 최대 배치 수
+BATCH_WORKER_MAX_BATCHES = int(os.getenv("BATCH_WORKER_MAX_BATCHES", "4"))
+
+
+async def run_batch(batch_id: str):
+    """대기열에서 꺼낸 배치 처리"""
+    import main
+
+    job_store = main.batch_status_store.job_store
+    spec = await asyncio.to_thread(job_store.load_spec, batch_id)
+    batch = await asyncio.to_thread(main.batch_status_store.adopt, batch_id)
+    if spec is None or batch is None:
+        print(f"[Worker] 배치 정보를 찾을 수 없음: {batch_id}")
+        return
+
+    batch.status = "processing"
+    main.batch_status_store.persist(batch_id)
+
+    await main.batch_analyze_files(
+        batch_id,
+        main.remaining_files(spec, batch),
+        spec["use_ai"],
+        main.OCREngine(spec["ocr_engine"]),
+        spec["use_rag"],
+        resume=bool(batch.results),
+        analysis_mode=spec.get("analysis_mode", main.ANALYSIS_MODE_REALTIME),
+    )
+
+
+async def run_worker(max_batches: int):
+    """대기열 처리 루프 (프로세스당 1개)"""
+    import main
+
+    job_store = main.batch_status_store.job_store
+    batch_slots = asyncio.Semaphore(max_batches)
+    heartbeat_task = asyncio.create_task(main.periodic_job_heartbeat())
+    print(f"[Worker] 시작됨 ({main.WORKER_ID}, 최대 {max_batches}개 배치 동시 처리)")
+
+    try:
+        while True:
+            await batch_slots.acquire()
+            claimed = await asyncio.to_thread(job_store.claim_next_queued, main.WORKER_ID)
+            if claimed is None:
+                batch_slots.release()
+                await asyncio.sleep(BATCH_WORKER_POLL_SECONDS)
+                continue
+
+            batch_id = claimed["batch_id"]
+            if claimed["queued_at"]:
+                main.record_queue_wait(time.time() - claimed["queued_at"])
+            print(f"[Worker] 배치 처리 시작: {batch_id}")
+
+            task = asyncio.create_task(run_batch(batch_id))
+            task.add_done_callback(lambda _: batch_slots.release())
+    finally:
+        heartbeat_task.cancel()
+        await main.batch_status_store.flush()
+        await main.close_naver_http_client()
+        main.shutdown_paddle_pool()
+
+
+def _worker_process_main(max_batches: int):
+    """워커 프로세스 진입점"""
+    try:
+        asyncio.run(run_worker(max_batches))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배치 분석 워커")
+    parser.add_argument("--processes", type=int, default=1, help="워커 프로세스 수")
+    parser.add_argument(
+        "--max-batches",
+        type=int,
+        default=BATCH_WORKER_MAX_BATCHES,
+        help="프로세스당 동시에 처리할 최대 배치 수",
+    )
+    args = parser.parse_args()
+
+    # 자원별 상한을 프로세스 수만큼 나눠 사용 (자식 프로세스가 상속)
+    os.environ["BATCH_SCHEDULER_SHARE"] = str(max(1, args.processes))
+
+    if args.processes <= 1:
+        _worker_process_main(args.max_batches)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker_process_main, args=(args.max_batches,))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+벡터 저장소 백엔드 벤치마크 (Chroma vs NumPy 전수 검색)
+data/ 법규 코퍼스를 두 백엔드에 같은 임베딩으로 인덱싱한 뒤
+인덱싱/로드 시간, 단건/일괄 검색 지연, Chroma(HNSW) 결과의 정확 검색 대비 재현율을 비교
+
+- 문서/쿼리 임베딩은 한 번만 계산하여 두 백엔드가 공유 (저장소 자체 비용만 측정)
+- 인덱스는 임시 폴더에 만들므로 기존 chroma_db/, vector_index/에는 영향 없음
+
+사용법 (backend 폴더에서 실행, EMBEDDING_BACKEND 설정의 임베딩 사용):
+    python benchmark_vector_store.py [--top-k 5] [--repeat 50]
+"""
+
+from pathlib import Path
+from typing import Dict, List
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+from rag.embeddings import CachedQueryEmbeddings, create_embeddings
+from rag.vector_store import (
+    VECTOR_STORE_BACKEND_CHROMA,
+    VECTOR_STORE_BACKEND_NUMPY,
+    create_vector_store,
+)
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# 검색 쿼리 (광고 문구 예시)
+SAMPLE_QUERIES = [
+    "100% 완치 보장! 부작용 없는 안전한 시술",
+    "국내 최초 최고의 기술력으로 통증 없는 임플란트",
+    "시술 전후 사진으로 확인하는 놀라운 효과",
+    "지금 예약하면 비급여 진료비 50% 할인 이벤트",
+    "유명 연예인도 다녀간 강남 성형외과",
+    "환자 후기: 한 번의 시술로 10년 젊어졌어요",
+    "다른 병원에서 실패한 수술도 재수술 성공률 99%",
+    "보건복지부 인증 의료기관, 전문의 직접 진료",
+    "무료 상담 및 교통비 지원, 소개 시 추가 혜택",
+    "신의료기술 줄기세포 치료로 관절염 완치",
+    "라식 라섹 수술 후 다음날 바로 일상생활 가능",
+    "탈모 치료 효과 보장, 효과 없으면 전액 환불",
+    "대학병원보다 저렴한 가격으로 최고의 치료",
+    "방송에 소개된 다이어트 한약, 한 달 10kg 감량",
+    "의료광고 심의필 번호 없이 게재된 병원 광고",
+    "치아미백 1회 시술로 연예인 치아 완성",
+]
+
+
+class _SharedDocumentEmbeddings(CachedQueryEmbeddings):
+    """문서 임베딩을 기억하여 두 백엔드 인덱싱 시 한 번만 계산"""
+
+    def __init__(self, inner: CachedQueryEmbeddings):
+        super().__init__(inner.base, inner.model_name, inner.provider)
+        self._documents: Dict[str, List[float]] = {}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        missing = [text for text in dict.fromkeys(texts) if text not in self._documents]
+        if missing:
+            for text, vector in zip(missing, super().embed_documents(missing)):
+                self._documents[text] = vector
+        return [self._documents[text] for text in texts]
+
+
+def _index_corpus(store) -> int:
+    """data/ 폴더의 .txt, .pdf 파일을 인덱싱"""
+    total = 0
+    for ext in (".txt", ".pdf"):
+        for file_path in sorted(DATA_DIR.glob(f"*{ext}")):
+            total += store.load_and_index_documents(str(file_path))
+    return total
+
+
+def _timings_ms(func, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _result_keys(results: List[tuple]) -> set:
+    return {(doc.metadata.get("source"), doc.metadata.get("chunk_id")) for doc, _ in results}
+
+
+def run_benchmark(top_k: int, repeat: int):
+    embeddings = _SharedDocumentEmbeddings(create_embeddings())
+    query_vectors = embeddings.embed_queries(SAMPLE_QUERIES)
+    work_dir = Path(tempfile.mkdtemp(prefix="vector_store_bench_"))
+
+    # 문서 임베딩 미리 계산 (인덱싱 시간에서 임베딩 호출 제외)
+    warmup = create_vector_store(
+        VECTOR_STORE_BACKEND_NUMPY, persist_directory=str(work_dir / "warmup"), embeddings=embeddings
+    )
+    chunks = _index_corpus(warmup)
+    print(f"[Bench] 코퍼스: {DATA_DIR} ({chunks} chunks), 쿼리 {len(SAMPLE_QUERIES)}개, top_k={top_k}")
+
+    results = {}
+    try:
+        for backend in (VECTOR_STORE_BACKEND_CHROMA, VECTOR_STORE_BACKEND_NUMPY):
+            persist_directory = str(work_dir / backend)
+
+            started = time.perf_counter()
+            store = create_vector_store(
+                backend, persist_directory=persist_directory, embeddings=embeddings
+            )
+            _index_corpus(store)
+            index_ms = (time.perf_counter() - started) * 1000
+
+            # 저장된 인덱스를 새로 여는 시간 (서버 재시작 시)
+            started = time.perf_counter()
+            store = create_vector_store(
+                backend, persist_directory=persist_directory, embeddings=embeddings
+            )
+            store.get_collection_count()
+            load_ms = (time.perf_counter() - started) * 1000
+
+            single = _timings_ms(
+                lambda: [store.search_by_vectors_with_score([v], top_k) for v in query_vectors],
+                repeat,
+            )
+            batch = _timings_ms(lambda: store.search_by_vectors_with_score(query_vectors, top_k), repeat)
+
+            results[backend] = {
+                "index_ms": index_ms,
+                "load_ms": load_ms,
+                "single_ms": statistics.median(single) / len(query_vectors),
+                "batch_ms": statistics.median(batch),
+                "hits": store.search_by_vectors_with_score(query_vectors, top_k),
+            }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    # NumPy 전수 검색 결과를 정답으로 Chroma(HNSW) 재현율 계산
+    exact = results[VECTOR_STORE_BACKEND_NUMPY]["hits"]
+    approx = results[VECTOR_STORE_BACKEND_CHROMA]["hits"]
+    recall = statistics.mean(
+        len(_result_keys(a) & _result_keys(e)) / max(1, len(e)) for a, e in zip(approx, exact)
+    )
+
+    print(f"\n{'백엔드':<8} {'인덱싱(ms)':>12} {'로드(ms)':>10} {'단건 검색(ms)':>14} {'일괄 검색(ms)':>14}")
+    for backend, r in results.items():
+        print(
+            f"{backend:<8} {r['index_ms']:>12.1f} {r['load_ms']:>10.1f} "
+            f"{r['single_ms']:>14.3f} {r['batch_ms']:>14.3f}"
+        )
+    print(f"\n[Bench] 단건 검색: 쿼리 1개당 중앙값, 일괄 검색: 쿼리 {len(query_vectors)}개 한 번에 (반복 {repeat}회 중앙값)")
+    print(f"[Bench] Chroma top-{top_k} 재현율 (NumPy 정확 검색 대비): {recall:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 저장소 백엔드 벤치마크 (Chroma vs NumPy)")
+    parser.add_argument("--top-k", type=int, default=5, help="쿼리별 검색 결과 수")
+    parser.add_argument("--repeat", type=int, default=50, help="검색 반복 횟수")
+    args = parser.parse_args()
+
+    run_benchmark(args.top_k, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,623 @@
+"""
+분석 이력 저장소
+배치 분석 결과를 인덱스가 있는 SQLite DB에 저장하여
+관리자 이력 조회/통계를 JSON 파일 전체 스캔 없이 쿼리로 처리
+
+통계는 일별 집계 테이블(daily_*)을 결과 저장/삭제 시 증분 갱신하므로
+기간 조회는 해당 일자 버킷 합산만으로 처리됩니다.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import json
+import sqlite3
+import threading
+
+# 기본 DB 경로 (uploads/analysis_history.sqlite3)
+HISTORY_DB_PATH = Path(__file__).parent / "uploads" / "analysis_history.sqlite3"
+
+# 정렬용 위험도/판정 순서
+RISK_LEVEL_ORDER = {"N/A": 0, "SAFE": 1, "LOW": 2, "MEDIUM": 3, "HIGH": 4, "CRITICAL": 5}
+JUDGMENT_ORDER = {"불필요": 0, "통과": 1, "주의": 2, "수정제안": 3, "수정권고": 4, "게재불가": 5}
+
+# 정렬 기준 → SQL 컬럼 (허용 목록)
+SORT_COLUMNS = {
+    "completed_at": "completed_at",
+    "filename": "filename",
+    "risk_level": "risk_rank",
+    "judgment": "judgment_rank",
+}
+
+
+class AnalysisHistoryStore:
+    """분석 이력 SQLite 저장소"""
+
+    def __init__(self, db_path: Path = HISTORY_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._create_schema()
+
+    def _create_schema(self):
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_results (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch_id TEXT NOT NULL,
+                result_index INTEGER NOT NULL,
+                filename TEXT NOT NULL,
+                risk_level TEXT NOT NULL,
+                risk_rank INTEGER NOT NULL,
+                judgment TEXT NOT NULL,
+                judgment_rank INTEGER NOT NULL,
+                violation_count INTEGER NOT NULL,
+                total_score INTEGER NOT NULL,
+                completed_at TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                error TEXT,
+                result_json TEXT NOT NULL,
+                UNIQUE (batch_id, result_index)
+            );
+            CREATE INDEX IF NOT EXISTS idx_results_completed_at ON analysis_results(completed_at);
+            CREATE INDEX IF NOT EXISTS idx_results_risk_level ON analysis_results(risk_level, completed_at);
+            CREATE INDEX IF NOT EXISTS idx_results_judgment ON analysis_results(judgment, completed_at);
+            CREATE INDEX IF NOT EXISTS idx_results_batch_id ON analysis_results(batch_id, filename);
+
+            CREATE TABLE IF NOT EXISTS analysis_violations (
+                result_id INTEGER NOT NULL REFERENCES analysis_results(id) ON DELETE CASCADE,
+                keyword TEXT NOT NULL,
+                category TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                count INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_violations_result_id ON analysis_violations(result_id);
+
+            CREATE TABLE IF NOT EXISTS daily_summary (
+                day TEXT PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0,
+                with_violations INTEGER NOT NULL DEFAULT 0,
+                success_count INTEGER NOT NULL DEFAULT 0,
+                score_sum INTEGER NOT NULL DEFAULT 0,
+                score_count INTEGER NOT NULL DEFAULT 0
+            );
+
+            CREATE TABLE IF NOT EXISTS daily_counts (
+                day TEXT NOT NULL,
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, dimension, key)
+            );
+
+            CREATE TABLE IF NOT EXISTS daily_keyword_counts (
+                day TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                category TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, keyword)
+            );
+            """
+        )
+        self._conn.commit()
+
+        # 집계 테이블 도입 전 DB면 기존 결과로 집계 재구성
+        has_results = self._conn.execute(
+            "SELECT 1 FROM analysis_results LIMIT 1"
+        ).fetchone()
+        has_rollups = self._conn.execute("SELECT 1 FROM daily_summary LIMIT 1").fetchone()
+        if has_results and not has_rollups:
+            self.rebuild_rollups()
+
+    # ------------------------------------------------------------
+    # 일별 집계 (증분 갱신)
+    # ------------------------------------------------------------
+
+    def _apply_rollup(
+        self,
+        completed_at: str,
+        risk_level: str,
+        judgment: str,
+        violation_count: int,
+        total_score: int,
+        success: bool,
+        violations: List[Dict[str, Any]],
+        sign: int,
+    ):
+        """결과 1건을 일별 집계에 반영 (sign: 저장 시 +1, 삭제 시 -1)"""
+        day = (completed_at or "")[:10]
+
+        self._conn.execute(
+            """
+            INSERT INTO daily_summary (day, total, with_violations, success_count, score_sum, score_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(day) DO UPDATE SET
+                total = total + excluded.total,
+                with_violations = with_violations + excluded.with_violations,
+                success_count = success_count + excluded.success_count,
+                score_sum = score_sum + excluded.score_sum,
+                score_count = score_count + excluded.score_count
+            """,
+            (
+                day,
+                sign,
+                sign if violation_count > 0 else 0,
+                sign if success else 0,
+                sign * total_score if total_score >= 0 else 0,
+                sign if total_score >= 0 else 0,
+            ),
+        )
+
+        counts = [("risk_level", risk_level, sign)]
+        if judgment:
+            counts.append(("judgment", judgment, sign))
+        for v in violations:
+            if v["category"]:
+                counts.append(("category", v["category"], sign * v["count"]))
+
+        self._conn.executemany(
+            """
+            INSERT INTO daily_counts (day, dimension, key, count) VALUES (?, ?, ?, ?)
+            ON CONFLICT(day, dimension, key) DO UPDATE SET count = count + excluded.count
+            """,
+            [(day, dimension, key, delta) for dimension, key, delta in counts],
+        )
+
+        self._conn.executemany(
+            """
+            INSERT INTO daily_keyword_counts (day, keyword, category, severity, count)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(day, keyword) DO UPDATE SET count = count + excluded.count
+            """,
+            [
+                (day, v["keyword"], v["category"], v["severity"], sign * v["count"])
+                for v in violations
+                if v["keyword"]
+            ],
+        )
+
+    def _prune_rollups(self):
+        """삭제로 0이 된 집계 행 정리"""
+        self._conn.execute("DELETE FROM daily_summary WHERE total <= 0")
+        self._conn.execute("DELETE FROM daily_counts WHERE count <= 0")
+        self._conn.execute("DELETE FROM daily_keyword_counts WHERE count <= 0")
+
+    def rebuild_rollups(self):
+        """저장된 전체 결과로 일별 집계 재구성"""
+        with self._lock:
+            self._conn.execute("DELETE FROM daily_summary")
+            self._conn.execute("DELETE FROM daily_counts")
+            self._conn.execute("DELETE FROM daily_keyword_counts")
+
+            rows = self._conn.execute(
+                """
+                SELECT id, completed_at, risk_level, judgment, violation_count, total_score, success
+                FROM analysis_results
+                """
+            ).fetchall()
+            for row in rows:
+                self._apply_rollup(
+                    row["completed_at"],
+                    row["risk_level"],
+                    row["judgment"],
+                    row["violation_count"],
+                    row["total_score"],
+                    bool(row["success"]),
+                    self._fetch_violations(row["id"]),
+                    +1,
+                )
+            self._conn.commit()
+
+    def _fetch_violations(self, result_id: int) -> List[Dict[str, Any]]:
+        return [
+            dict(row)
+            for row in self._conn.execute(
+                """
+                SELECT keyword, category, severity, count
+                FROM analysis_violations WHERE result_id = ?
+                """,
+                (result_id,),
+            ).fetchall()
+        ]
+
+    # ------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------
+
+    def record_batch(
+        self, batch_id: str, results: List[Dict[str, Any]], completed_at: str
+    ) -> int:
+        """
+        배치 결과 저장 (이미 저장된 결과는 무시)
+
+        Args:
+            batch_id: 배치 ID
+            results: 파일별 분석 결과 리스트
+            completed_at: 배치 완료 시각 (ISO format)
+
+        Returns:
+            새로 저장된 결과 수
+        """
+        inserted = 0
+        with self._lock:
+            for index, result in enumerate(results):
+                analysis = result.get("analysis_result") or {}
+                risk_level = analysis.get("risk_level", "N/A")
+                judgment = analysis.get("judgment", "")
+
+                cursor = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO analysis_results (
+                        batch_id, result_index, filename, risk_level, risk_rank,
+                        judgment, judgment_rank, violation_count, total_score,
+                        completed_at, success, error, result_json
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        batch_id,
+                        index,
+                        result.get("filename", ""),
+                        risk_level,
+                        RISK_LEVEL_ORDER.get(risk_level, 0),
+                        judgment,
+                        JUDGMENT_ORDER.get(judgment, 0),
+                        analysis.get("violation_count", 0),
+                        analysis.get("total_score", 0),
+                        completed_at,
+                        1 if result.get("success", False) else 0,
+                        result.get("error"),
+                        json.dumps(result, ensure_ascii=False),
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+
+                inserted += 1
+                violations = [
+                    {
+                        "keyword": v.get("keyword", ""),
+                        "category": v.get("category", ""),
+                        "severity": v.get("severity", "MEDIUM"),
+                        "count": v.get("count", 1),
+                    }
+                    for v in analysis.get("violations", [])
+                ]
+                self._conn.executemany(
+                    """
+                    INSERT INTO analysis_violations (result_id, keyword, category, severity, count)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (cursor.lastrowid, v["keyword"], v["category"], v["severity"], v["count"])
+                        for v in violations
+                    ],
+                )
+
+                # 일별 집계 증분 갱신
+                self._apply_rollup(
+                    completed_at,
+                    risk_level,
+                    judgment,
+                    analysis.get("violation_count", 0),
+                    analysis.get("total_score", 0),
+                    bool(result.get("success", False)),
+                    violations,
+                    +1,
+                )
+            self._conn.commit()
+
+        return inserted
+
+    # ------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------
+
+    @staticmethod
+    def _build_filters(
+        risk_level: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Tuple[str, List[Any]]:
+        """WHERE 절 생성 (날짜는 ISO 문자열 비교로 인덱스 범위 검색)"""
+        clauses = []
+        params: List[Any] = []
+
+        if risk_level:
+            clauses.append("risk_level = ?")
+            params.append(risk_level)
+        if start_date:
+            clauses.append("completed_at >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("completed_at <= ?")
+            params.append(end_date + "T23:59:59")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query_history(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        risk_level: Optional[str] = None,
+        sort_by: str = "completed_at",
+        sort_order: str = "desc",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        분석 이력 페이지 조회
+
+        Returns:
+            (현재 페이지 항목 리스트, 전체 항목 수)
+        """
+        where, params = self._build_filters(risk_level, start_date, end_date)
+        column = SORT_COLUMNS.get(sort_by, "completed_at")
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        offset = max(page - 1, 0) * page_size
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM analysis_results {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT batch_id, filename, risk_level, judgment, violation_count,
+                       total_score, completed_at, success, error
+                FROM analysis_results {where}
+                ORDER BY {column} {direction}, id {direction}
+                LIMIT ? OFFSET ?
+                """,
+                params + [page_size, offset],
+            ).fetchall()
+
+        items = [
+            {
+                "batch_id": row["batch_id"],
+                "filename": row["filename"],
+                "risk_level": row["risk_level"],
+                "judgment": row["judgment"],
+                "violation_count": row["violation_count"],
+                "total_score": row["total_score"],
+                "completed_at": row["completed_at"],
+                "success": bool(row["success"]),
+                "error": row["error"],
+            }
+            for row in rows
+        ]
+        return items, total
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """배치의 저장된 결과 전체 조회 (JSON 결과 파일이 없을 때 사용)"""
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT result_json, completed_at FROM analysis_results
+                WHERE batch_id = ? ORDER BY result_index
+                """,
+                (batch_id,),
+            ).fetchall()
+
+        if not rows:
+            return None
+
+        results = [json.loads(row["result_json"]) for row in rows]
+        return {
+            "batch_id": batch_id,
+            "total_files": len(results),
+            "processed_files": len(results),
+            "results": results,
+            "errors": [
+                f"{r.get('filename', '')}: {r.get('error')}"
+                for r in results
+                if not r.get("success")
+            ],
+            "completed_at": rows[0]["completed_at"],
+        }
+
+    def get_statistics_aggregates(
+        self, start_date: Optional[str] = None, end_date: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        기간 내 일별 집계 합산
+
+        Args:
+            start_date: 시작 날짜 (YYYY-MM-DD, 포함)
+            end_date: 종료 날짜 (YYYY-MM-DD, 포함)
+
+        Returns:
+            {
+                "total", "with_violations", "success_count", "score_sum", "score_count",
+                "risk_counts": {위험도: 건수}, "judgment_counts": {판정: 건수},
+                "category_counts": {카테고리: 건수},
+                "keywords": [{"keyword", "category", "severity", "count"}, ...] (건수 내림차순)
+            }
+        """
+        clauses = []
+        params: List[Any] = []
+        if start_date:
+            clauses.append("day >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append("day <= ?")
+            params.append(end_date)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        and_where = f"AND {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            row = self._conn.execute(
+                f"""
+                SELECT COALESCE(SUM(total), 0), COALESCE(SUM(with_violations), 0),
+                       COALESCE(SUM(success_count), 0), COALESCE(SUM(score_sum), 0),
+                       COALESCE(SUM(score_count), 0)
+                FROM daily_summary {where}
+                """,
+                params,
+            ).fetchone()
+
+            dimension_counts: Dict[str, Dict[str, int]] = {
+                "risk_level": {},
+                "judgment": {},
+                "category": {},
+            }
+            for dimension in dimension_counts:
+                for key, count in self._conn.execute(
+                    f"""
+                    SELECT key, SUM(count) FROM daily_counts
+                    WHERE dimension = ? {and_where}
+                    GROUP BY key HAVING SUM(count) > 0
+                    """,
+                    [dimension] + params,
+                ).fetchall():
+                    dimension_counts[dimension][key] = count
+
+            keywords = [
+                {
+                    "keyword": r[0],
+                    "category": r[1],
+                    "severity": r[2],
+                    "count": r[3],
+                }
+                for r in self._conn.execute(
+                    f"""
+                    SELECT keyword, MIN(category), MIN(severity), SUM(count) AS total
+                    FROM daily_keyword_counts {where}
+                    GROUP BY keyword HAVING total > 0
+                    ORDER BY total DESC, keyword ASC
+                    """,
+                    params,
+                ).fetchall()
+            ]
+
+        return {
+            "total": row[0],
+            "with_violations": row[1],
+            "success_count": row[2],
+            "score_sum": row[3],
+            "score_count": row[4],
+            "risk_counts": dimension_counts["risk_level"],
+            "judgment_counts": dimension_counts["judgment"],
+            "category_counts": dimension_counts["category"],
+            "keywords": keywords,
+        }
+
+    def count(self) -> int:
+        """저장된 결과 수"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0]
+
+    # ------------------------------------------------------------
+    # 삭제
+    # ------------------------------------------------------------
+
+    def delete_items(self, items_by_batch: Dict[str, List[str]]) -> int:
+        """
+        배치 ID + 파일명으로 이력 삭제
+
+        Args:
+            items_by_batch: {batch_id: [filename, ...]}
+
+        Returns:
+            삭제된 결과 수
+        """
+        deleted = 0
+        with self._lock:
+            for batch_id, filenames in items_by_batch.items():
+                placeholders = ",".join("?" for _ in filenames)
+                rows = self._conn.execute(
+                    f"""
+                    SELECT id, completed_at, risk_level, judgment, violation_count,
+                           total_score, success
+                    FROM analysis_results
+                    WHERE batch_id = ? AND filename IN ({placeholders})
+                    """,
+                    [batch_id, *filenames],
+                ).fetchall()
+
+                for row in rows:
+                    # 일별 집계에서 차감 후 삭제
+                    self._apply_rollup(
+                        row["completed_at"],
+                        row["risk_level"],
+                        row["judgment"],
+                        row["violation_count"],
+                        row["total_score"],
+                        bool(row["success"]),
+                        self._fetch_violations(row["id"]),
+                        -1,
+                    )
+                    self._conn.execute(
+                        "DELETE FROM analysis_results WHERE id = ?", (row["id"],)
+                    )
+                    deleted += 1
+
+            self._prune_rollups()
+            self._conn.commit()
+
+        return deleted
+
+    # ------------------------------------------------------------
+    # 기존 JSON 결과 가져오기
+    # ------------------------------------------------------------
+
+    def import_json_dir(self, batch_results_dir: Path) -> Tuple[int, int]:
+        """
+        uploads/batch_results/batch_*.json 파일을 DB로 가져오기 (중복 실행 안전)
+
+        Args:
+            batch_results_dir: 배치 결과 JSON 폴더
+
+        Returns:
+            (처리한 배치 파일 수, 새로 저장된 결과 수)
+        """
+        batch_results_dir = Path(batch_results_dir)
+        if not batch_results_dir.exists():
+            return 0, 0
+
+        batches = 0
+        inserted = 0
+        for json_file in sorted(batch_results_dir.glob("batch_*.json")):
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    batch_data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"[분석 이력] 파일 읽기 오류: {json_file} - {e}")
+                continue
+
+            batches += 1
+            inserted += self.record_batch(
+                batch_data.get("batch_id", json_file.stem),
+                batch_data.get("results", []),
+                batch_data.get("completed_at", ""),
+            )
+
+        return batches, inserted
+
+
+# 싱글톤 인스턴스
+_history_store: Optional[AnalysisHistoryStore] = None
+
+
+def get_history_store() -> AnalysisHistoryStore:
+    """분석 이력 저장소 싱글톤 반환"""
+    global _history_store
+    if _history_store is None:
+        _history_store = AnalysisHistoryStore()
+    return _history_store
+
+
+if __name__ == "__main__":
+    # 기존 배치 결과 JSON 일괄 가져오기
+    import sys
+
+    source_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("uploads/batch_results")
+
+    store = get_history_store()
+    batch_count, result_count = store.import_json_dir(source_dir)
+    print(f"[분석 이력] {batch_count}개 배치 파일에서 {result_count}건 가져옴")
+    print(f"[분석 이력] 총 {store.count()}건 저장됨 ({store.db_path})")
@@ -1,21 +1,14 @@
 """
-통합 의료 광고 분석 엔진
+통합 의료 광고 분석 엔진 (CLI)
 OCR + 키워드 탐지 + GPT-4 분석을 통합한 전체 파이프라인
+API 서버와 같은 AnalysisEngine을 동기 래퍼로 사용 (OCR/LLM 캐시, 호출 한도, 재시도 공통 적용)
 """
 
-import os
-import json
-import requests
 import time
 from pathlib import Path
 from typing import Dict, Optional
-from dotenv import load_dotenv
-from ad_analyzer import analyze_complete
-
-load_dotenv()
-
-NAVER_OCR_API_URL = os.getenv("NAVER_OCR_API_URL")
-NAVER_OCR_SECRET_KEY = os.getenv("NAVER_OCR_SECRET_KEY")
+from analysis_engine import get_sync_analysis_engine
+from ocr_service import NAVER_OCR_API_URL, NAVER_OCR_SECRET_KEY, OCREngine
 
 
 class AnalysisResult:
@@ -91,6 +84,7 @@ class MedicalAdAnalyzer:
         """초기화"""
         if not NAVER_OCR_API_URL or not NAVER_OCR_SECRET_KEY:
             raise ValueError("OCR API 설정이 필요합니다. .env 파일을 확인하세요.")
+        self.engine = get_sync_analysis_engine()
 
     def analyze_image(self, image_path: str, use_ai: bool = True) -> AnalysisResult:
         """
@@ -113,7 +107,7 @@ class MedicalAdAnalyzer:
             # 1단계: OCR 텍스트 추출
             print("📷 1단계: OCR 텍스트 추출 중...")
             ocr_start = time.time()
-            ocr_result = self._perform_ocr(image_path)
+            ocr_result = self.engine.ocr(Path(image_path), OCREngine.NAVER)
             result.ocr_processing_time = time.time() - ocr_start
 
             if not ocr_result["success"]:
@@ -122,14 +116,15 @@ class MedicalAdAnalyzer:
                 return result
 
             result.ocr_text = ocr_result["text"]
-            result.ocr_confidence = ocr_result["confidence"]
+            # Naver 신뢰도(0-1)를 백분율로 표시
+            result.ocr_confidence = round(ocr_result["confidence"] * 100, 2)
             print(f"✅ OCR 완료 ({result.ocr_processing_time:.2f}초)")
             print(f"   추출된 텍스트: {result.ocr_text[:100]}...")
 
             # 2단계: 키워드 + GPT-4 분석
             print("\n🔍 2단계: 키워드 탐지 및 AI 분석 중...")
             ai_start = time.time()
-            analysis_result = analyze_complete(result.ocr_text, use_ai=use_ai)
+            analysis_result = self.engine.analyze_text(result.ocr_text, use_ai=use_ai)
             result.ai_processing_time = time.time() - ai_start
 
             # 키워드 분석 결과 저장
@@ -159,89 +154,6 @@ class MedicalAdAnalyzer:
 
         return result
 
-    def _perform_ocr(self, image_path: str) -> Dict:
-        """
-        Naver Clova OCR을 사용하여 이미지에서 텍스트 추출
-
-        Args:
-            image_path: 이미지 파일 경로
-
-        Returns:
-            dict: OCR 결과
-        """
-        try:
-            # 이미지 파일 읽기
-            with open(image_path, "rb") as f:
-                image_data = f.read()
-
-            # 파일 확장자 확인
-            file_ext = Path(image_path).suffix.lower()
-            image_format = "jpg" if file_ext in [".jpg", ".jpeg"] else "png"
-
-            # 요청 본문 구성
-            request_json = {
-                "images": [{"format": image_format, "name": "medical_ad_image"}],
-                "requestId": f"ocr-{int(time.time())}",
-                "version": "V2",
-                "timestamp": 0,
-            }
-
-            # 헤더 설정
-            headers = {"X-OCR-SECRET": NAVER_OCR_SECRET_KEY}
-
-            # 파일 데이터 설정
-            files = {
-                "message": (None, json.dumps(request_json), "application/json"),
-                "file": (Path(image_path).name, image_data, f"image/{image_format}"),
-            }
-
-            # API 요청
-            response = requests.post(
-                NAVER_OCR_API_URL, headers=headers, files=files, timeout=30
-            )
-
-            if response.status_code == 200:
-                api_result = response.json()
-
-                # 추출된 텍스트 및 신뢰도 계산
-                extracted_text = ""
-                total_confidence = 0.0
-                fields_count = 0
-
-                if "images" in api_result and len(api_result["images"]) > 0:
-                    fields = api_result["images"][0].get("fields", [])
-                    fields_count = len(fields)
-
-                    for field in fields:
-                        text = field.get("inferText", "")
-                        confidence = field.get("inferConfidence", 0.0)
-                        extracted_text += text + " "
-                        total_confidence += confidence
-
-                    # 평균 신뢰도 계산
-                    avg_confidence = (
-                        (total_confidence / fields_count * 100)
-                        if fields_count > 0
-                        else 0.0
-                    )
-                else:
-                    avg_confidence = 0.0
-
-                return {
-                    "success": True,
-                    "text": extracted_text.strip(),
-                    "confidence": round(avg_confidence, 2),
-                    "fields_count": fields_count,
-                }
-            else:
-                return {
-                    "success": False,
-                    "error": f"OCR API 오류: HTTP {response.status_code}",
-                }
-
-        except Exception as e:
-            return {"success": False, "error": f"OCR 처리 중 오류: {str(e)}"}
-
     def _determine_pass_fail(self, result: AnalysisResult) -> str:
         """
         최종 합격/불합격 판정
@@ -0,0 +1,705 @@
+"""
+배치 작업 상태 저장소
+배치 진행 상태/결과/작업 명세를 프로세스 외부에 저장하여
+여러 uvicorn 워커가 상태를 공유하고, 중단된 배치를 다른 워커가 이어서 처리
+배치 대기열(queued)과 워커 프로세스 지표도 함께 보관
+
+백엔드:
+- sqlite (기본): 로컬 SQLite 파일 (같은 호스트의 워커끼리 공유)
+- redis: Redis 호환 서버 (redis 패키지 필요)
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 작업 저장소 설정
+JOB_STORE_BACKEND = os.getenv("JOB_STORE_BACKEND", "sqlite").lower()
+JOB_STORE_PATH = Path(
+    os.getenv(
+        "JOB_STORE_PATH",
+        str(Path(__file__).parent / "uploads" / "batch_jobs.sqlite3"),
+    )
+)
+JOB_STORE_REDIS_URL = os.getenv("JOB_STORE_REDIS_URL", "redis://localhost:6379/0")
+JOB_STORE_REDIS_PREFIX = os.getenv("JOB_STORE_REDIS_PREFIX", "mee-ad-rev")
+
+# Redis: 변경 번호 증가와 기록을 원자적으로 처리하는 스크립트
+# KEYS[1]=job 해시, KEYS[2]=배치 목록 / ARGV: status, state, updated_at, batch_id
+_REDIS_SAVE_STATE = """
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+redis.call('HSET', KEYS[1], 'status', ARGV[1], 'state', ARGV[2], 'updated_at', ARGV[3],
+           'state_version', version)
+redis.call('SADD', KEYS[2], ARGV[4])
+return version
+"""
+
+# KEYS[1]=job 해시, KEYS[2]=결과 리스트, KEYS[3]=결과 순번(변경 번호 → 리스트 인덱스) / ARGV: result
+_REDIS_APPEND_RESULT = """
+local version = redis.call('HINCRBY', KEYS[1], 'version', 1)
+local length = redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('ZADD', KEYS[3], version, length - 1)
+return version
+"""
+
+
+class JobStore:
+    """
+    배치 작업 저장소 인터페이스
+
+    - state: 결과 목록을 제외한 배치 상태 (진행률, 파일별 상태 등)
+    - results: 파일 처리 결과 (추가만 가능)
+    - version: 배치별 변경 번호 (save_state/append_result마다 1씩 증가, 결과는 추가 시점의 번호를 순번으로 가짐)
+    - spec: 배치 재개에 필요한 작업 명세 (파일 경로, 옵션)
+    - owner/heartbeat: 배치를 처리 중인 워커와 마지막 생존 신호 시각
+    """
+
+    def save_state(self, batch_id: str, state: Dict[str, Any]):
+        raise NotImplementedError
+
+    def append_result(self, batch_id: str, result: Dict[str, Any]):
+        raise NotImplementedError
+
+    def save_spec(self, batch_id: str, spec: Dict[str, Any]):
+        raise NotImplementedError
+
+    def load(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """상태 + results 목록 반환 (없으면 None)"""
+        raise NotImplementedError
+
+    def load_changes(self, batch_id: str, since: int) -> Optional[Dict[str, Any]]:
+        """
+        since 변경 번호 이후의 변경분 조회 (증분 상태 조회용, 어느 워커에서나 같은 결과)
+
+        Returns:
+            {"state": 상태(results 제외), "results": since 이후 추가된 결과,
+             "version": 현재 변경 번호, "state_version": 마지막 save_state의 변경 번호}
+            또는 None (배치 없음)
+        """
+        raise NotImplementedError
+
+    def load_spec(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def exists(self, batch_id: str) -> bool:
+        raise NotImplementedError
+
+    def delete(self, batch_id: str):
+        raise NotImplementedError
+
+    def iter_states(self) -> Iterator[Dict[str, Any]]:
+        """전체 배치 상태 (results 제외)"""
+        raise NotImplementedError
+
+    def claim(self, batch_id: str, owner: str, stale_after: float) -> bool:
+        """
+        배치 처리 권한 획득
+
+        소유자가 없거나, 자신이거나, 소유자의 heartbeat가 stale_after초 이상
+        끊긴 경우에만 성공합니다.
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, owner: str, batch_ids: List[str]) -> List[str]:
+        """
+        소유 중인 배치의 heartbeat 갱신
+
+        Returns:
+            아직 owner가 소유한 배치 ID 목록 (빠진 배치는 다른 워커가 가져간 것)
+        """
+        raise NotImplementedError
+
+    def find_stale(self, stale_after: float) -> List[str]:
+        """처리 중(processing)이지만 소유자 heartbeat가 끊긴 배치 ID 목록"""
+        raise NotImplementedError
+
+    def enqueue(self, batch_id: str):
+        """배치를 대기열에 추가 (배치 워커가 가져가 처리)"""
+        raise NotImplementedError
+
+    def claim_next_queued(self, owner: str) -> Optional[Dict[str, Any]]:
+        """
+        가장 오래 기다린 배치를 꺼내 소유권 획득
+
+        Returns:
+            {"batch_id", "queued_at"} 또는 None (대기열이 비어 있음)
+        """
+        raise NotImplementedError
+
+    def queue_stats(self) -> Dict[str, Any]:
+        """대기열 깊이 및 가장 오래된 대기 시간"""
+        raise NotImplementedError
+
+    def save_worker_metrics(self, owner: str, metrics: Dict[str, Any]):
+        raise NotImplementedError
+
+    def list_worker_metrics(self, max_age: float) -> Dict[str, Dict[str, Any]]:
+        """max_age초 이내에 보고된 워커별 지표"""
+        raise NotImplementedError
+
+
+class SQLiteJobStore(JobStore):
+    """SQLite 파일 기반 작업 저장소 (기본)"""
+
+    def __init__(self, db_path: Path = JOB_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 여러 워커 프로세스가 같은 파일에 쓰므로 잠금 대기 시간 지정
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=10
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS batch_jobs (
+                batch_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                state_json TEXT NOT NULL,
+                spec_json TEXT,
+                owner TEXT,
+                heartbeat_at REAL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_batch_jobs_status ON batch_jobs(status, heartbeat_at);
+
+            CREATE TABLE IF NOT EXISTS batch_job_results (
+                batch_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                result_json TEXT NOT NULL,
+                PRIMARY KEY (batch_id, seq)
+            );
+
+            CREATE TABLE IF NOT EXISTS worker_metrics (
+                owner TEXT PRIMARY KEY,
+                metrics_json TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+        # 대기열/변경 번호 컬럼 추가 (이전 버전 DB)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(batch_jobs)")}
+        if "queued_at" not in columns:
+            self._conn.execute("ALTER TABLE batch_jobs ADD COLUMN queued_at REAL")
+        if "version" not in columns:
+            self._conn.execute(
+                "ALTER TABLE batch_jobs ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+            )
+            self._conn.execute(
+                "ALTER TABLE batch_jobs ADD COLUMN state_version INTEGER NOT NULL DEFAULT 0"
+            )
+            # 기존 결과 순번 다음부터 변경 번호 부여
+            self._conn.execute(
+                """
+                UPDATE batch_jobs SET version = (
+                    SELECT COALESCE(MAX(seq), 0) FROM batch_job_results
+                    WHERE batch_job_results.batch_id = batch_jobs.batch_id
+                )
+                """
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_batch_jobs_queue ON batch_jobs(status, queued_at)"
+        )
+        self._conn.commit()
+
+    def save_state(self, batch_id: str, state: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO batch_jobs
+                    (batch_id, status, state_json, updated_at, version, state_version)
+                VALUES (?, ?, ?, ?, 1, 1)
+                ON CONFLICT(batch_id) DO UPDATE SET
+                    status = excluded.status,
+                    state_json = excluded.state_json,
+                    updated_at = excluded.updated_at,
+                    version = batch_jobs.version + 1,
+                    state_version = batch_jobs.version + 1
+                """,
+                (
+                    batch_id,
+                    state.get("status", ""),
+                    json.dumps(state, ensure_ascii=False),
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def append_result(self, batch_id: str, result: Dict[str, Any]):
+        with self._lock:
+            # 변경 번호 증가와 결과 추가를 한 트랜잭션으로 (증가한 번호가 결과 순번)
+            self._conn.execute(
+                "UPDATE batch_jobs SET version = version + 1 WHERE batch_id = ?", (batch_id,)
+            )
+            self._conn.execute(
+                """
+                INSERT INTO batch_job_results (batch_id, seq, result_json)
+                SELECT batch_id, version, ? FROM batch_jobs WHERE batch_id = ?
+                """,
+                (json.dumps(result, ensure_ascii=False), batch_id),
+            )
+            self._conn.commit()
+
+    def save_spec(self, batch_id: str, spec: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE batch_jobs SET spec_json = ? WHERE batch_id = ?",
+                (json.dumps(spec, ensure_ascii=False), batch_id),
+            )
+            self._conn.commit()
+
+    def load(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state_json FROM batch_jobs WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            results = [
+                json.loads(r[0])
+                for r in self._conn.execute(
+                    """
+                    SELECT result_json FROM batch_job_results
+                    WHERE batch_id = ? ORDER BY seq
+                    """,
+                    (batch_id,),
+                ).fetchall()
+            ]
+
+        state = json.loads(row[0])
+        state["results"] = results
+        return state
+
+    def load_changes(self, batch_id: str, since: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state_json, version, state_version FROM batch_jobs WHERE batch_id = ?",
+                (batch_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            # 상태 조회 이후 추가된 결과는 다음 조회에서 (version까지만)
+            results = [
+                json.loads(r[0])
+                for r in self._conn.execute(
+                    """
+                    SELECT result_json FROM batch_job_results
+                    WHERE batch_id = ? AND seq > ? AND seq <= ? ORDER BY seq
+                    """,
+                    (batch_id, since, row[1]),
+                ).fetchall()
+            ]
+
+        return {
+            "state": json.loads(row[0]),
+            "results": results,
+            "version": row[1],
+            "state_version": row[2],
+        }
+
+    def load_spec(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT spec_json FROM batch_jobs WHERE batch_id = ?", (batch_id,)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def exists(self, batch_id: str) -> bool:
+        with self._lock:
+            return (
+                self._conn.execute(
+                    "SELECT 1 FROM batch_jobs WHERE batch_id = ?", (batch_id,)
+                ).fetchone()
+                is not None
+            )
+
+    def delete(self, batch_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM batch_jobs WHERE batch_id = ?", (batch_id,))
+            self._conn.execute(
+                "DELETE FROM batch_job_results WHERE batch_id = ?", (batch_id,)
+            )
+            self._conn.commit()
+
+    def iter_states(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state_json FROM batch_jobs").fetchall()
+        for row in rows:
+            yield json.loads(row[0])
+
+    def claim(self, batch_id: str, owner: str, stale_after: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE batch_jobs SET owner = ?, heartbeat_at = ?
+                WHERE batch_id = ?
+                  AND (owner IS NULL OR owner = ? OR heartbeat_at IS NULL OR heartbeat_at < ?)
+                """,
+                (owner, now, batch_id, owner, now - stale_after),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    def heartbeat(self, owner: str, batch_ids: List[str]) -> List[str]:
+        if not batch_ids:
+            return []
+        placeholders = ",".join("?" for _ in batch_ids)
+        with self._lock:
+            self._conn.execute(
+                f"""
+                UPDATE batch_jobs SET heartbeat_at = ?
+                WHERE owner = ? AND batch_id IN ({placeholders})
+                """,
+                [time.time(), owner, *batch_ids],
+            )
+            rows = self._conn.execute(
+                f"""
+                SELECT batch_id FROM batch_jobs
+                WHERE owner = ? AND batch_id IN ({placeholders})
+                """,
+                [owner, *batch_ids],
+            ).fetchall()
+            self._conn.commit()
+        return [row[0] for row in rows]
+
+    def find_stale(self, stale_after: float) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT batch_id FROM batch_jobs
+                WHERE status = 'processing' AND spec_json IS NOT NULL
+                  AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+                """,
+                (time.time() - stale_after,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def enqueue(self, batch_id: str):
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE batch_jobs SET status = 'queued', queued_at = ?, owner = NULL
+                WHERE batch_id = ?
+                """,
+                (time.time(), batch_id),
+            )
+            self._conn.commit()
+
+    def claim_next_queued(self, owner: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            # 다른 워커 프로세스와 동시에 꺼내지 않도록 쓰기 잠금 후 조회/변경
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    """
+                    SELECT batch_id, queued_at FROM batch_jobs
+                    WHERE status = 'queued'
+                    ORDER BY queued_at LIMIT 1
+                    """
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        """
+                        UPDATE batch_jobs
+                        SET status = 'processing', owner = ?, heartbeat_at = ?
+                        WHERE batch_id = ?
+                        """,
+                        (owner, time.time(), row[0]),
+                    )
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+        if row is None:
+            return None
+        return {"batch_id": row[0], "queued_at": row[1]}
+
+    def queue_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    """
+                    SELECT status, COUNT(*) FROM batch_jobs
+                    WHERE status IN ('queued', 'processing') GROUP BY status
+                    """
+                ).fetchall()
+            )
+            oldest = self._conn.execute(
+                "SELECT MIN(queued_at) FROM batch_jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+
+        return {
+            "queued": counts.get("queued", 0),
+            "processing": counts.get("processing", 0),
+            "oldest_queued_seconds": round(time.time() - oldest, 1) if oldest else 0.0,
+        }
+
+    def save_worker_metrics(self, owner: str, metrics: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO worker_metrics (owner, metrics_json, updated_at) VALUES (?, ?, ?)
+                ON CONFLICT(owner) DO UPDATE SET
+                    metrics_json = excluded.metrics_json,
+                    updated_at = excluded.updated_at
+                """,
+                (owner, json.dumps(metrics, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def list_worker_metrics(self, max_age: float) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT owner, metrics_json FROM worker_metrics WHERE updated_at >= ?",
+                (time.time() - max_age,),
+            ).fetchall()
+        return {owner: json.loads(raw) for owner, raw in rows}
+
+
+class RedisJobStore(JobStore):
+    """Redis 호환 서버 기반 작업 저장소 (옵션, redis 패키지 필요)"""
+
+    def __init__(self, url: str = JOB_STORE_REDIS_URL, prefix: str = JOB_STORE_REDIS_PREFIX):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "JOB_STORE_BACKEND=redis 사용 시 redis 패키지가 필요합니다: pip install redis"
+            ) from e
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._watch_error = redis.WatchError
+        self._save_state_script = self._redis.register_script(_REDIS_SAVE_STATE)
+        self._append_result_script = self._redis.register_script(_REDIS_APPEND_RESULT)
+        self.prefix = prefix
+
+    def _job_key(self, batch_id: str) -> str:
+        return f"{self.prefix}:job:{batch_id}"
+
+    def _results_key(self, batch_id: str) -> str:
+        return f"{self.prefix}:results:{batch_id}"
+
+    def _result_seq_key(self, batch_id: str) -> str:
+        return f"{self.prefix}:result-seq:{batch_id}"
+
+    @property
+    def _jobs_key(self) -> str:
+        return f"{self.prefix}:jobs"
+
+    @property
+    def _queue_key(self) -> str:
+        return f"{self.prefix}:queue"
+
+    @property
+    def _workers_key(self) -> str:
+        return f"{self.prefix}:workers"
+
+    def save_state(self, batch_id: str, state: Dict[str, Any]):
+        self._save_state_script(
+            keys=[self._job_key(batch_id), self._jobs_key],
+            args=[
+                state.get("status", ""),
+                json.dumps(state, ensure_ascii=False),
+                time.time(),
+                batch_id,
+            ],
+        )
+
+    def append_result(self, batch_id: str, result: Dict[str, Any]):
+        self._append_result_script(
+            keys=[
+                self._job_key(batch_id),
+                self._results_key(batch_id),
+                self._result_seq_key(batch_id),
+            ],
+            args=[json.dumps(result, ensure_ascii=False)],
+        )
+
+    def save_spec(self, batch_id: str, spec: Dict[str, Any]):
+        self._redis.hset(self._job_key(batch_id), "spec", json.dumps(spec, ensure_ascii=False))
+
+    def load(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        pipe = self._redis.pipeline()
+        pipe.hget(self._job_key(batch_id), "state")
+        pipe.lrange(self._results_key(batch_id), 0, -1)
+        raw_state, raw_results = pipe.execute()
+        if raw_state is None:
+            return None
+
+        state = json.loads(raw_state)
+        state["results"] = [json.loads(r) for r in raw_results]
+        return state
+
+    def load_changes(self, batch_id: str, since: int) -> Optional[Dict[str, Any]]:
+        raw_state, version, state_version = self._redis.hmget(
+            self._job_key(batch_id), "state", "version", "state_version"
+        )
+        if raw_state is None:
+            return None
+        version = int(version or 0)
+
+        # since < 순번 <= version 인 결과의 리스트 인덱스 범위
+        indexes = self._redis.zrangebyscore(
+            self._result_seq_key(batch_id), f"({since}", version
+        )
+        results = []
+        if indexes:
+            results = [
+                json.loads(r)
+                for r in self._redis.lrange(
+                    self._results_key(batch_id), int(indexes[0]), int(indexes[-1])
+                )
+            ]
+
+        return {
+            "state": json.loads(raw_state),
+            "results": results,
+            "version": version,
+            "state_version": int(state_version or 0),
+        }
+
+    def load_spec(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._redis.hget(self._job_key(batch_id), "spec")
+        return json.loads(raw) if raw else None
+
+    def exists(self, batch_id: str) -> bool:
+        return bool(self._redis.exists(self._job_key(batch_id)))
+
+    def delete(self, batch_id: str):
+        pipe = self._redis.pipeline()
+        pipe.delete(
+            self._job_key(batch_id), self._results_key(batch_id), self._result_seq_key(batch_id)
+        )
+        pipe.srem(self._jobs_key, batch_id)
+        pipe.zrem(self._queue_key, batch_id)
+        pipe.execute()
+
+    def iter_states(self) -> Iterator[Dict[str, Any]]:
+        for batch_id in self._redis.smembers(self._jobs_key):
+            raw = self._redis.hget(self._job_key(batch_id), "state")
+            if raw:
+                yield json.loads(raw)
+
+    def claim(self, batch_id: str, owner: str, stale_after: float) -> bool:
+        key = self._job_key(batch_id)
+        with self._redis.pipeline() as pipe:
+            try:
+                # 소유자 확인과 변경 사이에 다른 워커가 끼어들면 실패 처리
+                pipe.watch(key)
+                if not pipe.exists(key):
+                    return False
+                current_owner, heartbeat_at = pipe.hmget(key, "owner", "heartbeat_at")
+                now = time.time()
+                if (
+                    current_owner
+                    and current_owner != owner
+                    and heartbeat_at
+                    and float(heartbeat_at) >= now - stale_after
+                ):
+                    return False
+                pipe.multi()
+                pipe.hset(key, mapping={"owner": owner, "heartbeat_at": now})
+                pipe.execute()
+                return True
+            except self._watch_error:
+                return False
+
+    def heartbeat(self, owner: str, batch_ids: List[str]) -> List[str]:
+        now = time.time()
+        owned = []
+        for batch_id in batch_ids:
+            key = self._job_key(batch_id)
+            if self._redis.hget(key, "owner") == owner:
+                self._redis.hset(key, "heartbeat_at", now)
+                owned.append(batch_id)
+        return owned
+
+    def find_stale(self, stale_after: float) -> List[str]:
+        stale = []
+        threshold = time.time() - stale_after
+        for batch_id in self._redis.smembers(self._jobs_key):
+            status, spec, heartbeat_at = self._redis.hmget(
+                self._job_key(batch_id), "status", "spec", "heartbeat_at"
+            )
+            if status != "processing" or not spec:
+                continue
+            if heartbeat_at is None or float(heartbeat_at) < threshold:
+                stale.append(batch_id)
+        return stale
+
+    def enqueue(self, batch_id: str):
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.hset(self._job_key(batch_id), mapping={"status": "queued", "queued_at": now})
+        pipe.hdel(self._job_key(batch_id), "owner")
+        pipe.zadd(self._queue_key, {batch_id: now})
+        pipe.execute()
+
+    def claim_next_queued(self, owner: str) -> Optional[Dict[str, Any]]:
+        # ZPOPMIN은 원자적이므로 같은 배치를 두 워커가 꺼내지 않음
+        popped = self._redis.zpopmin(self._queue_key, 1)
+        if not popped:
+            return None
+
+        batch_id, queued_at = popped[0]
+        self._redis.hset(
+            self._job_key(batch_id),
+            mapping={"status": "processing", "owner": owner, "heartbeat_at": time.time()},
+        )
+        return {"batch_id": batch_id, "queued_at": float(queued_at)}
+
+    def queue_stats(self) -> Dict[str, Any]:
+        queued = self._redis.zcard(self._queue_key)
+        oldest = self._redis.zrange(self._queue_key, 0, 0, withscores=True)
+        processing = sum(
+            1
+            for batch_id in self._redis.smembers(self._jobs_key)
+            if self._redis.hget(self._job_key(batch_id), "status") == "processing"
+        )
+        return {
+            "queued": queued,
+            "processing": processing,
+            "oldest_queued_seconds": round(time.time() - oldest[0][1], 1) if oldest else 0.0,
+        }
+
+    def save_worker_metrics(self, owner: str, metrics: Dict[str, Any]):
+        self._redis.hset(
+            self._workers_key,
+            owner,
+            json.dumps({"metrics": metrics, "updated_at": time.time()}, ensure_ascii=False),
+        )
+
+    def list_worker_metrics(self, max_age: float) -> Dict[str, Dict[str, Any]]:
+        threshold = time.time() - max_age
+        workers = {}
+        for owner, raw in self._redis.hgetall(self._workers_key).items():
+            entry = json.loads(raw)
+            if entry["updated_at"] >= threshold:
+                workers[owner] = entry["metrics"]
+        return workers
+
+
+# 싱글톤 인스턴스
+_job_store: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """배치 작업 저장소 싱글톤 반환 (JOB_STORE_BACKEND로 선택)"""
+    global _job_store
+    if _job_store is None:
+        if JOB_STORE_BACKEND == "redis":
+            _job_store = RedisJobStore()
+        else:
+            _job_store = SQLiteJobStore()
+    return _job_store
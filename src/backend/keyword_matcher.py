@@ -0,0 +1,114 @@
+"""
+다중 키워드 검색 엔진 (Aho-Corasick)
+금지 키워드 전체를 하나의 오토마톤으로 컴파일하여 텍스트를 한 번만 순회
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class KeywordAutomaton:
+    """Aho-Corasick 오토마톤 (키워드 → 출현 위치 일괄 검색)"""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Args:
+            keywords: 검색할 키워드 목록 (대소문자 구분 없이 검색)
+        """
+        self.keywords: List[str] = list(keywords)
+        self._lengths: List[int] = []
+
+        # 상태별 전이 테이블, 실패 링크, 출력(키워드 인덱스) 목록
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            self._lengths.append(len(pattern))
+            if pattern:
+                self._insert(pattern, index)
+
+        self._build_fail_links()
+
+    def _insert(self, pattern: str, index: int):
+        """트라이에 키워드 추가"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(index)
+
+    def _build_fail_links(self):
+        """BFS로 실패 링크 계산 및 출력 병합"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+
+                # 접미사로 끝나는 키워드도 함께 출력
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def iter_matches(self, text_lower: str) -> Iterator[Tuple[int, int]]:
+        """
+        모든 키워드 출현 위치를 한 번의 순회로 반환
+
+        Args:
+            text_lower: 소문자로 변환된 검색 대상 텍스트
+
+        Yields:
+            (시작 위치, 키워드 인덱스) 튜플 (겹치는 출현 포함)
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        lengths = self._lengths
+
+        state = 0
+        for position, char in enumerate(text_lower):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for index in output[state]:
+                yield position - lengths[index] + 1, index
+
+    def find_all(self, text: str) -> Dict[str, List[int]]:
+        """
+        키워드별 출현 시작 위치 목록 반환
+
+        str.count()와 동일하게 같은 키워드끼리는 겹치지 않는 출현만 셉니다.
+
+        Args:
+            text: 검색 대상 텍스트
+
+        Returns:
+            {키워드: [시작 위치, ...]} (출현한 키워드만, 키워드 등록 순서)
+        """
+        positions: Dict[int, List[int]] = {}
+        last_end: Dict[int, int] = {}
+
+        # 같은 키워드의 출현은 시작 위치 순서로 나오므로 탐욕적으로 겹침 제거
+        for start, index in self.iter_matches(text.lower()):
+            if start < last_end.get(index, 0):
+                continue
+            positions.setdefault(index, []).append(start)
+            last_end[index] = start + self._lengths[index]
+
+        return {self.keywords[index]: positions[index] for index in sorted(positions)}
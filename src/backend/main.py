@@ -2,14 +2,13 @@
 FastAPI 백엔드 메인 애플리케이션
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form, BackgroundTasks, Depends, Request, Security
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Depends, Request, Security
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.security import APIKeyHeader
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from typing import Optional, List, Dict, Any
 import os
-import httpx
 import json
 import logging
 from dotenv import load_dotenv
@@ -19,28 +18,53 @@ from datetime import datetime, timedelta
 import asyncio
 import uuid
 import secrets
-from enum import Enum
+import socket
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
-from ad_analyzer import analyze_complete, analyze_complete_async
+from ad_analyzer import PIPELINE_STRUCTURED, apply_final_judgment
+from analysis_engine import get_analysis_engine
 from medical_keywords import keyword_db
-from paddle_ocr import perform_paddle_ocr
+from paddle_ocr import warmup_paddle_pool, shutdown_paddle_pool
 from rag.vector_store import index_single_file, remove_file_from_index, get_vector_store
+from result_cache import get_ocr_cache, get_llm_cache, get_embedding_cache
+from history_store import get_history_store
+from job_store import JobStore, get_job_store
+from batch_scheduler import RESOURCE_OPENAI, RESOURCE_OPENAI_JUDGMENT, get_batch_scheduler
+from batch_pipeline import (
+    BATCH_JUDGMENT_WORKERS,
+    BATCH_LLM_WORKERS,
+    BATCH_OCR_WORKERS,
+    BATCH_RAG_BATCH_SIZE,
+    BATCH_RAG_WORKERS,
+    PipelineStage,
+    run_pipeline,
+)
+from batch_review import ANALYSIS_MODE_OFFLINE, ANALYSIS_MODE_REALTIME, run_offline_analysis
+from provider_limits import provider_limit_stats
+from prompts import get_prompt_usage_stats
+from resilience import circuit_stats
+from ocr_service import (
+    NAVER_OCR_API_URL,
+    NAVER_OCR_SECRET_KEY,
+    OCREngine,
+    close_naver_http_client,
+    get_naver_http_client,
+)
+from batch_events import (
+    EVENT_FILE_STATUS,
+    EVENT_RESULT,
+    EVENT_STATUS,
+    TERMINAL_STATUSES,
+    get_batch_event_hub,
+)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class OCREngine(str, Enum):
-    """OCR 엔진 선택"""
-
-    NAVER = "naver"
-    PADDLE = "paddle"
-
-
 # OCR 엔진별 최대 파일 개수 제한
 OCR_FILE_LIMITS = {
     OCREngine.NAVER: 5,
@@ -56,6 +80,17 @@ DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 ADMIN_API_KEY = os.getenv("ADMIN_API_KEY", secrets.token_urlsafe(32))
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 RATE_LIMIT = os.getenv("RATE_LIMIT_PER_MINUTE", "30")
+PADDLE_OCR_PREWARM = os.getenv("PADDLE_OCR_PREWARM", "false").lower() == "true"
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "10"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "60"))
+# 배치 상태 변경을 모아 작업 저장소에 기록하는 간격 (초)
+JOB_PERSIST_INTERVAL_SECONDS = float(os.getenv("JOB_PERSIST_INTERVAL_SECONDS", "0.5"))
+
+# 배치 실행 방식: inline (API 프로세스에서 처리) 또는 queue (batch_worker.py 프로세스가 처리)
+BATCH_EXECUTION = os.getenv("BATCH_EXECUTION", "inline").lower()
+
+# 이 워커 프로세스 식별자 (배치 소유권/heartbeat 기록용)
+WORKER_ID = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
 
 # Rate Limiter 설정
 limiter = Limiter(key_func=get_remote_address)
@@ -120,9 +155,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Naver OCR API 설정
-NAVER_OCR_API_URL = os.getenv("NAVER_OCR_API_URL")
-NAVER_OCR_SECRET_KEY = os.getenv("NAVER_OCR_SECRET_KEY")
 UPLOAD_DIR = Path(__file__).parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
@@ -179,15 +211,28 @@ async def process_ocr(file: UploadFile = File(...)):
     Returns:
         OCRResponse: OCR 처리 결과
     """
-    start_time = datetime.now()
+    return await ocr_upload_file(file, OCREngine.NAVER)
 
-    # API 설정 확인
-    if not NAVER_OCR_API_URL or not NAVER_OCR_SECRET_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="OCR API 설정이 올바르지 않습니다.",
-        )
 
+def _copy_upload(file: UploadFile, path: Path):
+    """업로드 파일 내용을 디스크에 복사 (스레드에서 실행)"""
+    with path.open("wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+
+async def save_upload_temp(file: UploadFile) -> Path:
+    """
+    업로드 이미지 검증 후 임시 파일로 저장
+
+    Args:
+        file: 업로드된 이미지 파일 (jpg, jpeg, png)
+
+    Returns:
+        Path: 임시 파일 경로 (사용 후 호출 측에서 삭제)
+
+    Raises:
+        HTTPException: 파일 형식/크기 오류
+    """
     # 파일 확장자 검증
     file_ext = Path(file.filename).suffix.lower()
     if file_ext not in [".jpg", ".jpeg", ".png"]:
@@ -205,18 +250,44 @@ async def process_ocr(file: UploadFile = File(...)):
             detail=f"파일 크기가 너무 큽니다. 최대 {MAX_IMAGE_SIZE // (1024 * 1024)}MB까지 업로드 가능합니다.",
         )
 
-    # 임시 파일 저장
+    # 임시 파일 저장 (동시 처리 시 동일 파일명 충돌 방지용 고유 접두사)
     temp_file_path = (
-        UPLOAD_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
+        UPLOAD_DIR
+        / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_{file.filename}"
     )
+    await asyncio.to_thread(temp_file_path.write_bytes, content)
+    return temp_file_path
 
-    try:
-        # 파일 저장
-        with temp_file_path.open("wb") as buffer:
-            buffer.write(content)
 
+async def ocr_upload_file(file: UploadFile, engine: OCREngine) -> OCRResponse:
+    """
+    업로드 파일 검증 → 임시 저장 → OCR 수행
+
+    Args:
+        file: 업로드된 이미지 파일 (jpg, jpeg, png)
+        engine: OCR 엔진 선택
+
+    Returns:
+        OCRResponse: OCR 처리 결과
+
+    Raises:
+        HTTPException: 설정 오류, 파일 형식/크기 오류, OCR 처리 오류
+    """
+    start_time = datetime.now()
+
+    # Naver OCR 선택 시에만 API 설정 확인
+    if engine == OCREngine.NAVER:
+        if not NAVER_OCR_API_URL or not NAVER_OCR_SECRET_KEY:
+            raise HTTPException(
+                status_code=500,
+                detail="OCR API 설정이 올바르지 않습니다.",
+            )
+
+    temp_file_path = await save_upload_temp(file)
+
+    try:
         # OCR 처리
-        result = await perform_ocr(temp_file_path)
+        result = await get_analysis_engine().ocr(temp_file_path, engine)
 
         # 처리 시간 계산
         processing_time = (datetime.now() - start_time).total_seconds()
@@ -239,168 +310,48 @@ async def process_ocr(file: UploadFile = File(...)):
             temp_file_path.unlink()
 
 
-async def perform_naver_ocr(image_path: Path) -> dict:
-    """
-    Naver Clova OCR API를 사용하여 이미지에서 텍스트 추출 (비동기)
-
-    Args:
-        image_path: 이미지 파일 경로
-
-    Returns:
-        dict: OCR 결과
-    """
-    # API URL 검증
-    if not NAVER_OCR_API_URL:
-        return {
-            "success": False,
-            "text": None,
-            "confidence": None,
-            "fields_count": None,
-            "error": "NAVER_OCR_API_URL 환경변수가 설정되지 않았습니다.",
-        }
-
-    try:
-        # 이미지 파일 읽기
-        with open(image_path, "rb") as f:
-            image_data = f.read()
-
-        # 파일 확장자 확인
-        file_ext = image_path.suffix.lower()
-        image_format = "jpg" if file_ext in [".jpg", ".jpeg"] else "png"
-
-        # 요청 본문 구성
-        request_json = {
-            "images": [{"format": image_format, "name": "medical_ad_image"}],
-            "requestId": f"ocr-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-            "version": "V2",
-            "timestamp": 0,
-        }
-
-        # 헤더 설정
-        headers = {"X-OCR-SECRET": NAVER_OCR_SECRET_KEY or ""}
-
-        # 비동기 HTTP 요청 (httpx 사용)
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Naver OCR API 형식에 맞춘 multipart/form-data 구성
-            # message 필드는 filename 없이, file 필드는 filename과 함께 전송
-            files = [
-                ("message", (None, json.dumps(request_json), "application/json")),
-                ("file", (image_path.name, image_data, f"image/{image_format}")),
-            ]
-
-            response = await client.post(
-                NAVER_OCR_API_URL, headers=headers, files=files
-            )
-
-        if response.status_code == 200:
-            result = response.json()
-
-            # 추출된 텍스트 및 신뢰도 계산
-            extracted_text = ""
-            total_confidence = 0.0
-            fields_count = 0
-
-            if "images" in result and len(result["images"]) > 0:
-                fields = result["images"][0].get("fields", [])
-                fields_count = len(fields)
-
-                for field in fields:
-                    text = field.get("inferText", "")
-                    confidence = field.get("inferConfidence", 0.0)
-                    extracted_text += text + " "
-                    total_confidence += confidence
-
-                # 평균 신뢰도 계산
-                avg_confidence = (
-                    total_confidence / fields_count if fields_count > 0 else 0.0
-                )
-            else:
-                avg_confidence = 0.0
-
-            return {
-                "success": True,
-                "text": extracted_text.strip(),
-                "confidence": round(avg_confidence, 2),
-                "fields_count": fields_count,
-                "error": None,
-            }
-        else:
-            return {
-                "success": False,
-                "text": None,
-                "confidence": None,
-                "fields_count": None,
-                "error": f"OCR API 오류: HTTP {response.status_code} - {response.text[:200]}",
-            }
-
-    except httpx.TimeoutException:
-        return {
-            "success": False,
-            "text": None,
-            "confidence": None,
-            "fields_count": None,
-            "error": "OCR API 요청 시간 초과",
-        }
-
-    except Exception as e:
-        return {
-            "success": False,
-            "text": None,
-            "confidence": None,
-            "fields_count": None,
-            "error": f"OCR 처리 중 오류: {str(e)}",
-        }
-
-
-async def perform_ocr(image_path: Path, engine: OCREngine = OCREngine.NAVER) -> dict:
-    """
-    OCR 엔진 선택에 따라 적절한 OCR 수행
-
-    Args:
-        image_path: 이미지 파일 경로
-        engine: OCR 엔진 선택 (naver 또는 paddle)
-
-    Returns:
-        dict: OCR 결과 (두 엔진 모두 동일한 형식)
-    """
-    if engine == OCREngine.PADDLE:
-        return await perform_paddle_ocr(image_path)
-    else:
-        return await perform_naver_ocr(image_path)
-
-
 @app.post("/api/ocr/batch")
-async def process_batch_ocr(files: List[UploadFile] = File(...)):
+async def process_batch_ocr(
+    files: List[UploadFile] = File(...),
+    ocr_engine: str = Form("naver"),
+):
     """
-    여러 이미지 파일에서 텍스트 일괄 추출
+    여러 이미지 파일에서 텍스트 일괄 추출 (엔진별 동시 처리 수 제한 내 병렬)
 
     Args:
         files: 업로드된 이미지 파일 리스트
+        ocr_engine: OCR 엔진 선택 (naver 또는 paddle)
 
     Returns:
-        List[OCRResponse]: OCR 처리 결과 리스트
+        List[OCRResponse]: OCR 처리 결과 리스트 (입력 순서 유지)
     """
     if len(files) > 10:
         raise HTTPException(
             status_code=400, detail="한 번에 최대 10개의 파일만 업로드할 수 있습니다."
         )
 
-    results = []
+    # OCR 엔진 결정
+    engine = (
+        OCREngine(ocr_engine) if ocr_engine in ["naver", "paddle"] else OCREngine.NAVER
+    )
 
-    for file in files:
-        try:
-            result = await process_ocr(file)
-            results.append(result)
-        except HTTPException as e:
-            results.append(
-                OCRResponse(success=False, filename=file.filename, error=e.detail)
-            )
-        except Exception as e:
-            results.append(
-                OCRResponse(success=False, filename=file.filename, error=str(e))
-            )
+    # OCR 엔진별 최대 동시 처리 수 (Naver: 5, Paddle: 50)
+    semaphore = asyncio.Semaphore(OCR_FILE_LIMITS[engine])
+
+    async def ocr_with_semaphore(file: UploadFile) -> OCRResponse:
+        # 파일별 실패는 해당 결과에만 기록
+        async with semaphore:
+            try:
+                return await ocr_upload_file(file, engine)
+            except HTTPException as e:
+                return OCRResponse(success=False, filename=file.filename, error=e.detail)
+            except Exception as e:
+                return OCRResponse(success=False, filename=file.filename, error=str(e))
+
+    # gather는 입력 순서대로 결과 반환
+    results = await asyncio.gather(*(ocr_with_semaphore(file) for file in files))
 
-    return results
+    return list(results)
 
 
 # 광고 분석 응답 모델
@@ -433,6 +384,7 @@ class FileStatus(BaseModel):
     """개별 파일 처리 상태"""
 
     filename: str
+    file_id: Optional[str] = None  # 업로드 시 부여되는 배치 내 고유 ID
     status: str  # pending, ocr, analyzing, completed, failed
     progress: int  # 0-100
     error: Optional[str] = None
@@ -449,9 +401,48 @@ class BatchAnalysisStatus(BaseModel):
     start_time: Optional[str] = None
     estimated_completion: Optional[str] = None
     elapsed_seconds: Optional[float] = 0.0
-    current_phase: Optional[str] = "uploading"  # uploading, analyzing
+    current_phase: Optional[str] = "uploading"  # uploading, analyzing, batch_api (오프라인 모드)
     file_statuses: List[FileStatus] = []  # 파일별 상태
 
+    # 파일명 → file_statuses 인덱스 (상태 갱신 O(1))
+    _file_index: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    def set_file_statuses(self, file_statuses: List[FileStatus]):
+        """파일 상태 목록 교체 및 인덱스 재구성"""
+        self.file_statuses = file_statuses
+        self._file_index = {fs.filename: i for i, fs in enumerate(file_statuses)}
+
+    def find_file_status(self, filename: str) -> Optional[FileStatus]:
+        """파일명으로 상태 조회"""
+        index = self._file_index.get(filename)
+        if index is None or index >= len(self.file_statuses):
+            return None
+        file_status = self.file_statuses[index]
+        return file_status if file_status.filename == filename else None
+
+    def add_file_status(self, file_status: FileStatus):
+        """파일 상태 추가"""
+        self._file_index[file_status.filename] = len(self.file_statuses)
+        self.file_statuses.append(file_status)
+
+
+class BatchStatusDelta(BaseModel):
+    """배치 상태 증분 응답 (since 커서 이후 변경분만)"""
+
+    batch_id: str
+    status: str
+    total_files: int
+    processed_files: int
+    progress_percent: float
+    elapsed_seconds: Optional[float] = 0.0
+    estimated_completion: Optional[str] = None
+    current_phase: Optional[str] = None
+    cursor: int  # 다음 요청의 since 값
+    full: bool = False  # 커서가 유효하지 않아 전체 상태를 반환한 경우 True
+    file_statuses: List[FileStatus] = []  # 변경된 파일 상태만
+    results: List[Dict[str, Any]] = []  # 새 결과만
+    errors: List[str] = []
+
 
 class FileClassification(BaseModel):
     filename: str
@@ -466,8 +457,189 @@ class ClassifyRequest(BaseModel):
     classifications: List[FileClassification]
 
 
-# 배치 분석 상태 저장소 (메모리)
-batch_status_store: Dict[str, BatchAnalysisStatus] = {}
+class BatchStatusStore:
+    """
+    배치 분석 상태 저장소
+
+    이 워커가 처리 중인 배치는 메모리에 두고, 변경 사항은 JOB_PERSIST_INTERVAL_SECONDS 동안 모아
+    이벤트 루프 밖(스레드)에서 작업 저장소(job_store)에 기록합니다.
+    다른 워커가 처리하는 배치나 재시작 전 배치는 작업 저장소에서 조회합니다.
+    """
+
+    def __init__(self, job_store: JobStore):
+        self._jobs = job_store
+        self._local: Dict[str, BatchAnalysisStatus] = {}
+        # 기록 대기 중인 배치 / 아직 기록하지 않은 결과 / 배치별 기록 태스크
+        self._dirty: set = set()
+        self._pending_results: Dict[str, List[Dict[str, Any]]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._write_locks: Dict[str, asyncio.Lock] = {}
+
+    def __contains__(self, batch_id: str) -> bool:
+        return batch_id in self._local or self._jobs.exists(batch_id)
+
+    def __getitem__(self, batch_id: str) -> BatchAnalysisStatus:
+        if batch_id in self._local:
+            return self._local[batch_id]
+
+        data = self._jobs.load(batch_id)
+        if data is None:
+            raise KeyError(batch_id)
+        return self._from_state(data)
+
+    def get(self, batch_id: str) -> Optional[BatchAnalysisStatus]:
+        """배치 상태 조회 (없으면 None)"""
+        try:
+            return self[batch_id]
+        except KeyError:
+            return None
+
+    def __setitem__(self, batch_id: str, status: BatchAnalysisStatus):
+        # 작업 저장소에 행을 먼저 만들어야 claim/save_spec이 가능하므로 즉시 기록
+        self._local[batch_id] = status
+        self._jobs.save_state(batch_id, status.model_dump(exclude={"results"}))
+
+    def submit(self, status: BatchAnalysisStatus):
+        """다른 프로세스(배치 워커)가 처리할 배치 상태를 작업 저장소에만 기록"""
+        self._jobs.save_state(status.batch_id, status.model_dump(exclude={"results"}))
+
+    def __delitem__(self, batch_id: str):
+        self.release(batch_id)
+        self._jobs.delete(batch_id)
+
+    @staticmethod
+    def _from_state(data: Dict[str, Any]) -> BatchAnalysisStatus:
+        status = BatchAnalysisStatus(**data)
+        status.set_file_statuses(status.file_statuses)
+        return status
+
+    @property
+    def job_store(self) -> JobStore:
+        return self._jobs
+
+    def is_local(self, batch_id: str) -> bool:
+        """이 워커 메모리에 있는 배치인지 여부"""
+        return batch_id in self._local
+
+    def persist(self, batch_id: str):
+        """
+        로컬 배치 상태 기록 예약 (results 제외)
+        JOB_PERSIST_INTERVAL_SECONDS 동안의 변경을 한 번에 스레드에서 기록하며,
+        이벤트 루프 밖(동기 호출)에서는 즉시 기록
+        """
+        if batch_id not in self._local:
+            return
+
+        self._dirty.add(batch_id)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_pending(batch_id, *self._take_pending(batch_id))
+            return
+
+        task = self._flush_tasks.get(batch_id)
+        if task is None or task.done():
+            self._flush_tasks[batch_id] = loop.create_task(self._flush_later(batch_id))
+
+    def add_result(self, batch_id: str, result: Dict[str, Any]):
+        """파일 처리 결과 추가 (메모리 즉시, 작업 저장소는 다음 상태 기록 때 함께)"""
+        self._local[batch_id].results.append(result)
+        self._pending_results.setdefault(batch_id, []).append(result)
+        self.persist(batch_id)
+
+    def _take_pending(self, batch_id: str) -> tuple:
+        """기록할 상태 스냅샷과 미기록 결과를 가져가고 dirty 표시 해제 (이벤트 루프에서 호출)"""
+        self._dirty.discard(batch_id)
+        status = self._local.get(batch_id)
+        state = status.model_dump(exclude={"results"}) if status is not None else None
+        return state, self._pending_results.pop(batch_id, [])
+
+    def _write_pending(
+        self, batch_id: str, state: Optional[Dict[str, Any]], results: List[Dict[str, Any]]
+    ):
+        """결과 → 상태 순으로 작업 저장소에 기록 (스레드에서 실행 가능)"""
+        for result in results:
+            self._jobs.append_result(batch_id, result)
+        if state is not None:
+            self._jobs.save_state(batch_id, state)
+
+    async def _write(self, batch_id: str):
+        """대기 중인 변경 기록 (배치별로 순서대로, 실패하면 다음 기록 때 다시 시도)"""
+        async with self._write_locks.setdefault(batch_id, asyncio.Lock()):
+            if batch_id not in self._dirty:
+                return
+            state, results = self._take_pending(batch_id)
+            try:
+                await asyncio.to_thread(self._write_pending, batch_id, state, results)
+            except Exception:
+                self._pending_results[batch_id] = results + self._pending_results.get(batch_id, [])
+                self._dirty.add(batch_id)
+                raise
+
+    async def _flush_later(self, batch_id: str):
+        """변경을 잠시 모은 뒤 기록, 기록 중 다시 변경되면 한 번 더 기록"""
+        try:
+            await asyncio.sleep(JOB_PERSIST_INTERVAL_SECONDS)
+            while batch_id in self._dirty:
+                await self._write(batch_id)
+        except Exception as e:
+            print(f"[Jobs] 배치 상태 기록 실패: {batch_id} - {e}")
+        finally:
+            if self._flush_tasks.get(batch_id) is asyncio.current_task():
+                del self._flush_tasks[batch_id]
+
+    async def flush(self, batch_id: Optional[str] = None):
+        """
+        예약된 기록을 기다리지 않고 바로 기록 (배치 완료/앱 종료 시)
+
+        Args:
+            batch_id: 기록할 배치 ID (None이면 기록 대기 중인 전체 배치)
+        """
+        batch_ids = [batch_id] if batch_id is not None else list(self._dirty)
+        for target in batch_ids:
+            await self._write(target)
+
+    def release(self, batch_id: str):
+        """
+        이 워커 메모리에서 배치 제거 (작업 저장소는 유지)
+        다른 워커가 소유권을 가져간 배치의 미기록 변경은 버림
+        """
+        self._local.pop(batch_id, None)
+        self._dirty.discard(batch_id)
+        self._pending_results.pop(batch_id, None)
+        self._write_locks.pop(batch_id, None)
+        task = self._flush_tasks.pop(batch_id, None)
+        if task is not None:
+            task.cancel()
+
+    def adopt(self, batch_id: str) -> Optional[BatchAnalysisStatus]:
+        """작업 저장소의 배치를 이 워커 메모리로 가져오기 (중단된 배치 재개용)"""
+        data = self._jobs.load(batch_id)
+        if data is None:
+            return None
+        status = self._local[batch_id] = self._from_state(data)
+        return status
+
+    def local_processing_ids(self) -> List[str]:
+        return [
+            batch_id
+            for batch_id, status in self._local.items()
+            if status.status == "processing"
+        ]
+
+    def summaries(self) -> Dict[str, tuple]:
+        """전체 배치의 (상태, 시작 시각) 목록 (정리 대상 선정용)"""
+        summaries = {
+            state["batch_id"]: (state.get("status"), state.get("start_time"))
+            for state in self._jobs.iter_states()
+        }
+        for batch_id, status in self._local.items():
+            summaries[batch_id] = (status.status, status.start_time)
+        return summaries
+
+
+# 배치 분석 상태 저장소 (로컬 메모리 + 공유 작업 저장소)
+batch_status_store = BatchStatusStore(get_job_store())
 
 # 배치 상태 정리 설정
 BATCH_CLEANUP_MAX_AGE_HOURS = 24  # 완료된 배치 보관 시간
@@ -483,12 +655,12 @@ def cleanup_old_batches():
     max_age = timedelta(hours=BATCH_CLEANUP_MAX_AGE_HOURS)
 
     to_delete = []
-    for batch_id, status in batch_status_store.items():
+    for batch_id, (status, start_time_str) in batch_status_store.summaries().items():
         # 완료되거나 실패한 배치만 정리
-        if status.status in ["completed", "failed"]:
+        if status in ["completed", "failed"]:
             try:
-                if status.start_time:
-                    start_time = datetime.fromisoformat(status.start_time)
+                if start_time_str:
+                    start_time = datetime.fromisoformat(start_time_str)
                     if (now - start_time) > max_age:
                         to_delete.append(batch_id)
                 else:
@@ -500,6 +672,7 @@ def cleanup_old_batches():
 
     for batch_id in to_delete:
         del batch_status_store[batch_id]
+        get_batch_event_hub().discard(batch_id)
 
     if to_delete:
         print(f"[Cleanup] {len(to_delete)}개의 오래된 배치 상태 삭제됨")
@@ -520,29 +693,59 @@ def update_file_status(
         progress: 진행률 (0-100)
         error: 에러 메시지 (optional)
     """
-    if batch_id not in batch_status_store:
+    if not batch_status_store.is_local(batch_id):
         return
 
     batch = batch_status_store[batch_id]
 
-    # 해당 파일의 상태 찾기 또는 추가
-    for file_status in batch.file_statuses:
-        if file_status.filename == filename:
-            file_status.status = status
-            file_status.progress = progress
-            if error:
-                file_status.error = error
-            return
+    # 해당 파일의 상태 찾기 (인덱스 조회) 또는 추가
+    file_status = batch.find_file_status(filename)
+    if file_status is not None:
+        file_status.status = status
+        file_status.progress = progress
+        if error:
+            file_status.error = error
+    else:
+        # 파일이 목록에 없으면 추가
+        file_status = FileStatus(
+            filename=filename, status=status, progress=progress, error=error
+        )
+        batch.add_file_status(file_status)
+
+    batch_status_store.persist(batch_id)
 
-    # 파일이 목록에 없으면 추가
-    batch.file_statuses.append(
-        FileStatus(filename=filename, status=status, progress=progress, error=error)
+    # 진행 이벤트 발행 (SSE 구독자에게 전달)
+    get_batch_event_hub().publish(batch_id, EVENT_FILE_STATUS, file_status.model_dump())
+
+
+def publish_batch_status(batch_id: str):
+    """배치 상태 변화 기록 및 이벤트 발행 (completed, failed)"""
+    if not batch_status_store.is_local(batch_id):
+        return
+
+    batch_status_store.persist(batch_id)
+    batch = batch_status_store[batch_id]
+    get_batch_event_hub().publish(
+        batch_id,
+        EVENT_STATUS,
+        {
+            "status": batch.status,
+            "processed_files": batch.processed_files,
+            "progress_percent": batch.progress_percent,
+            "errors": batch.errors,
+        },
     )
 
 
 # 백그라운드 클린업 태스크
 _cleanup_task: Optional[asyncio.Task] = None
 
+# 배치 heartbeat / 중단 배치 재개 태스크
+_job_heartbeat_task: Optional[asyncio.Task] = None
+
+# 이 워커에서 배치를 처리 중인 태스크 (소유권을 잃으면 취소)
+_batch_tasks: Dict[str, asyncio.Task] = {}
+
 
 async def periodic_cleanup():
     """주기적으로 오래된 배치 상태 정리"""
@@ -551,106 +754,319 @@ async def periodic_cleanup():
         cleanup_old_batches()
 
 
+def remaining_files(spec: Dict[str, Any], batch: BatchAnalysisStatus) -> List[tuple]:
+    """
+    작업 명세의 파일 중 아직 결과가 없는 파일 (배치 재개용)
+    파일명 대신 업로드 순서 기반 file_id로 결과와 대조
+
+    Returns:
+        [(파일경로, 원본파일명), ...] 리스트
+    """
+    done = {result.get("file_id") for result in batch.results}
+    return [
+        (Path(path), name)
+        for index, (path, name) in enumerate(spec["file_paths"])
+        if _file_id(index) not in done
+    ]
+
+
+async def resume_batch(batch_id: str) -> bool:
+    """
+    중단된 배치를 이 워커에서 재개 (결과가 없는 파일만 다시 처리)
+
+    Args:
+        batch_id: 배치 ID
+
+    Returns:
+        bool: 재개 여부 (다른 워커가 먼저 가져갔으면 False)
+    """
+    job_store = batch_status_store.job_store
+    if not await asyncio.to_thread(job_store.claim, batch_id, WORKER_ID, JOB_STALE_SECONDS):
+        return False
+
+    spec = await asyncio.to_thread(job_store.load_spec, batch_id)
+    batch = await asyncio.to_thread(batch_status_store.adopt, batch_id)
+    if spec is None or batch is None:
+        return False
+
+    remaining = remaining_files(spec, batch)
+
+    print(f"[Jobs] 중단된 배치 재개: {batch_id} (남은 파일 {len(remaining)}개)")
+    asyncio.create_task(
+        batch_analyze_files(
+            batch_id,
+            remaining,
+            spec["use_ai"],
+            OCREngine(spec["ocr_engine"]),
+            spec["use_rag"],
+            resume=True,
+            analysis_mode=spec.get("analysis_mode", ANALYSIS_MODE_REALTIME),
+        )
+    )
+    return True
+
+
+# 배치 대기열 대기 시간 표본 (batch_worker에서 기록)
+_queue_wait_samples: List[float] = []
+
+
+def record_queue_wait(seconds: float):
+    """대기열에 들어간 뒤 워커가 가져가기까지 걸린 시간 기록"""
+    _queue_wait_samples.append(seconds)
+    del _queue_wait_samples[:-1000]
+
+
+def worker_metrics() -> Dict[str, Any]:
+    """이 프로세스의 배치 처리 지표 (스케줄러 자원별 대기/사용량, 대기열 대기 시간)"""
+    samples = _queue_wait_samples
+    return {
+        "mode": BATCH_EXECUTION,
+        "active_batches": len(batch_status_store.local_processing_ids()),
+        "scheduler": get_batch_scheduler().stats(),
+        "rate_limits": provider_limit_stats(),
+        "circuits": circuit_stats(),
+        "analysis_stages": get_analysis_engine().stats(),
+        "prompt_cache": get_prompt_usage_stats().stats(),
+        "queue_wait_avg_seconds": round(sum(samples) / len(samples), 2) if samples else 0.0,
+        "queue_wait_max_seconds": round(max(samples), 2) if samples else 0.0,
+    }
+
+
+def release_lost_batch(batch_id: str):
+    """다른 워커가 소유권을 가져간 배치의 로컬 처리 중단 (이후 기록은 새 소유자가 담당)"""
+    print(f"[Jobs] 배치 소유권 상실, 처리 중단: {batch_id}")
+    batch_status_store.release(batch_id)
+    get_batch_event_hub().discard(batch_id)
+    task = _batch_tasks.pop(batch_id, None)
+    if task is not None:
+        task.cancel()
+
+
+async def periodic_job_heartbeat():
+    """처리 중인 배치의 heartbeat 기록, 소유권을 잃은 배치 중단 및 소유자가 중단된 배치 재개"""
+    job_store = batch_status_store.job_store
+    while True:
+        try:
+            processing_ids = batch_status_store.local_processing_ids()
+            owned = await asyncio.to_thread(job_store.heartbeat, WORKER_ID, processing_ids)
+            for batch_id in set(processing_ids) - set(owned):
+                release_lost_batch(batch_id)
+            await asyncio.to_thread(
+                job_store.save_worker_metrics, WORKER_ID, worker_metrics()
+            )
+            stale_ids = await asyncio.to_thread(job_store.find_stale, JOB_STALE_SECONDS)
+            for batch_id in stale_ids:
+                await resume_batch(batch_id)
+        except Exception as e:
+            print(f"[Jobs] heartbeat/재개 실패: {e}")
+
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+
+
 @app.on_event("startup")
 async def startup_event():
-    """앱 시작 시 클린업 태스크 시작"""
-    global _cleanup_task
+    """앱 시작 시 클린업 태스크 및 공유 리소스 시작"""
+    global _cleanup_task, _job_heartbeat_task
     _cleanup_task = asyncio.create_task(periodic_cleanup())
     print("[Startup] 배치 상태 클린업 스케줄러 시작됨")
 
+    # 배치 heartbeat 및 중단 배치 재개 (queue 모드에서는 batch_worker 프로세스가 담당)
+    if BATCH_EXECUTION != "queue":
+        _job_heartbeat_task = asyncio.create_task(periodic_job_heartbeat())
+        print(f"[Startup] 배치 작업 워커 시작됨 ({WORKER_ID})")
+
+    # Naver OCR 공유 HTTP 클라이언트 생성
+    get_naver_http_client()
+
+    # 분석 이력 DB가 비어 있으면 기존 배치 결과 JSON 가져오기 (최초 1회)
+    try:
+        history_store = get_history_store()
+        if history_store.count() == 0:
+            batches, imported = await asyncio.to_thread(
+                history_store.import_json_dir, Path("uploads/batch_results")
+            )
+            if imported:
+                print(f"[Startup] 분석 이력 가져오기: {batches}개 배치, {imported}건")
+    except Exception as e:
+        print(f"[Startup] 분석 이력 가져오기 실패: {e}")
+
+    # PaddleOCR 워커 프로세스 미리 로드 (옵션)
+    if PADDLE_OCR_PREWARM:
+        try:
+            await warmup_paddle_pool()
+            print("[Startup] PaddleOCR 워커 프로세스 준비 완료")
+        except Exception as e:
+            print(f"[Startup] PaddleOCR 워커 준비 실패: {e}")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """앱 종료 시 클린업 태스크 중지"""
-    global _cleanup_task
-    if _cleanup_task:
-        _cleanup_task.cancel()
-        try:
-            await _cleanup_task
-        except asyncio.CancelledError:
-            pass
+    """앱 종료 시 클린업 태스크 및 공유 리소스 정리"""
+    global _cleanup_task, _job_heartbeat_task
+    for task in (_cleanup_task, _job_heartbeat_task):
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     print("[Shutdown] 배치 상태 클린업 스케줄러 중지됨")
 
+    # 아직 기록하지 않은 배치 상태/결과 기록
+    try:
+        await batch_status_store.flush()
+    except Exception as e:
+        print(f"[Shutdown] 배치 상태 기록 실패: {e}")
+
+    # Naver OCR 공유 HTTP 클라이언트 종료
+    await close_naver_http_client()
 
-async def process_single_file_async(
+    # PaddleOCR 프로세스 풀 종료
+    shutdown_paddle_pool()
+
+
+def _failed_file_result(filename: str, error: str) -> Dict[str, Any]:
+    """파일 처리 실패 결과 생성"""
+    return {
+        "filename": filename,
+        "success": False,
+        "error": error,
+        "ocr_result": None,
+        "analysis_result": None,
+    }
+
+
+def _analysis_file_result(
+    filename: str, ocr_result: Dict[str, Any], ocr_engine: OCREngine, analysis_result
+) -> Dict[str, Any]:
+    """파일 분석 성공 결과 생성"""
+    return {
+        "filename": filename,
+        "success": True,
+        "ocr_result": {
+            "text": ocr_result["text"],
+            "confidence": ocr_result["confidence"],
+            "fields_count": ocr_result["fields_count"],
+            "engine": ocr_engine.value,
+        },
+        "analysis_result": analysis_result.to_dict(),
+        "error": None,
+    }
+
+
+async def ocr_single_file_async(
     file_path: Path,
     filename: str,
-    use_ai: bool,
     ocr_engine: OCREngine = OCREngine.NAVER,
-    use_rag: bool = True,
     batch_id: str = None,
 ) -> Dict[str, Any]:
     """
-    단일 파일 비동기 OCR + 분석 (파일별 상태 업데이트 포함)
+    단일 파일 비동기 OCR (파일별 상태 업데이트 포함)
 
     Args:
         file_path: 파일 경로
         filename: 원본 파일명
-        use_ai: AI 분석 사용 여부
         ocr_engine: OCR 엔진 선택
-        use_rag: RAG (법규 검색) 사용 여부
         batch_id: 배치 ID (상태 업데이트용)
 
     Returns:
-        dict: 분석 결과
+        dict: OCR 결과 (ocr_service.perform_ocr 형식)
     """
     try:
         # OCR 처리 시작
         if batch_id:
             update_file_status(batch_id, filename, "ocr", 20)
 
-        ocr_result = await perform_ocr(file_path, engine=ocr_engine)
+        ocr_result = await get_analysis_engine().ocr(file_path, ocr_engine)
 
-        if not ocr_result["success"]:
-            if batch_id:
-                update_file_status(
-                    batch_id, filename, "failed", 0, ocr_result.get("error", "OCR 실패")
-                )
-            return {
-                "filename": filename,
-                "success": False,
-                "error": ocr_result.get("error", "OCR 실패"),
-                "ocr_result": None,
-                "analysis_result": None,
-            }
+    except Exception as e:
+        ocr_result = {"success": False, "error": f"처리 중 오류: {str(e)}"}
+
+    if not ocr_result["success"] and batch_id:
+        update_file_status(
+            batch_id, filename, "failed", 0, ocr_result.get("error", "OCR 실패")
+        )
+
+    return ocr_result
+
+
+async def analyze_ocr_result_async(
+    filename: str,
+    ocr_result: Dict[str, Any],
+    use_ai: bool,
+    ocr_engine: OCREngine = OCREngine.NAVER,
+    use_rag: bool = True,
+    batch_id: str = None,
+    rag_context: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    OCR 결과 비동기 광고 분석 (파일별 상태 업데이트 포함)
+
+    Args:
+        filename: 원본 파일명
+        ocr_result: 성공한 OCR 결과
+        use_ai: AI 분석 사용 여부
+        ocr_engine: OCR 엔진 선택
+        use_rag: RAG (법규 검색) 사용 여부
+        batch_id: 배치 ID (상태 업데이트용)
+        rag_context: 미리 검색된 RAG 컨텍스트 (배치 일괄 검색 시)
 
+    Returns:
+        dict: 분석 결과
+    """
+    try:
         # 광고 분석 시작
         if batch_id:
             update_file_status(batch_id, filename, "analyzing", 50)
 
         extracted_text = ocr_result["text"]
         # 비동기 분석 함수 사용
-        analysis_result = await analyze_complete_async(
-            extracted_text, use_ai=use_ai, use_rag=use_rag
+        analysis_result = await get_analysis_engine().analyze_text(
+            extracted_text, use_ai=use_ai, use_rag=use_rag, rag_context=rag_context
         )
 
         # 완료
         if batch_id:
             update_file_status(batch_id, filename, "completed", 100)
 
-        return {
-            "filename": filename,
-            "success": True,
-            "ocr_result": {
-                "text": ocr_result["text"],
-                "confidence": ocr_result["confidence"],
-                "fields_count": ocr_result["fields_count"],
-                "engine": ocr_engine.value,
-            },
-            "analysis_result": analysis_result.to_dict(),
-            "error": None,
-        }
+        return _analysis_file_result(filename, ocr_result, ocr_engine, analysis_result)
 
     except Exception as e:
         if batch_id:
             update_file_status(batch_id, filename, "failed", 0, str(e))
-        return {
-            "filename": filename,
-            "success": False,
-            "error": f"처리 중 오류: {str(e)}",
-            "ocr_result": None,
-            "analysis_result": None,
-        }
+        return _failed_file_result(filename, f"처리 중 오류: {str(e)}")
+
+
+async def process_single_file_async(
+    file_path: Path,
+    filename: str,
+    use_ai: bool,
+    ocr_engine: OCREngine = OCREngine.NAVER,
+    use_rag: bool = True,
+    batch_id: str = None,
+) -> Dict[str, Any]:
+    """
+    단일 파일 비동기 OCR + 분석 (파일별 상태 업데이트 포함)
+
+    Args:
+        file_path: 파일 경로
+        filename: 원본 파일명
+        use_ai: AI 분석 사용 여부
+        ocr_engine: OCR 엔진 선택
+        use_rag: RAG (법규 검색) 사용 여부
+        batch_id: 배치 ID (상태 업데이트용)
+
+    Returns:
+        dict: 분석 결과
+    """
+    ocr_result = await ocr_single_file_async(file_path, filename, ocr_engine, batch_id)
+
+    if not ocr_result["success"]:
+        return _failed_file_result(filename, ocr_result.get("error", "OCR 실패"))
+
+    return await analyze_ocr_result_async(
+        filename, ocr_result, use_ai, ocr_engine, use_rag, batch_id
+    )
 
 
 async def batch_analyze_files(
@@ -659,9 +1075,12 @@ async def batch_analyze_files(
     use_ai: bool,
     ocr_engine: OCREngine = OCREngine.NAVER,
     use_rag: bool = True,
+    resume: bool = False,
+    analysis_mode: str = ANALYSIS_MODE_REALTIME,
 ):
     """
-    배치 파일 병렬 분석
+    배치 파일 단계별 파이프라인 분석 (OCR → RAG 일괄 검색 → 1차 AI 분석 → 2차 판정)
+    단계마다 별도 대기열/워커를 두어 한 파일의 AI 분석 중에 다음 파일의 OCR이 진행됨
 
     Args:
         batch_id: 배치 ID
@@ -669,84 +1088,334 @@ async def batch_analyze_files(
         use_ai: AI 분석 사용 여부
         ocr_engine: OCR 엔진 선택
         use_rag: RAG (법규 검색) 사용 여부
+        resume: 중단된 배치 재개 여부 (file_paths는 결과가 없는 파일만)
+        analysis_mode: realtime (파일별 즉시 분석) 또는 offline (1차 AI 분석을 Batch API로 일괄 제출)
     """
-    # OCR 엔진별 최대 동시 처리 수 (Naver: 5, Paddle: 50)
-    max_concurrent = OCR_FILE_LIMITS[ocr_engine]
-    semaphore = asyncio.Semaphore(max_concurrent)
+    # OCR 엔진/OpenAI 호출은 모든 배치가 공유하는 스케줄러 상한 내에서 배치 간 번갈아 실행
+    scheduler = get_batch_scheduler()
+    engine = get_analysis_engine()
+    ocr_resource = f"ocr:{ocr_engine.value}"
+
+    # AI 미사용 분석(키워드만)은 배치별 동시 처리 수로 제한 (Naver: 5, Paddle: 50)
+    semaphore = asyncio.Semaphore(OCR_FILE_LIMITS[ocr_engine])
+
+    # 소유권을 잃으면 heartbeat에서 이 태스크를 취소
+    _batch_tasks[batch_id] = asyncio.current_task()
 
     # 시작 시간 기록 및 파일별 상태 초기화
     start_time = datetime.now()
-    if batch_id in batch_status_store:
+    if resume and batch_status_store.is_local(batch_id):
+        # 기존 시작 시간 유지, 남은 파일만 pending으로 되돌림
+        batch = batch_status_store[batch_id]
+        try:
+            start_time = datetime.fromisoformat(batch.start_time)
+        except (ValueError, TypeError):
+            batch.start_time = start_time.isoformat()
+        for _, name in file_paths:
+            update_file_status(batch_id, name, "pending", 0)
+    elif batch_status_store.is_local(batch_id):
         batch_status_store[batch_id].start_time = start_time.isoformat()
         batch_status_store[batch_id].current_phase = "analyzing"
         # 파일별 상태 초기화 (모두 pending)
-        batch_status_store[batch_id].file_statuses = [
-            FileStatus(filename=name, status="pending", progress=0)
-            for _, name in file_paths
-        ]
+        batch_status_store[batch_id].set_file_statuses(
+            [
+                FileStatus(
+                    filename=name, file_id=_file_id(index), status="pending", progress=0
+                )
+                for index, (_, name) in enumerate(file_paths)
+            ]
+        )
+        batch_status_store.persist(batch_id)
+        for file_status in batch_status_store[batch_id].file_statuses:
+            get_batch_event_hub().publish(
+                batch_id, EVENT_FILE_STATUS, file_status.model_dump()
+            )
+
+    def record_result(filename: str, result: Dict[str, Any]):
+        """파일 처리 결과 기록 및 진행률 업데이트"""
+        if not batch_status_store.is_local(batch_id):
+            return
+
+        # 재개 시 결과가 있는 파일을 file_id로 구분
+        file_status = batch_status_store[batch_id].find_file_status(filename)
+        if file_status is not None and file_status.file_id:
+            result["file_id"] = file_status.file_id
+
+        batch_status_store[batch_id].processed_files += 1
+
+        # 진행률 계산
+        progress = (
+            batch_status_store[batch_id].processed_files
+            / batch_status_store[batch_id].total_files
+            * 100
+        )
+        batch_status_store[batch_id].progress_percent = progress
+
+        # 경과 시간 및 예상 완료 시간 계산
+        elapsed = (datetime.now() - start_time).total_seconds()
+        batch_status_store[batch_id].elapsed_seconds = elapsed
+
+        if batch_status_store[batch_id].processed_files > 0:
+            # 파이프라인 처리량 기준 파일당 시간 (경과 시간 / 완료 파일 수)
+            avg_time_per_file = (
+                elapsed / batch_status_store[batch_id].processed_files
+            )
+            remaining_files = (
+                batch_status_store[batch_id].total_files
+                - batch_status_store[batch_id].processed_files
+            )
+            estimated_remaining = remaining_files * avg_time_per_file
+            estimated_completion = datetime.now() + timedelta(
+                seconds=estimated_remaining
+            )
+            batch_status_store[
+                batch_id
+            ].estimated_completion = estimated_completion.isoformat()
+
+        batch_status_store.add_result(batch_id, result)
+
+        if not result["success"]:
+            batch_status_store[batch_id].errors.append(
+                f"{filename}: {result.get('error', '알 수 없는 오류')}"
+            )
+
+        batch_status_store.persist(batch_id)
+
+        # 결과 이벤트 발행 (결과는 이 이벤트로 한 번만 전송)
+        batch = batch_status_store[batch_id]
+        get_batch_event_hub().publish(
+            batch_id,
+            EVENT_RESULT,
+            {
+                "result": result,
+                "processed_files": batch.processed_files,
+                "total_files": batch.total_files,
+                "progress_percent": batch.progress_percent,
+                "elapsed_seconds": batch.elapsed_seconds,
+                "estimated_completion": batch.estimated_completion,
+            },
+        )
 
-    async def process_with_semaphore(file_path: Path, filename: str):
-        async with semaphore:
-            result = await process_single_file_async(
-                file_path, filename, use_ai, ocr_engine, use_rag, batch_id
+    # ----------------------------------------
+    # 파이프라인 단계 (항목: {"name", "path", "ocr_result", "rag_context", "result", "ai_text"})
+    # ----------------------------------------
+
+    async def ocr_stage(item: Dict[str, Any]):
+        async with scheduler.slot(ocr_resource, batch_id):
+            ocr_result = await ocr_single_file_async(
+                item["path"], item["name"], ocr_engine, batch_id
             )
 
-            # 진행률 업데이트
-            if batch_id in batch_status_store:
-                batch_status_store[batch_id].processed_files += 1
+        if not ocr_result["success"]:
+            record_result(
+                item["name"],
+                _failed_file_result(item["name"], ocr_result.get("error", "OCR 실패")),
+            )
+            return None
 
-                # 진행률 계산
-                progress = (
-                    batch_status_store[batch_id].processed_files
-                    / batch_status_store[batch_id].total_files
-                    * 100
-                )
-                batch_status_store[batch_id].progress_percent = progress
+        item["ocr_result"] = ocr_result
+        return item
 
-                # 경과 시간 및 예상 완료 시간 계산
-                elapsed = (datetime.now() - start_time).total_seconds()
-                batch_status_store[batch_id].elapsed_seconds = elapsed
+    async def rag_stage(items: List[Dict[str, Any]]):
+        # 대기열에 모인 텍스트를 임베딩 1회로 일괄 검색
+        rag_contexts = await engine.retrieve_batch(
+            [item["ocr_result"]["text"] for item in items]
+        )
+        for item, rag_context in zip(items, rag_contexts):
+            item["rag_context"] = rag_context
+        return items
 
-                if batch_status_store[batch_id].processed_files > 0:
-                    avg_time_per_file = (
-                        elapsed / batch_status_store[batch_id].processed_files
-                    )
-                    remaining_files = (
-                        batch_status_store[batch_id].total_files
-                        - batch_status_store[batch_id].processed_files
+    async def llm_stage(item: Dict[str, Any]):
+        name, ocr_result = item["name"], item["ocr_result"]
+        update_file_status(batch_id, name, "analyzing", 50)
+        text = ocr_result["text"]
+        result = engine.keywords(text)
+        item["result"] = result
+
+        try:
+            async with scheduler.slot(RESOURCE_OPENAI, batch_id):
+                if engine.pipeline == PIPELINE_STRUCTURED:
+                    # 구조화 출력은 1차 분석 + 판정을 1회 호출로 처리하므로 판정 단계 생략
+                    structured = await engine.analyze_structured(
+                        text, result, item.get("rag_context") or ""
                     )
-                    # 병렬 처리를 고려한 예상 시간 (남은 파일 / 동시 처리 수)
-                    estimated_remaining = (
-                        remaining_files / max_concurrent
-                    ) * avg_time_per_file
-                    estimated_completion = datetime.now() + timedelta(
-                        seconds=estimated_remaining
+                    result.ai_analysis = structured["analysis"]
+                    apply_final_judgment(result, structured)
+                    item["ai_text"] = None
+                else:
+                    item["ai_text"] = await engine.analyze_llm(
+                        text, result, item.get("rag_context") or ""
                     )
-                    batch_status_store[
-                        batch_id
-                    ].estimated_completion = estimated_completion.isoformat()
+        except Exception as e:
+            # AI 분석 실패 시 키워드 결과로 기록
+            result.ai_analysis = f"AI 분석 실패: {str(e)}"
+            print(f"[분석] AI 분석 오류: {e}")
+            item["ai_text"] = None
+
+        if item["ai_text"] is None:
+            update_file_status(batch_id, name, "completed", 100)
+            record_result(name, _analysis_file_result(name, ocr_result, ocr_engine, result))
+            return None
+        return item
+
+    async def judgment_stage(item: Dict[str, Any]):
+        name = item["name"]
+        update_file_status(batch_id, name, "analyzing", 80)
+        async with scheduler.slot(RESOURCE_OPENAI_JUDGMENT, batch_id):
+            await engine.judge(item["result"], item["ai_text"])
+
+        update_file_status(batch_id, name, "completed", 100)
+        record_result(
+            name, _analysis_file_result(name, item["ocr_result"], ocr_engine, item["result"])
+        )
+
+    def stage_failed(item: Dict[str, Any], error: BaseException):
+        """단계 처리 중 예상치 못한 오류 → 파일 실패로 기록"""
+        update_file_status(batch_id, item["name"], "failed", 0, str(error))
+        record_result(item["name"], _failed_file_result(item["name"], f"처리 중 오류: {str(error)}"))
+
+    async def analyze_with_semaphore(
+        filename: str, ocr_result: Dict[str, Any], rag_context: Optional[str]
+    ):
+        slot = scheduler.slot(RESOURCE_OPENAI, batch_id) if use_ai else semaphore
+        async with slot:
+            result = await analyze_ocr_result_async(
+                filename, ocr_result, use_ai, ocr_engine, use_rag, batch_id, rag_context
+            )
+            record_result(filename, result)
+            return result
 
-                batch_status_store[batch_id].results.append(result)
+    async def analyze_offline(
+        succeeded: List[tuple], rag_contexts: List[Optional[str]]
+    ):
+        """1차 AI 분석을 Batch API로 일괄 처리한 뒤 파일별 결과 기록"""
+        for name, _ in succeeded:
+            update_file_status(batch_id, name, "analyzing", 50)
 
-                if not result["success"]:
-                    batch_status_store[batch_id].errors.append(
-                        f"{filename}: {result.get('error', '알 수 없는 오류')}"
+        # 제출한 Batch ID와 custom_id → 파일명 매핑을 작업 명세에 저장 (재개 시 다시 제출하지 않음)
+        job_store = batch_status_store.job_store
+        spec = await asyncio.to_thread(job_store.load_spec, batch_id) or {}
+
+        # custom_id는 업로드 순서 기준 file_id (OCR 완료 순서/재개 시 남은 파일과 무관하게 고정)
+        file_ids = {
+            name: _file_id(index) for index, (_, name) in enumerate(spec.get("file_paths", []))
+        }
+        custom_ids = [file_ids.get(name, name) for name, _ in succeeded]
+        names = dict(zip(custom_ids, (name for name, _ in succeeded)))
+
+        def remember_submission(openai_batch_id: str, submitted_ids: List[str]):
+            spec["openai_batch_id"] = openai_batch_id
+            spec["openai_batch_files"] = {
+                custom_id: names[custom_id] for custom_id in submitted_ids
+            }
+            job_store.save_spec(batch_id, spec)
+
+        def report_progress(completed: int, total: int):
+            print(f"[BatchAPI] {batch_id}: {completed}/{total} 완료")
+            if batch_status_store.is_local(batch_id):
+                batch = batch_status_store[batch_id]
+                if batch.current_phase != "batch_api":
+                    batch.current_phase = "batch_api"
+                    batch_status_store.persist(batch_id)
+
+        try:
+            analyses = await run_offline_analysis(
+                batch_id,
+                [
+                    {"custom_id": custom_id, "text": ocr_result["text"], "rag_context": rag_context}
+                    for custom_id, (_, ocr_result), rag_context in zip(
+                        custom_ids, succeeded, rag_contexts
                     )
+                ],
+                openai_batch_id=spec.get("openai_batch_id"),
+                submitted_ids=spec.get("openai_batch_files"),
+                on_submitted=remember_submission,
+                on_progress=report_progress,
+            )
+        except Exception as e:
+            # Batch 제출/조회 실패 시 파일별 실시간 분석으로 전환
+            print(f"[BatchAPI] 오프라인 분석 실패, 실시간 분석으로 전환: {e}")
+            await asyncio.gather(
+                *[
+                    analyze_with_semaphore(name, ocr_result, rag_context)
+                    for (name, ocr_result), rag_context in zip(succeeded, rag_contexts)
+                ],
+                return_exceptions=True,
+            )
+            return
 
-            return result
+        for custom_id, (name, ocr_result) in zip(custom_ids, succeeded):
+            update_file_status(batch_id, name, "completed", 100)
+            record_result(
+                name,
+                _analysis_file_result(name, ocr_result, ocr_engine, analyses[custom_id]),
+            )
 
     try:
-        # 모든 파일 병렬 처리
-        tasks = [process_with_semaphore(path, name) for path, name in file_paths]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        items = [{"name": name, "path": path} for path, name in file_paths]
+        stages = [
+            PipelineStage(
+                "ocr", ocr_stage, BATCH_OCR_WORKERS or scheduler.limit(ocr_resource)
+            )
+        ]
+        if use_ai and use_rag:
+            stages.append(
+                PipelineStage("rag", rag_stage, BATCH_RAG_WORKERS, BATCH_RAG_BATCH_SIZE)
+            )
+
+        # 오프라인 모드: OCR/RAG까지 파이프라인으로 처리한 뒤 1차 AI 분석은 Batch API로 일괄 제출
+        offline = use_ai and analysis_mode == ANALYSIS_MODE_OFFLINE
+        succeeded: List[tuple] = []
+        rag_contexts: List[Optional[str]] = []
+
+        if offline:
+
+            async def collect_stage(item: Dict[str, Any]):
+                succeeded.append((item["name"], item["ocr_result"]))
+                rag_contexts.append(item.get("rag_context"))
+
+            stages.append(PipelineStage("collect", collect_stage))
+
+        elif engine.ai_available(use_ai):
+            stages.append(
+                PipelineStage(
+                    "llm", llm_stage, BATCH_LLM_WORKERS or scheduler.limit(RESOURCE_OPENAI)
+                )
+            )
+            stages.append(
+                PipelineStage(
+                    "judgment",
+                    judgment_stage,
+                    BATCH_JUDGMENT_WORKERS or scheduler.limit(RESOURCE_OPENAI_JUDGMENT),
+                )
+            )
+
+        else:
+            # 키워드 분석만 (배치별 동시 처리 수 제한)
+
+            async def keyword_stage(item: Dict[str, Any]):
+                rag_context = item.get("rag_context")
+                await analyze_with_semaphore(item["name"], item["ocr_result"], rag_context)
+
+            stages.append(
+                PipelineStage("analyze", keyword_stage, OCR_FILE_LIMITS[ocr_engine])
+            )
+
+        pipeline_stats = await run_pipeline(items, stages, on_error=stage_failed)
+        print(f"[Pipeline] {batch_id} 단계별 처리: {pipeline_stats}")
+
+        if offline and succeeded:
+            await analyze_offline(succeeded, rag_contexts)
 
         # 상태 업데이트
-        if batch_id in batch_status_store:
+        if batch_status_store.is_local(batch_id):
             batch_status_store[batch_id].status = "completed"
 
             # 결과를 JSON 파일로 저장
             batch_results_dir = Path("uploads/batch_results")
+            batch_results_dir.mkdir(parents=True, exist_ok=True)
             batch_results_file = batch_results_dir / f"{batch_id}.json"
+            completed_at = datetime.now().isoformat()
 
             with open(batch_results_file, "w", encoding="utf-8") as f:
                 json.dump(
@@ -756,17 +1425,37 @@ async def batch_analyze_files(
                         "processed_files": batch_status_store[batch_id].processed_files,
                         "results": batch_status_store[batch_id].results,
                         "errors": batch_status_store[batch_id].errors,
-                        "completed_at": datetime.now().isoformat(),
+                        "completed_at": completed_at,
                     },
                     f,
                     ensure_ascii=False,
                     indent=2,
                 )
 
+            # 분석 이력 DB에 저장 (관리자 이력/통계 조회용)
+            await asyncio.to_thread(
+                get_history_store().record_batch,
+                batch_id,
+                batch_status_store[batch_id].results,
+                completed_at,
+            )
+
+            publish_batch_status(batch_id)
+            await batch_status_store.flush(batch_id)
+
     except Exception as e:
-        if batch_id in batch_status_store:
+        if batch_status_store.is_local(batch_id):
             batch_status_store[batch_id].status = "failed"
             batch_status_store[batch_id].errors.append(f"배치 처리 실패: {str(e)}")
+            publish_batch_status(batch_id)
+            try:
+                await batch_status_store.flush(batch_id)
+            except Exception as flush_error:
+                print(f"[Jobs] 배치 상태 기록 실패: {batch_id} - {flush_error}")
+
+    finally:
+        if _batch_tasks.get(batch_id) is asyncio.current_task():
+            del _batch_tasks[batch_id]
 
 
 @app.post("/api/analyze", response_model=AnalysisResponse)
@@ -781,7 +1470,7 @@ async def analyze_advertisement(request: AnalysisRequest):
         AnalysisResponse: 광고 분석 결과
     """
     try:
-        result = analyze_complete(
+        result = await get_analysis_engine().analyze_text(
             request.text, use_ai=request.use_ai, use_rag=request.use_rag
         )
 
@@ -900,11 +1589,10 @@ async def process_ocr_and_analyze(
 
     try:
         # 파일 저장
-        with temp_file_path.open("wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        await asyncio.to_thread(_copy_upload, file, temp_file_path)
 
         # 1. OCR 처리
-        ocr_result = await perform_ocr(temp_file_path, engine=engine)
+        ocr_result = await get_analysis_engine().ocr(temp_file_path, engine)
 
         if not ocr_result["success"]:
             return OCRAnalysisResponse(
@@ -915,7 +1603,7 @@ async def process_ocr_and_analyze(
 
         # 2. 광고 분석
         extracted_text = ocr_result["text"]
-        analysis_result = analyze_complete(
+        analysis_result = await get_analysis_engine().analyze_text(
             extracted_text, use_ai=use_ai_bool, use_rag=use_rag_bool
         )
 
@@ -945,13 +1633,149 @@ async def process_ocr_and_analyze(
             temp_file_path.unlink()
 
 
+@app.post("/api/ocr-analyze/stream")
+async def process_ocr_and_analyze_stream(
+    file: UploadFile = File(...),
+    use_ai: str = Form("false"),
+    use_rag: str = Form("true"),
+    ocr_engine: str = Form("naver"),
+):
+    """
+    이미지 OCR + 광고 위반 분석 (Server-Sent Events 스트리밍)
+
+    처리 단계가 끝나는 대로 이벤트를 전송:
+    - ocr: OCR 결과 (text, confidence, fields_count, processing_time)
+    - keywords: 키워드 분석 결과 (analysis_result)
+    - ai_delta: 1차 AI 분석 텍스트 조각 (delta, AI 사용 시)
+    - result: 2차 판정까지 반영한 최종 결과 (/api/ocr-analyze 응답과 동일 형식)
+    - error: OCR 실패 또는 처리 오류
+
+    Args:
+        file: 업로드된 이미지 파일
+        use_ai: AI 분석 사용 여부 ("true"/"false")
+        use_rag: RAG (법규 검색) 사용 여부 ("true"/"false")
+        ocr_engine: OCR 엔진 선택 (naver 또는 paddle)
+    """
+    start_time = datetime.now()
+
+    # 문자열을 boolean으로 변환
+    use_ai_bool = use_ai.lower() == "true"
+    use_rag_bool = use_rag.lower() == "true"
+
+    # OCR 엔진 결정
+    engine = (
+        OCREngine(ocr_engine) if ocr_engine in ["naver", "paddle"] else OCREngine.NAVER
+    )
+
+    # Naver OCR 선택 시에만 API 키 검증
+    if engine == OCREngine.NAVER:
+        if not NAVER_OCR_API_URL or not NAVER_OCR_SECRET_KEY:
+            raise HTTPException(
+                status_code=500, detail="Naver OCR API 설정이 올바르지 않습니다."
+            )
+
+    # 스트림 시작 전에 업로드 파일 검증/저장 (응답 중에는 업로드 파일이 닫힐 수 있음)
+    filename = file.filename
+    temp_file_path = await save_upload_temp(file)
+
+    async def event_stream():
+        try:
+            # 1. OCR 처리
+            ocr_result = await get_analysis_engine().ocr(temp_file_path, engine)
+            if not ocr_result["success"]:
+                yield _format_sse(
+                    "error",
+                    {
+                        "success": False,
+                        "error": ocr_result.get("error", "OCR 실패"),
+                        "filename": filename,
+                    },
+                )
+                return
+
+            ocr_payload = {
+                "text": ocr_result["text"],
+                "confidence": ocr_result["confidence"],
+                "fields_count": ocr_result["fields_count"],
+                "processing_time": (datetime.now() - start_time).total_seconds(),
+            }
+            yield _format_sse("ocr", {"filename": filename, "ocr_result": ocr_payload})
+
+            # 2. 광고 분석 (키워드 → AI 토큰 → 최종 판정)
+            async for event_type, data in get_analysis_engine().stream_text(
+                ocr_result["text"], use_ai=use_ai_bool, use_rag=use_rag_bool
+            ):
+                if event_type == "ai_delta":
+                    yield _format_sse("ai_delta", data)
+                elif event_type == "keywords":
+                    yield _format_sse("keywords", {"analysis_result": data})
+                else:
+                    yield _format_sse(
+                        "result",
+                        {
+                            "success": True,
+                            "ocr_result": ocr_payload,
+                            "analysis_result": data,
+                            "filename": filename,
+                            "processing_time": (datetime.now() - start_time).total_seconds(),
+                        },
+                    )
+
+        except Exception as e:
+            logger.error(f"스트리밍 분석 오류: {str(e)}")
+            yield _format_sse(
+                "error",
+                {
+                    "success": False,
+                    "error": get_safe_error_message(e, "처리 중 오류가 발생했습니다"),
+                    "filename": filename,
+                },
+            )
+
+        finally:
+            # 임시 파일 삭제
+            await asyncio.to_thread(temp_file_path.unlink, missing_ok=True)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _file_id(index: int) -> str:
+    """배치 내 파일 고유 ID (업로드 순서 기반)"""
+    return f"f{index:04d}"
+
+
+def _dedupe_filename(filename: str, used: set) -> str:
+    """
+    배치 내 중복 파일명 구분
+
+    Args:
+        filename: 원본 파일명
+        used: 이미 사용된 파일명 집합 (갱신됨)
+
+    Returns:
+        str: 중복이면 "이름_2.jpg" 형식으로 번호를 붙인 파일명
+    """
+    candidate = filename
+    stem, suffix = Path(filename).stem, Path(filename).suffix
+    number = 2
+    while candidate in used:
+        candidate = f"{stem}_{number}{suffix}"
+        number += 1
+    used.add(candidate)
+    return candidate
+
+
 @app.post("/api/batch-upload-analyze")
 async def batch_upload_analyze(
     files: List[UploadFile] = File(...),
     use_ai: str = Form("false"),
     use_rag: str = Form("true"),
     ocr_engine: str = Form("naver"),
-    background_tasks: BackgroundTasks = None,
+    analysis_mode: str = Form(ANALYSIS_MODE_REALTIME),
 ):
     """
     다중 파일 업로드 및 배치 분석
@@ -961,7 +1785,7 @@ async def batch_upload_analyze(
         use_ai: AI 분석 사용 여부 ("true"/"false")
         use_rag: RAG (법규 검색) 사용 여부 ("true"/"false")
         ocr_engine: OCR 엔진 선택 (naver 또는 paddle)
-        background_tasks: 백그라운드 작업
+        analysis_mode: realtime 또는 offline (급하지 않은 대량 재검토, OpenAI Batch API 사용)
 
     Returns:
         dict: batch_id 및 초기 상태 (file_statuses 포함)
@@ -975,6 +1799,9 @@ async def batch_upload_analyze(
         OCREngine(ocr_engine) if ocr_engine in ["naver", "paddle"] else OCREngine.NAVER
     )
 
+    # 분석 방식 결정 (오프라인 모드는 AI 분석 사용 시에만 의미 있음)
+    mode = ANALYSIS_MODE_OFFLINE if analysis_mode == ANALYSIS_MODE_OFFLINE else ANALYSIS_MODE_REALTIME
+
     # 엔진별 파일 수 제한
     file_limit = OCR_FILE_LIMITS[engine]
     if len(files) > file_limit:
@@ -998,6 +1825,7 @@ async def batch_upload_analyze(
     batch_temp_dir.mkdir(parents=True, exist_ok=True)
 
     file_paths = []
+    used_filenames: set = set()
 
     try:
         # 파일 저장
@@ -1010,33 +1838,65 @@ async def batch_upload_analyze(
                     detail=f"지원하지 않는 파일 형식입니다: {file.filename}. jpg, jpeg, png 파일만 업로드 가능합니다.",
                 )
 
-            # 파일 저장
-            file_path = batch_temp_dir / file.filename
-            with file_path.open("wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
+            # 파일 저장 (배치 내 중복 파일명은 번호를 붙여 구분)
+            filename = _dedupe_filename(Path(file.filename).name, used_filenames)
+            file_path = batch_temp_dir / filename
+            await asyncio.to_thread(_copy_upload, file, file_path)
 
-            file_paths.append((file_path, file.filename))
+            file_paths.append((file_path, filename))
 
         # 배치 상태 초기화
-        batch_status_store[batch_id] = BatchAnalysisStatus(
+        queued = BATCH_EXECUTION == "queue"
+        status = BatchAnalysisStatus(
             batch_id=batch_id,
-            status="processing",
+            status="queued" if queued else "processing",
             total_files=len(files),
             processed_files=0,
             progress_percent=0.0,
             results=[],
             errors=[],
         )
+        spec = {
+            "file_paths": [[str(path), name] for path, name in file_paths],
+            "use_ai": use_ai_bool,
+            "ocr_engine": engine.value,
+            "use_rag": use_rag_bool,
+            "analysis_mode": mode,
+        }
+        job_store = batch_status_store.job_store
 
-        # 백그라운드에서 배치 분석 시작
-        background_tasks.add_task(
-            batch_analyze_files, batch_id, file_paths, use_ai_bool, engine, use_rag_bool
-        )
+        if queued:
+            # 대기열에 넣고 batch_worker 프로세스가 가져가 처리
+            batch_status_store.submit(status)
+            job_store.save_spec(batch_id, spec)
+            job_store.enqueue(batch_id)
+        else:
+            batch_status_store[batch_id] = status
+
+            # 배치 소유권 및 재개용 작업 명세 기록 (워커 중단 시 다른 워커가 이어서 처리)
+            job_store.claim(batch_id, WORKER_ID, JOB_STALE_SECONDS)
+            job_store.save_spec(batch_id, spec)
+
+            # 백그라운드에서 배치 분석 시작 (소유권을 잃으면 취소할 수 있도록 별도 태스크)
+            asyncio.create_task(
+                batch_analyze_files(
+                    batch_id,
+                    file_paths,
+                    use_ai_bool,
+                    engine,
+                    use_rag_bool,
+                    analysis_mode=mode,
+                )
+            )
 
         return {
             "success": True,
             "batch_id": batch_id,
             "total_files": len(files),
+            "files": [
+                {"file_id": _file_id(index), "filename": name}
+                for index, (_, name) in enumerate(file_paths)
+            ],
             "message": "배치 분석이 시작되었습니다. /api/batch-status/{batch_id}로 진행 상태를 확인하세요.",
         }
 
@@ -1050,38 +1910,272 @@ async def batch_upload_analyze(
         )
 
 
+def _compact_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """결과에서 1차 AI 분석 본문 제거 (compact 모드)"""
+    analysis = result.get("analysis_result")
+    if not analysis or not analysis.get("ai_analysis"):
+        return result
+    return {**result, "analysis_result": {**analysis, "ai_analysis": None}}
+
+
+async def _load_completed_batch(batch_id: str) -> BatchAnalysisStatus:
+    """메모리에 없는 완료 배치를 JSON 파일 또는 분석 이력 DB에서 조회"""
+    # JSON 파일에서 확인 (완료된 배치)
+    batch_results_file = Path("uploads/batch_results") / f"{batch_id}.json"
+    data = None
+    if batch_results_file.exists():
+        with open(batch_results_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        # 분석 이력 DB에서 확인 (JSON 파일이 정리된 배치)
+        data = await asyncio.to_thread(get_history_store().get_batch, batch_id)
+
+    if data:
+        return BatchAnalysisStatus(
+            batch_id=data["batch_id"],
+            status="completed",
+            total_files=data["total_files"],
+            processed_files=data["processed_files"],
+            progress_percent=100.0,
+            results=data["results"],
+            errors=data.get("errors", []),
+        )
+
+    raise HTTPException(
+        status_code=404, detail=f"배치 ID '{batch_id}'를 찾을 수 없습니다."
+    )
+
+
 @app.get("/api/batch-status/{batch_id}")
-async def get_batch_status(batch_id: str):
+async def get_batch_status(
+    batch_id: str,
+    since: Optional[int] = None,
+    compact: bool = False,
+    include_ai: bool = False,
+):
     """
     배치 분석 진행 상태 조회
 
     Args:
         batch_id: 배치 ID
+        since: 이전 응답의 cursor (지정 시 이후 변경분만 반환)
+        compact: True면 결과의 1차 AI 분석 본문(ai_analysis) 제외
+        include_ai: compact 모드에서도 ai_analysis 포함
 
     Returns:
-        BatchAnalysisStatus: 배치 분석 상태
+        BatchAnalysisStatus: 배치 분석 상태 (since 미지정)
+        BatchStatusDelta: 변경분 (since 지정)
     """
-    # 메모리에서 확인
-    if batch_id in batch_status_store:
-        return batch_status_store[batch_id]
+    strip_ai = compact and not include_ai
 
-    # JSON 파일에서 확인 (완료된 배치)
-    batch_results_file = Path("uploads/batch_results") / f"{batch_id}.json"
-    if batch_results_file.exists():
-        with open(batch_results_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return BatchAnalysisStatus(
-                batch_id=data["batch_id"],
-                status="completed",
-                total_files=data["total_files"],
-                processed_files=data["processed_files"],
-                progress_percent=100.0,
-                results=data["results"],
-                errors=data.get("errors", []),
-            )
+    # 증분 응답: 작업 저장소의 배치별 변경 번호를 커서로 사용 (어느 워커가 받아도 같은 커서)
+    if since is not None:
+        return await _get_batch_status_delta(batch_id, since, strip_ai)
 
-    raise HTTPException(
-        status_code=404, detail=f"배치 ID '{batch_id}'를 찾을 수 없습니다."
+    # 이 워커 메모리 → 작업 저장소(다른 워커/재시작 전 배치) → 완료 결과 순으로 조회
+    if batch_status_store.is_local(batch_id):
+        batch = batch_status_store[batch_id]
+    else:
+        batch = await asyncio.to_thread(batch_status_store.get, batch_id)
+        if batch is None:
+            batch = await _load_completed_batch(batch_id)
+
+    # 전체 상태 응답 (기존 동작)
+    if not strip_ai:
+        return batch
+    return batch.model_copy(
+        update={"results": [_compact_result(r) for r in batch.results]}
+    )
+
+
+async def _get_batch_status_delta(batch_id: str, since: int, strip_ai: bool) -> BatchStatusDelta:
+    """
+    since 변경 번호 이후의 배치 상태 변경분
+
+    결과는 since 이후 추가된 것만, 파일 상태는 since 이후 상태가 다시 기록된 경우에만 반환합니다.
+    처리 중인 워커는 모아 둔 변경을 먼저 기록하므로 다른 워커와 같은 내용을 응답합니다.
+    """
+    if batch_status_store.is_local(batch_id):
+        try:
+            await batch_status_store.flush(batch_id)
+        except Exception as e:
+            print(f"[Jobs] 배치 상태 기록 실패: {batch_id} - {e}")
+
+    job_store = batch_status_store.job_store
+    changes = await asyncio.to_thread(job_store.load_changes, batch_id, max(since, 0))
+    if changes is not None and since > changes["version"]:
+        # 작업 저장소 초기화 등으로 커서가 유효하지 않으면 처음부터 다시 조회
+        since = 0
+        changes = await asyncio.to_thread(job_store.load_changes, batch_id, 0)
+
+    if changes is None:
+        # 작업 저장소에서 정리된 완료 배치는 전체 결과 (커서 0: 다음 요청도 전체 상태)
+        batch = (await _load_completed_batch(batch_id)).model_dump()
+        cursor, full = 0, True
+        results = batch["results"]
+    else:
+        batch = changes["state"]
+        cursor, full = changes["version"], since <= 0
+        results = changes["results"]
+        if not full and changes["state_version"] <= since:
+            batch["file_statuses"] = []
+
+    if strip_ai:
+        results = [_compact_result(r) for r in results]
+
+    return BatchStatusDelta(
+        batch_id=batch["batch_id"],
+        status=batch["status"],
+        total_files=batch["total_files"],
+        processed_files=batch["processed_files"],
+        progress_percent=batch["progress_percent"],
+        elapsed_seconds=batch.get("elapsed_seconds"),
+        estimated_completion=batch.get("estimated_completion"),
+        current_phase=batch.get("current_phase"),
+        cursor=cursor,
+        full=full,
+        file_statuses=batch.get("file_statuses", []),
+        results=results,
+        errors=batch.get("errors", []),
+    )
+
+
+# SSE 연결 유지용 주석 전송 간격 (초)
+BATCH_EVENTS_KEEPALIVE_SECONDS = 15
+
+# 다른 워커가 처리 중인 배치의 작업 저장소 조회 간격 (초)
+BATCH_EVENTS_REMOTE_POLL_SECONDS = 2
+
+
+def _format_sse(event_type: str, data: Any, event_id: Optional[int] = None) -> str:
+    """SSE 메시지 직렬화"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@app.get("/api/batch-events/{batch_id}")
+async def stream_batch_events(batch_id: str, request: Request):
+    """
+    배치 분석 진행 상태 스트림 (Server-Sent Events)
+
+    최초 연결 시 현재 상태 스냅샷(snapshot)을 한 번 보낸 뒤,
+    이후 변경만 file_status / result / status 이벤트로 전송합니다.
+    재연결 시 Last-Event-ID 헤더가 있으면 스냅샷 없이 그 이후 이벤트만 전송합니다.
+
+    Args:
+        batch_id: 배치 ID
+        request: 요청 객체 (Last-Event-ID, 연결 종료 확인)
+
+    Returns:
+        StreamingResponse: text/event-stream 응답
+    """
+    hub = get_batch_event_hub()
+
+    last_event_id = request.headers.get("last-event-id")
+    try:
+        resume_seq = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_seq = None
+
+    # 스냅샷과 순번을 같은 시점에 확보 (이후 이벤트만 이어서 전송)
+    snapshot = None
+    if batch_status_store.is_local(batch_id):
+        seq = hub.last_seq(batch_id)
+        if resume_seq is None or resume_seq > seq:
+            snapshot = batch_status_store[batch_id].model_dump()
+        else:
+            seq = resume_seq
+    else:
+        # 다른 워커가 처리 중이거나 완료된 배치는 작업 저장소/결과 파일에서 조회
+        batch = await asyncio.to_thread(batch_status_store.get, batch_id)
+        if batch is None:
+            batch = await _load_completed_batch(batch_id)
+        snapshot = batch.model_dump()
+        seq = None
+
+    async def remote_event_stream():
+        """다른 워커가 처리 중인 배치: 작업 저장소를 주기적으로 조회하여 변경분 전송"""
+        last = snapshot
+        while last["status"] not in TERMINAL_STATUSES:
+            await asyncio.sleep(BATCH_EVENTS_REMOTE_POLL_SECONDS)
+            if await request.is_disconnected():
+                return
+
+            batch = await asyncio.to_thread(batch_status_store.get, batch_id)
+            if batch is None:
+                return
+            current = batch.model_dump()
+
+            previous_statuses = {fs["filename"]: fs for fs in last["file_statuses"]}
+            for file_status in current["file_statuses"]:
+                if previous_statuses.get(file_status["filename"]) != file_status:
+                    yield _format_sse(EVENT_FILE_STATUS, file_status)
+            for result in current["results"][len(last["results"]):]:
+                yield _format_sse(
+                    EVENT_RESULT,
+                    {
+                        "result": result,
+                        "processed_files": current["processed_files"],
+                        "total_files": current["total_files"],
+                        "progress_percent": current["progress_percent"],
+                        "elapsed_seconds": current["elapsed_seconds"],
+                        "estimated_completion": current["estimated_completion"],
+                    },
+                )
+            if current["status"] in TERMINAL_STATUSES:
+                yield _format_sse(
+                    EVENT_STATUS,
+                    {
+                        "status": current["status"],
+                        "processed_files": current["processed_files"],
+                        "progress_percent": current["progress_percent"],
+                        "errors": current["errors"],
+                    },
+                )
+            last = current
+
+    async def event_stream():
+        nonlocal seq
+
+        if snapshot is not None:
+            yield _format_sse("snapshot", snapshot, seq)
+        if snapshot and snapshot["status"] in TERMINAL_STATUSES:
+            return
+        if seq is None:
+            async for message in remote_event_stream():
+                yield message
+            return
+
+        while True:
+            if await request.is_disconnected():
+                return
+
+            # 메모리에서 정리된 배치는 스트림 종료
+            if not batch_status_store.is_local(batch_id):
+                return
+            log = hub.log(batch_id)
+
+            events = await log.wait(seq, timeout=BATCH_EVENTS_KEEPALIVE_SECONDS)
+            if not events:
+                if log.closed:
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            for event in events:
+                yield _format_sse(event.type, event.data, event.seq)
+                seq = event.seq
+                if event.type == EVENT_STATUS and event.data["status"] in TERMINAL_STATUSES:
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -1414,6 +2508,8 @@ async def get_analysis_history(
     risk_level: Optional[str] = None,
     sort_by: str = "completed_at",
     sort_order: str = "desc",
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
     _: bool = Depends(verify_admin_api_key),
 ):
     """
@@ -1423,77 +2519,29 @@ async def get_analysis_history(
         page: 페이지 번호 (기본값: 1)
         page_size: 페이지당 항목 수 (기본값: 10, 최대: 100)
         risk_level: 위험도 필터 (SAFE, LOW, MEDIUM, HIGH, CRITICAL)
-        sort_by: 정렬 기준 (completed_at, filename, risk_level)
+        sort_by: 정렬 기준 (completed_at, filename, risk_level, judgment)
         sort_order: 정렬 방향 (asc, desc)
+        start_date: 시작 날짜 (ISO format: 2026-01-01)
+        end_date: 종료 날짜 (ISO format: 2026-01-08)
 
     Returns:
         dict: 분석 이력 목록 및 페이지네이션 정보
     """
-    batch_results_dir = Path("uploads/batch_results")
-
-    if not batch_results_dir.exists():
-        return {
-            "success": True,
-            "items": [],
-            "pagination": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": 0,
-                "total_pages": 0,
-            },
-        }
-
-    # 모든 배치 JSON 파일을 읽어 평탄화
-    all_items: List[Dict[str, Any]] = []
-
-    for json_file in batch_results_dir.glob("batch_*.json"):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                batch_data = json.load(f)
-                batch_id = batch_data.get("batch_id", "")
-                completed_at = batch_data.get("completed_at", "")
-
-                for result in batch_data.get("results", []):
-                    analysis = result.get("analysis_result") or {}
-                    item = {
-                        "batch_id": batch_id,
-                        "filename": result.get("filename", ""),
-                        "risk_level": analysis.get("risk_level", "N/A"),
-                        "judgment": analysis.get("judgment", ""),
-                        "violation_count": analysis.get("violation_count", 0),
-                        "total_score": analysis.get("total_score", 0),
-                        "completed_at": completed_at,
-                        "success": result.get("success", False),
-                        "error": result.get("error"),
-                    }
-                    all_items.append(item)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"[분석 이력] 파일 읽기 오류: {json_file} - {e}")
-            continue
-
-    # 필터링
-    if risk_level:
-        all_items = [item for item in all_items if item["risk_level"] == risk_level]
-
-    # 정렬
-    reverse = sort_order == "desc"
-    if sort_by == "completed_at":
-        all_items.sort(key=lambda x: x["completed_at"], reverse=reverse)
-    elif sort_by == "filename":
-        all_items.sort(key=lambda x: x["filename"], reverse=reverse)
-    elif sort_by == "risk_level":
-        risk_order = {"N/A": 0, "SAFE": 1, "LOW": 2, "MEDIUM": 3, "HIGH": 4, "CRITICAL": 5}
-        all_items.sort(key=lambda x: risk_order.get(x["risk_level"], 0), reverse=reverse)
-    elif sort_by == "judgment":
-        judgment_order = {"불필요": 0, "통과": 1, "주의": 2, "수정제안": 3, "수정권고": 4, "게재불가": 5}
-        all_items.sort(key=lambda x: judgment_order.get(x["judgment"], 0), reverse=reverse)
-
-    # 페이지네이션
-    total_items = len(all_items)
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 100)
+
+    # 분석 이력 DB에서 필터/정렬/페이지네이션 쿼리
+    paginated_items, total_items = await asyncio.to_thread(
+        get_history_store().query_history,
+        page,
+        page_size,
+        risk_level,
+        sort_by,
+        sort_order,
+        start_date,
+        end_date,
+    )
     total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 0
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_items = all_items[start_idx:end_idx]
 
     return {
         "success": True,
@@ -1528,13 +2576,6 @@ async def delete_analysis_history(
     """
     batch_results_dir = Path("uploads/batch_results")
 
-    if not batch_results_dir.exists():
-        return {
-            "success": False,
-            "message": "배치 결과 폴더가 없습니다.",
-            "deleted_count": 0,
-        }
-
     # 삭제할 항목을 batch_id로 그룹화
     items_by_batch: Dict[str, List[str]] = {}
     for item in request.items:
@@ -1545,14 +2586,17 @@ async def delete_analysis_history(
                 items_by_batch[batch_id] = []
             items_by_batch[batch_id].append(filename)
 
-    deleted_count = 0
+    # 분석 이력 DB에서 삭제
+    deleted_count = await asyncio.to_thread(
+        get_history_store().delete_items, items_by_batch
+    )
     errors = []
 
+    # 배치 결과 JSON 파일에도 반영 (배치 상세 조회용)
     for batch_id, filenames_to_delete in items_by_batch.items():
         json_file = batch_results_dir / f"{batch_id}.json"
 
         if not json_file.exists():
-            errors.append(f"배치 파일을 찾을 수 없습니다: {batch_id}")
             continue
 
         try:
@@ -1561,13 +2605,11 @@ async def delete_analysis_history(
                 batch_data = json.load(f)
 
             # 삭제할 파일명들 제외
-            original_count = len(batch_data.get("results", []))
             batch_data["results"] = [
                 r for r in batch_data.get("results", [])
                 if r.get("filename") not in filenames_to_delete
             ]
             new_count = len(batch_data["results"])
-            deleted_count += (original_count - new_count)
 
             # 결과가 비어있으면 파일 삭제, 아니면 업데이트
             if new_count == 0:
@@ -1591,11 +2633,69 @@ async def delete_analysis_history(
     }
 
 
+# ============================================================
+# 관리자 API - 캐시
+# ============================================================
+
+
+@app.get("/api/admin/cache-stats")
+async def get_cache_stats(_: bool = Depends(verify_admin_api_key)):
+    """
+    결과 캐시 적중/실패 및 OpenAI 프롬프트 캐시(cached_tokens) 통계 조회 (관리자 인증 필요)
+
+    Returns:
+        dict: 캐시별 통계, 프롬프트 종류별 입력/캐시 적중 토큰
+    """
+    caches = {}
+
+    ocr_cache = get_ocr_cache()
+    if ocr_cache is not None:
+        caches["ocr"] = await asyncio.to_thread(ocr_cache.stats)
+
+    llm_cache = get_llm_cache()
+    if llm_cache is not None:
+        caches["llm"] = await asyncio.to_thread(llm_cache.stats)
+
+    embedding_cache = get_embedding_cache()
+    if embedding_cache is not None:
+        caches["embedding"] = await asyncio.to_thread(embedding_cache.stats)
+
+    return {
+        "success": True,
+        "caches": caches,
+        "prompt_cache": get_prompt_usage_stats().stats(),
+    }
+
+
 # ============================================================
 # 관리자 API - 통계
 # ============================================================
 
 
+@app.get("/api/admin/batch-queue")
+async def get_batch_queue_stats(_: bool = Depends(verify_admin_api_key)):
+    """
+    배치 대기열/워커 지표 조회 (관리자 인증 필요)
+
+    Returns:
+        dict: 대기열 깊이, 가장 오래된 대기 시간, 워커별 스케줄러 지표, 외부 API 호출 한도/서킷 상태
+    """
+    job_store = batch_status_store.job_store
+    queue = await asyncio.to_thread(job_store.queue_stats)
+    workers = await asyncio.to_thread(
+        job_store.list_worker_metrics, JOB_HEARTBEAT_SECONDS * 3
+    )
+
+    return {
+        "success": True,
+        "mode": BATCH_EXECUTION,
+        "queue": queue,
+        "workers": workers,
+        "rate_limits": provider_limit_stats(),
+        "circuits": circuit_stats(),
+    }
+
+
 @app.get("/api/admin/statistics")
 async def get_statistics(
     start_date: Optional[str] = None,
@@ -1612,8 +2712,6 @@ async def get_statistics(
     Returns:
         dict: 통계 데이터
     """
-    batch_results_dir = Path("uploads/batch_results")
-
     # 기본 응답 구조
     empty_response = {
         "success": True,
@@ -1631,89 +2729,43 @@ async def get_statistics(
         "top_violation_keywords": [],
     }
 
-    if not batch_results_dir.exists():
-        return empty_response
-
-    # 날짜 필터 파싱
+    # 날짜 필터 검증 (잘못된 형식은 무시)
     filter_start = None
     filter_end = None
     if start_date:
         try:
-            filter_start = datetime.fromisoformat(start_date)
+            filter_start = datetime.fromisoformat(start_date).date().isoformat()
         except ValueError:
             pass
     if end_date:
         try:
-            filter_end = datetime.fromisoformat(end_date + "T23:59:59")
+            filter_end = datetime.fromisoformat(end_date).date().isoformat()
         except ValueError:
             pass
 
-    # 모든 배치 JSON 파일 읽기
-    all_items: List[Dict[str, Any]] = []
-    all_violations: List[Dict[str, Any]] = []
-
-    for json_file in batch_results_dir.glob("batch_*.json"):
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                batch_data = json.load(f)
-                completed_at_str = batch_data.get("completed_at", "")
-
-                # 날짜 필터 적용
-                if completed_at_str and (filter_start or filter_end):
-                    try:
-                        completed_at = datetime.fromisoformat(completed_at_str)
-                        if filter_start and completed_at < filter_start:
-                            continue
-                        if filter_end and completed_at > filter_end:
-                            continue
-                    except ValueError:
-                        pass
-
-                for result in batch_data.get("results", []):
-                    analysis = result.get("analysis_result") or {}
-                    item = {
-                        "risk_level": analysis.get("risk_level", "N/A"),
-                        "judgment": analysis.get("judgment", ""),
-                        "violation_count": analysis.get("violation_count", 0),
-                        "total_score": analysis.get("total_score", 0),
-                        "success": result.get("success", False),
-                    }
-                    all_items.append(item)
-
-                    # 위반 정보 수집
-                    for violation in analysis.get("violations", []):
-                        all_violations.append({
-                            "keyword": violation.get("keyword", ""),
-                            "category": violation.get("category", ""),
-                            "severity": violation.get("severity", "MEDIUM"),
-                            "count": violation.get("count", 1),
-                        })
-
-        except (json.JSONDecodeError, IOError):
-            continue
+    # 일별 집계 버킷 합산 (전체 이력 크기와 무관)
+    aggregates = await asyncio.to_thread(
+        get_history_store().get_statistics_aggregates, filter_start, filter_end
+    )
 
-    if not all_items:
+    total_analyses = aggregates["total"]
+    if total_analyses == 0:
         return empty_response
 
     # 요약 통계 계산
-    total_analyses = len(all_items)
-    successful_items = [item for item in all_items if item["success"]]
-    total_with_violations = sum(1 for item in all_items if item["violation_count"] > 0)
-    total_scores = [item["total_score"] for item in all_items if item["total_score"] >= 0]
+    total_with_violations = aggregates["with_violations"]
+    score_count = aggregates["score_count"]
 
     summary = {
         "total_analyses": total_analyses,
         "total_with_violations": total_with_violations,
         "violation_rate": round(total_with_violations / total_analyses * 100, 1) if total_analyses > 0 else 0.0,
-        "average_risk_score": round(sum(total_scores) / len(total_scores), 1) if total_scores else 0.0,
-        "success_rate": round(len(successful_items) / total_analyses * 100, 1) if total_analyses > 0 else 0.0,
+        "average_risk_score": round(aggregates["score_sum"] / score_count, 1) if score_count else 0.0,
+        "success_rate": round(aggregates["success_count"] / total_analyses * 100, 1) if total_analyses > 0 else 0.0,
     }
 
     # 위험도별 분포
-    risk_counts: Dict[str, int] = {}
-    for item in all_items:
-        level = item["risk_level"]
-        risk_counts[level] = risk_counts.get(level, 0) + 1
+    risk_counts: Dict[str, int] = aggregates["risk_counts"]
 
     risk_distribution = []
     risk_order = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "SAFE", "N/A"]
@@ -1727,11 +2779,7 @@ async def get_statistics(
             })
 
     # 판정별 분포
-    judgment_counts: Dict[str, int] = {}
-    for item in all_items:
-        judgment = item["judgment"]
-        if judgment:
-            judgment_counts[judgment] = judgment_counts.get(judgment, 0) + 1
+    judgment_counts: Dict[str, int] = aggregates["judgment_counts"]
 
     judgment_distribution = []
     judgment_order = ["게재불가", "수정권고", "수정제안", "주의", "통과", "불필요"]
@@ -1745,11 +2793,7 @@ async def get_statistics(
             })
 
     # 위반 카테고리 TOP 5
-    category_counts: Dict[str, int] = {}
-    for v in all_violations:
-        cat = v["category"]
-        if cat:
-            category_counts[cat] = category_counts.get(cat, 0) + v["count"]
+    category_counts: Dict[str, int] = aggregates["category_counts"]
 
     total_violations = sum(category_counts.values())
     top_categories = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -1762,21 +2806,8 @@ async def get_statistics(
         for cat, count in top_categories
     ]
 
-    # 위반 키워드 TOP 10
-    keyword_data: Dict[str, Dict[str, Any]] = {}
-    for v in all_violations:
-        kw = v["keyword"]
-        if kw:
-            if kw not in keyword_data:
-                keyword_data[kw] = {
-                    "keyword": kw,
-                    "category": v["category"],
-                    "severity": v["severity"],
-                    "count": 0,
-                }
-            keyword_data[kw]["count"] += v["count"]
-
-    top_keywords = sorted(keyword_data.values(), key=lambda x: x["count"], reverse=True)[:10]
+    # 위반 키워드 TOP 10 (건수 내림차순 정렬되어 반환됨)
+    top_keywords = aggregates["keywords"][:10]
 
     # 실제 기간 계산
     actual_start = start_date or ""
@@ -3,7 +3,9 @@
 의료법 제56조 및 관련 조항 기반
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from keyword_matcher import KeywordAutomaton
 
 
 class MedicalKeywordDB:
@@ -305,6 +307,15 @@ class MedicalKeywordDB:
             ),
         }
 
+        # 키워드 검색 오토마톤 (최초 사용 시 컴파일)
+        self._matcher: Optional[KeywordAutomaton] = None
+
+    def get_matcher(self) -> KeywordAutomaton:
+        """전체 키워드로 컴파일된 Aho-Corasick 오토마톤 반환"""
+        if self._matcher is None:
+            self._matcher = KeywordAutomaton(self.keywords.keys())
+        return self._matcher
+
     def get_all_keywords(self) -> List[str]:
         """모든 키워드 목록 반환"""
         return list(self.keywords.keys())
@@ -0,0 +1,265 @@
+"""
+OCR 서비스 모듈
+Naver Clova OCR(공유 비동기 HTTP 클라이언트, 호출 한도/재시도/서킷 브레이커 적용)과
+PaddleOCR(프로세스 풀)을 같은 결과 형식으로 제공하고, 이미지 해시 기준 결과 캐시를 적용
+
+API 서버, 배치 워커, CLI(integrated_analyzer)가 모두 이 모듈을 통해 OCR을 수행
+"""
+
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+import asyncio
+import json
+import logging
+import os
+
+import httpx
+from dotenv import load_dotenv
+
+from paddle_ocr import perform_paddle_ocr
+from provider_limits import PROVIDER_NAVER_OCR, get_provider_limiter
+from resilience import (
+    RETRYABLE_STATUS_CODES,
+    CircuitOpenError,
+    ProviderHTTPError,
+    call_with_retry,
+    parse_retry_after,
+)
+from result_cache import get_ocr_cache, hash_file
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class OCREngine(str, Enum):
+    """OCR 엔진 선택"""
+
+    NAVER = "naver"
+    PADDLE = "paddle"
+
+
+# Naver OCR API 설정
+NAVER_OCR_API_URL = os.getenv("NAVER_OCR_API_URL")
+NAVER_OCR_SECRET_KEY = os.getenv("NAVER_OCR_SECRET_KEY")
+
+# Naver OCR HTTP 커넥션 풀 설정
+NAVER_OCR_TIMEOUT = float(os.getenv("NAVER_OCR_TIMEOUT", "30"))
+NAVER_OCR_MAX_CONNECTIONS = int(os.getenv("NAVER_OCR_MAX_CONNECTIONS", "20"))
+NAVER_OCR_MAX_KEEPALIVE = int(os.getenv("NAVER_OCR_MAX_KEEPALIVE", "10"))
+NAVER_OCR_KEEPALIVE_EXPIRY = float(os.getenv("NAVER_OCR_KEEPALIVE_EXPIRY", "30"))
+
+# 프로세스 공유 HTTP 클라이언트 (keep-alive 커넥션 재사용)
+_naver_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 지원 패키지(h2) 설치 여부"""
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def get_naver_http_client() -> httpx.AsyncClient:
+    """
+    Naver OCR 호출용 공유 AsyncClient 반환
+    startup 훅에서 생성되며, 없으면 (테스트/스크립트 호출 등) 즉시 생성
+    """
+    global _naver_http_client
+
+    if _naver_http_client is None or _naver_http_client.is_closed:
+        _naver_http_client = httpx.AsyncClient(
+            timeout=NAVER_OCR_TIMEOUT,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=NAVER_OCR_MAX_CONNECTIONS,
+                max_keepalive_connections=NAVER_OCR_MAX_KEEPALIVE,
+                keepalive_expiry=NAVER_OCR_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    return _naver_http_client
+
+
+async def close_naver_http_client():
+    """공유 AsyncClient 종료 (앱 종료 시 호출)"""
+    global _naver_http_client
+
+    if _naver_http_client is not None:
+        await _naver_http_client.aclose()
+        _naver_http_client = None
+
+
+async def perform_naver_ocr(image_path: Path) -> dict:
+    """
+    Naver Clova OCR API를 사용하여 이미지에서 텍스트 추출 (비동기)
+
+    Args:
+        image_path: 이미지 파일 경로
+
+    Returns:
+        dict: OCR 결과
+    """
+    # API URL 검증
+    if not NAVER_OCR_API_URL:
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": "NAVER_OCR_API_URL 환경변수가 설정되지 않았습니다.",
+        }
+
+    try:
+        # 이미지 파일 읽기 (이벤트 루프 블로킹 방지)
+        image_data = await asyncio.to_thread(image_path.read_bytes)
+
+        # 파일 확장자 확인
+        file_ext = image_path.suffix.lower()
+        image_format = "jpg" if file_ext in [".jpg", ".jpeg"] else "png"
+
+        # 요청 본문 구성
+        request_json = {
+            "images": [{"format": image_format, "name": "medical_ad_image"}],
+            "requestId": f"ocr-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "version": "V2",
+            "timestamp": 0,
+        }
+
+        # 헤더 설정
+        headers = {"X-OCR-SECRET": NAVER_OCR_SECRET_KEY or ""}
+
+        # Naver OCR API 형식에 맞춘 multipart/form-data 구성
+        # message 필드는 filename 없이, file 필드는 filename과 함께 전송
+        files = [
+            ("message", (None, json.dumps(request_json), "application/json")),
+            ("file", (image_path.name, image_data, f"image/{image_format}")),
+        ]
+
+        # 비동기 HTTP 요청 (공유 커넥션 풀 사용, 전체 배치 공통 호출 한도 내에서 실행)
+        async def request() -> httpx.Response:
+            await get_provider_limiter(PROVIDER_NAVER_OCR).acquire()
+            client = get_naver_http_client()
+            response = await client.post(NAVER_OCR_API_URL, headers=headers, files=files)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                raise ProviderHTTPError(
+                    response.status_code,
+                    f"OCR API 오류: HTTP {response.status_code} - {response.text[:200]}",
+                    parse_retry_after(response.headers),
+                )
+            return response
+
+        # 429/5xx/타임아웃은 백오프 후 재시도, 연속 실패 시 서킷을 열어 즉시 실패
+        response = await call_with_retry(PROVIDER_NAVER_OCR, request)
+
+        if response.status_code == 200:
+            result = response.json()
+
+            # 추출된 텍스트 및 신뢰도 계산
+            extracted_text = ""
+            total_confidence = 0.0
+            fields_count = 0
+
+            if "images" in result and len(result["images"]) > 0:
+                fields = result["images"][0].get("fields", [])
+                fields_count = len(fields)
+
+                for field in fields:
+                    text = field.get("inferText", "")
+                    confidence = field.get("inferConfidence", 0.0)
+                    extracted_text += text + " "
+                    total_confidence += confidence
+
+                # 평균 신뢰도 계산
+                avg_confidence = (
+                    total_confidence / fields_count if fields_count > 0 else 0.0
+                )
+            else:
+                avg_confidence = 0.0
+
+            return {
+                "success": True,
+                "text": extracted_text.strip(),
+                "confidence": round(avg_confidence, 2),
+                "fields_count": fields_count,
+                "error": None,
+            }
+        else:
+            return {
+                "success": False,
+                "text": None,
+                "confidence": None,
+                "fields_count": None,
+                "error": f"OCR API 오류: HTTP {response.status_code} - {response.text[:200]}",
+            }
+
+    except httpx.TimeoutException:
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": "OCR API 요청 시간 초과",
+        }
+
+    except (ProviderHTTPError, CircuitOpenError) as e:
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": str(e),
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": f"OCR 처리 중 오류: {str(e)}",
+        }
+
+
+async def perform_ocr(image_path: Path, engine: OCREngine = OCREngine.NAVER) -> dict:
+    """
+    OCR 엔진 선택에 따라 적절한 OCR 수행
+
+    Args:
+        image_path: 이미지 파일 경로
+        engine: OCR 엔진 선택 (naver 또는 paddle)
+
+    Returns:
+        dict: OCR 결과 (두 엔진 모두 동일한 형식)
+    """
+    # 이미지 내용 해시 + 엔진 기준 캐시 조회 (동일 광고 재제출 시 OCR 생략)
+    cache = get_ocr_cache()
+    cache_key = None
+    if cache is not None:
+        try:
+            image_hash = await asyncio.to_thread(hash_file, image_path)
+            cache_key = f"{engine.value}:{image_hash}"
+            cached = await cache.aget(cache_key)
+            if cached is not None:
+                return dict(cached)
+        except Exception as e:
+            logger.warning(f"OCR 캐시 조회 실패: {e}")
+
+    if engine == OCREngine.PADDLE:
+        result = await perform_paddle_ocr(image_path)
+    else:
+        result = await perform_naver_ocr(image_path)
+
+    # 성공한 결과만 캐시
+    if cache is not None and cache_key and result.get("success"):
+        try:
+            await cache.aset(cache_key, dict(result))
+        except Exception as e:
+            logger.warning(f"OCR 캐시 저장 실패: {e}")
+
+    return result
@@ -1,9 +1,17 @@
 """
 PaddleOCR 모듈 - 한국어 OCR 지원
 PaddleOCR의 korean 모델 사용 (PP-OCRv5)
+
+OCR 추론은 CPU-bound 동기 호출이므로 전용 프로세스 풀에서 실행합니다.
+각 워커 프로세스는 자신의 PaddleOCR 인스턴스를 미리 로드해 재사용합니다.
 """
 
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import asyncio
+import multiprocessing
 import os
 
 # PaddleOCR/PaddleX 관련 환경변수 설정 (import 전에 설정)
@@ -11,12 +19,18 @@ os.environ["PADDLE_SILENCE"] = "1"
 os.environ["FLAGS_use_mkldnn"] = "0"
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
 
+# 워커 프로세스 수 (기본값: CPU 코어 수, 최대 4 - 워커당 모델 메모리 고려)
+PADDLE_OCR_WORKERS = int(
+    os.getenv("PADDLE_OCR_WORKERS", str(min(os.cpu_count() or 1, 4)))
+)
+
 _paddle_ocr_instance = None
+_paddle_executor: Optional[ProcessPoolExecutor] = None
 
 
 def get_paddle_ocr_instance():
     """
-    PaddleOCR 인스턴스를 싱글톤으로 관리
+    PaddleOCR 인스턴스를 싱글톤으로 관리 (워커 프로세스별 1개)
     PP-OCRv4 모델 사용, 한국어 지원
     """
     global _paddle_ocr_instance
@@ -35,9 +49,61 @@ def get_paddle_ocr_instance():
     return _paddle_ocr_instance
 
 
+def _init_paddle_worker():
+    """워커 프로세스 시작 시 PaddleOCR 모델 미리 로드"""
+    try:
+        get_paddle_ocr_instance()
+    except Exception:
+        # 초기화 실패 시 요청 처리 시점에 재시도하고 오류를 결과로 반환
+        pass
+
+
+def _worker_ready() -> int:
+    """워커 프로세스 준비 확인용 (프로세스 ID 반환)"""
+    return os.getpid()
+
+
+def get_paddle_executor() -> ProcessPoolExecutor:
+    """PaddleOCR 전용 프로세스 풀 반환 (최초 호출 시 생성)"""
+    global _paddle_executor
+
+    if _paddle_executor is None:
+        # fork 시 부모의 스레드/모델 상태가 복제되지 않도록 spawn 사용
+        _paddle_executor = ProcessPoolExecutor(
+            max_workers=max(1, PADDLE_OCR_WORKERS),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_paddle_worker,
+        )
+        print(f"[PaddleOCR] 프로세스 풀 생성 (workers={PADDLE_OCR_WORKERS})")
+
+    return _paddle_executor
+
+
+async def warmup_paddle_pool():
+    """모든 워커 프로세스를 미리 띄워 모델 로드 (첫 요청 지연 방지)"""
+    loop = asyncio.get_running_loop()
+    executor = get_paddle_executor()
+    await asyncio.gather(
+        *[
+            loop.run_in_executor(executor, _worker_ready)
+            for _ in range(max(1, PADDLE_OCR_WORKERS))
+        ]
+    )
+
+
+def shutdown_paddle_pool():
+    """프로세스 풀 종료 (앱 종료 시 호출)"""
+    global _paddle_executor
+
+    if _paddle_executor is not None:
+        _paddle_executor.shutdown(wait=False, cancel_futures=True)
+        _paddle_executor = None
+
+
 async def perform_paddle_ocr(image_path: Path) -> dict:
     """
     PaddleOCR을 사용하여 이미지에서 텍스트 추출
+    (프로세스 풀에서 실행되어 이벤트 루프를 블로킹하지 않음)
 
     Args:
         image_path: 이미지 파일 경로
@@ -51,11 +117,53 @@ async def perform_paddle_ocr(image_path: Path) -> dict:
             "error": str | None
         }
     """
+    global _paddle_executor
+
+    loop = asyncio.get_running_loop()
+    executor = get_paddle_executor()
+
+    try:
+        return await loop.run_in_executor(executor, _run_paddle_ocr, str(image_path))
+
+    except BrokenProcessPool as e:
+        # 워커 비정상 종료 (메모리 부족 등) - 깨진 풀을 정리하고 다음 요청에서 재생성
+        # (동시 요청이 이미 새 풀을 만들었으면 그 풀은 유지)
+        if _paddle_executor is executor:
+            _paddle_executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": f"PaddleOCR 처리 중 오류: 워커 프로세스 종료 ({str(e)})",
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "text": None,
+            "confidence": None,
+            "fields_count": None,
+            "error": f"PaddleOCR 처리 중 오류: {str(e)}",
+        }
+
+
+def _run_paddle_ocr(image_path: str) -> dict:
+    """
+    워커 프로세스에서 실행되는 동기 OCR 처리
+
+    Args:
+        image_path: 이미지 파일 경로
+
+    Returns:
+        dict: perform_paddle_ocr와 동일한 형식
+    """
     try:
         ocr = get_paddle_ocr_instance()
 
         # OCR 수행
-        result = ocr.ocr(str(image_path))
+        result = ocr.ocr(image_path)
 
         if result is None or len(result) == 0 or result[0] is None:
             return {
@@ -0,0 +1,209 @@
+"""
+LLM 프롬프트 구성 모듈
+제공자 측 프롬프트 캐싱(동일 접두부 재사용)이 적용되도록
+역할/출력 형식/채점 기준/주요 법규 등 고정 내용은 instructions(접두부)에 두고,
+요청마다 달라지는 RAG 검색 결과/키워드 결과/광고 텍스트는 입력 끝에 배치
+
+프롬프트 캐시는 접두부가 1024토큰 이상일 때만 적용되므로 1차 분석/구조화 출력에만 캐시 키를 지정
+2차 판정 접두부(추출 지시 + 형식 + 채점 기준)는 그보다 짧고, 법규 등을 덧붙여 기준을 넘기면
+할인된 캐시 토큰 비용이 지금의 비캐시 접두부 비용보다 커지므로 캐시 키 없이 호출
+
+프롬프트 내용을 바꾸면 해당 *_PROMPT_VERSION을 올려 결과 캐시를 무효화
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+import threading
+
+# 프롬프트 버전 (결과 캐시 키에 포함)
+ANALYSIS_PROMPT_VERSION = "analysis-v2"
+JUDGMENT_PROMPT_VERSION = "judgment-v2"
+STRUCTURED_PROMPT_VERSION = "structured-v2"
+
+# 자주 인용되는 법규 요약 (고정 접두부에 포함)
+STATUTE_FILE = Path(__file__).parent / "data" / "medical_law_56.txt"
+
+
+def _load_statute_block() -> str:
+    try:
+        return STATUTE_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        return ""
+
+
+STATUTE_BLOCK = _load_statute_block()
+
+ROLE = "당신은 대한민국 의료법 전문가입니다. 의료 광고의 의료법 위반 여부를 판단하고, 제공된 법규 조항을 정확히 인용하여 분석합니다."
+
+MEDICAL_AD_CRITERIA = """## 의료광고 여부 판단
+- 의료기관, 의료행위, 의료기기, 의약품 등 의료 관련 내용이 포함되어야 의료광고입니다.
+- 의료 관련 문구가 없으면 의료광고가 아닙니다."""
+
+SCORING_RUBRIC = """## 위험점수 산정 기준
+- -1점: 의료광고 아님 (불필요)
+- 0-10점: 위반 없음, 안전 (통과)
+- 11-30점: 경미한 위반, 주의 필요 (주의)
+- 31-60점: 중간 수준 위반, 수정 필요 (수정제안)
+- 61-80점: 심각한 위반, 반드시 수정 (수정권고)
+- 81-100점: 매우 심각한 위반, 게재 불가 (게재불가)
+
+※ 위험도와 판정은 위험점수 기반으로 시스템이 자동 계산합니다."""
+
+ANALYSIS_FORMAT = """## 분석 결과 형식
+광고의 위반 여부를 판정하고, 각 판정에 대해 정확한 법규 조항을 인용하여 다음 형식으로 작성하세요:
+
+**위반 사항:**
+- 발견된 위반 내용을 구체적으로 나열
+
+**법적 근거:**
+- 해당하는 의료법 조항 명시 (주요 법규 및 검색된 관련 법규 활용)
+
+**권고 사항:**
+- 광고 수정 방안 제시
+
+**전체 평가:**
+- 위험도 (안전/낮음/보통/높음/매우높음)
+- 종합 의견"""
+
+JUDGMENT_FORMAT = """## 응답 형식
+AI 분석 결과를 바탕으로 먼저 의료광고인지 판단하고, 의료광고이면 위험점수(0-100점)를, 아니면 -1을 산정하세요.
+반드시 다음 JSON 형식으로만 응답하세요:
+
+```json
+{
+  "is_medical_ad": true|false,
+  "risk_score": -1 또는 0-100,
+  "violations": [
+    {"type": "위반유형", "description": "설명", "severity": "HIGH|MEDIUM|LOW"}
+  ],
+  "summary": "한 줄 요약"
+}
+```"""
+
+STRUCTURED_FORMAT = """## 응답 필드
+- analysis: 다음 형식의 상세 분석 (마크다운)
+  **위반 사항:** / **법적 근거:** (의료법 조항 명시) / **권고 사항:** / **전체 평가:**
+- is_medical_ad: 의료광고 여부
+- risk_score: 의료광고가 아니면 -1, 의료광고면 위험점수 산정 기준의 0-100점
+- violations: 발견된 위반 사항 목록 (유형, 설명, 심각도 HIGH|MEDIUM|LOW)
+- summary: 한 줄 요약"""
+
+
+def _join(*sections: str) -> str:
+    return "\n\n".join(section for section in sections if section)
+
+
+def _statute_section() -> str:
+    return f"## 주요 법규\n{STATUTE_BLOCK}" if STATUTE_BLOCK else ""
+
+
+# 고정 접두부 (모든 요청에서 동일)
+ANALYSIS_INSTRUCTIONS = _join(ROLE, ANALYSIS_FORMAT, SCORING_RUBRIC, _statute_section())
+JUDGMENT_INSTRUCTIONS = _join(
+    "의료광고 AI 분석 결과에서 위험점수와 위반사항을 추출합니다. JSON 형식으로만 응답하세요. 다른 텍스트 없이 JSON만 출력합니다.",
+    MEDICAL_AD_CRITERIA,
+    JUDGMENT_FORMAT,
+    SCORING_RUBRIC,
+)
+STRUCTURED_INSTRUCTIONS = _join(
+    ROLE, MEDICAL_AD_CRITERIA, STRUCTURED_FORMAT, SCORING_RUBRIC, _statute_section()
+)
+
+# 프롬프트 종류별 캐시 라우팅 키 (같은 접두부 요청이 같은 캐시를 쓰도록)
+ANALYSIS_CACHE_KEY = f"mee-ad-rev:{ANALYSIS_PROMPT_VERSION}"
+STRUCTURED_CACHE_KEY = f"mee-ad-rev:{STRUCTURED_PROMPT_VERSION}"
+
+
+def build_analysis_input(text: str, rag_context: str = "", keyword_context: str = "") -> str:
+    """
+    1차 분석 입력 (가변 내용만, 광고 텍스트는 마지막)
+
+    Args:
+        text: 분석 대상 광고 텍스트
+        rag_context: 검색된 관련 법규 (없으면 빈 문자열)
+        keyword_context: 키워드 분석 결과 요약 (없으면 빈 문자열)
+    """
+    return _join(
+        f"## 검색된 관련 법규\n{rag_context.strip()}" if rag_context.strip() else "",
+        keyword_context.strip(),
+        f"## 분석 대상 광고 텍스트\n{text}",
+    )
+
+
+def build_judgment_input(
+    ai_analysis_text: str, keyword_count: int, keyword_risk_score: int
+) -> str:
+    """2차 판정 입력 (키워드 결과 → AI 분석 결과 순)"""
+    return _join(
+        f"## 키워드 분석 결과\n- 발견된 위반 키워드: {keyword_count}건\n- 키워드 위험점수: {keyword_risk_score}점",
+        f"## AI 분석 결과\n{ai_analysis_text}",
+    )
+
+
+# ============================================
+# 프롬프트 캐시 사용량 기록
+# ============================================
+
+
+def usage_from_response(response: Any) -> Dict[str, int]:
+    """
+    Responses 응답(SDK 객체 또는 Batch 출력의 JSON dict)에서 토큰 사용량 추출
+
+    Returns:
+        {"input_tokens", "cached_tokens", "output_tokens"} (없으면 0)
+    """
+    usage = response.get("usage") if isinstance(response, dict) else getattr(response, "usage", None)
+    if usage is None:
+        return {"input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+
+    def field(obj: Any, name: str) -> Any:
+        return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+    details = field(usage, "input_tokens_details")
+    return {
+        "input_tokens": int(field(usage, "input_tokens") or 0),
+        "cached_tokens": int((field(details, "cached_tokens") if details is not None else 0) or 0),
+        "output_tokens": int(field(usage, "output_tokens") or 0),
+    }
+
+
+class PromptUsageStats:
+    """프롬프트 종류별 입력/캐시 적중 토큰 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, kind: str, response: Any):
+        usage = usage_from_response(response)
+        with self._lock:
+            stats = self._stats.setdefault(
+                kind, {"requests": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0}
+            )
+            stats["requests"] += 1
+            for key, value in usage.items():
+                stats[key] += value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                kind: {
+                    **stats,
+                    "cached_ratio": round(stats["cached_tokens"] / stats["input_tokens"], 3)
+                    if stats["input_tokens"]
+                    else 0.0,
+                }
+                for kind, stats in self._stats.items()
+            }
+
+
+# 싱글톤 인스턴스
+_prompt_usage_stats: Optional[PromptUsageStats] = None
+
+
+def get_prompt_usage_stats() -> PromptUsageStats:
+    """프롬프트 캐시 사용량 통계 싱글톤"""
+    global _prompt_usage_stats
+    if _prompt_usage_stats is None:
+        _prompt_usage_stats = PromptUsageStats()
+    return _prompt_usage_stats
@@ -0,0 +1,417 @@
+"""
+외부 API 호출 속도 제한 (프로세스/클러스터 공통)
+Naver OCR, OpenAI Responses, OpenAI Embeddings 호출을 제공자별 토큰 버킷으로 제한
+
+- 요청 수(RPS)와 토큰 수(TPM) 버킷을 함께 사용
+- 한도를 넘으면 실패 대신 예약 순서대로 대기 (버킷을 음수까지 예약)
+- RATE_LIMIT_BACKEND=sqlite/redis 설정 시 여러 프로세스/서버가 같은 버킷을 공유
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Optional, Tuple
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+
+# 버킷 저장 방식: local (프로세스별), sqlite (같은 호스트의 프로세스 공유), redis (클러스터 공유)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "local").lower()
+RATE_LIMIT_STORE_PATH = Path(
+    os.getenv(
+        "RATE_LIMIT_STORE_PATH",
+        str(Path(__file__).parent / "uploads" / "rate_limits.sqlite3"),
+    )
+)
+RATE_LIMIT_REDIS_URL = os.getenv(
+    "RATE_LIMIT_REDIS_URL", os.getenv("JOB_STORE_REDIS_URL", "redis://localhost:6379/0")
+)
+RATE_LIMIT_REDIS_PREFIX = os.getenv("RATE_LIMIT_REDIS_PREFIX", "mee-ad-rev:ratelimit")
+
+# 제공자별 한도 (0이면 제한 없음)
+NAVER_OCR_RPS = float(os.getenv("NAVER_OCR_RPS", "5"))
+OPENAI_RESPONSES_RPS = float(os.getenv("OPENAI_RESPONSES_RPS", "8"))
+OPENAI_RESPONSES_TPM = float(os.getenv("OPENAI_RESPONSES_TPM", "200000"))
+OPENAI_EMBEDDINGS_RPS = float(os.getenv("OPENAI_EMBEDDINGS_RPS", "20"))
+OPENAI_EMBEDDINGS_TPM = float(os.getenv("OPENAI_EMBEDDINGS_TPM", "1000000"))
+
+# 제공자 이름
+PROVIDER_NAVER_OCR = "naver_ocr"
+PROVIDER_OPENAI_RESPONSES = "openai_responses"
+PROVIDER_OPENAI_EMBEDDINGS = "openai_embeddings"
+
+# 대기 시간 통계에 사용할 최근 표본 수
+WAIT_SAMPLE_SIZE = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    입력 텍스트 토큰 수 추정 (사전 예약용)
+    한글은 대략 글자당 1토큰 이상이므로 글자 수를 그대로 사용 (실제 사용량으로 정산)
+    """
+    return len(text or "") + 1
+
+
+class BucketStore:
+    """토큰 버킷 상태 저장소 인터페이스"""
+
+    def reserve(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        """
+        버킷에서 cost만큼 예약하고 대기해야 할 시간(초) 반환
+
+        Args:
+            key: 버킷 이름
+            cost: 차감할 양
+            rate: 초당 충전량
+            capacity: 최대 보유량 (버스트 한도)
+        """
+        raise NotImplementedError
+
+    def refund(self, key: str, amount: float, rate: float, capacity: float):
+        """예약한 양 되돌리기 (음수면 추가 차감)"""
+        raise NotImplementedError
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate: float, capacity: float) -> float:
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class LocalBucketStore(BucketStore):
+    """프로세스 메모리 버킷 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def reserve(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.time()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, rate, capacity) - cost
+            self._buckets[key] = (tokens, now)
+        return max(0.0, -tokens / rate)
+
+    def refund(self, key: str, amount: float, rate: float, capacity: float):
+        with self._lock:
+            now = time.time()
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, rate, capacity)
+            self._buckets[key] = (min(capacity, tokens + amount), now)
+
+
+class SQLiteBucketStore(BucketStore):
+    """SQLite 공유 버킷 (같은 호스트의 uvicorn 워커/배치 워커 프로세스 간 공유)"""
+
+    def __init__(self, db_path: Path = RATE_LIMIT_STORE_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), check_same_thread=False, timeout=10, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_buckets (
+                name TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    def _update(self, key: str, delta: float, rate: float, capacity: float, clamp: bool) -> float:
+        with self._lock:
+            # 읽기-수정-쓰기를 다른 프로세스와 직렬화
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (key,)
+                ).fetchone()
+                tokens, updated_at = row if row else (capacity, now)
+                tokens = _refill(tokens, updated_at, now, rate, capacity) + delta
+                if clamp:
+                    tokens = min(capacity, tokens)
+                self._conn.execute(
+                    """
+                    INSERT INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)
+                    ON CONFLICT(name) DO UPDATE SET
+                        tokens = excluded.tokens, updated_at = excluded.updated_at
+                    """,
+                    (key, tokens, now),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return tokens
+
+    def reserve(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        tokens = self._update(key, -cost, rate, capacity, clamp=False)
+        return max(0.0, -tokens / rate)
+
+    def refund(self, key: str, amount: float, rate: float, capacity: float):
+        self._update(key, amount, rate, capacity, clamp=True)
+
+
+# 충전 + 증감을 원자적으로 처리하는 스크립트 (KEYS[1]: 버킷, ARGV: delta, rate, capacity, clamp)
+_REDIS_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local delta = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate) + delta
+if ARGV[4] == '1' then tokens = math.min(capacity, tokens) end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(tokens)
+"""
+
+
+class RedisBucketStore(BucketStore):
+    """Redis 공유 버킷 (여러 서버 간 공유, redis 패키지 필요)"""
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL, prefix: str = RATE_LIMIT_REDIS_PREFIX):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis 사용 시 redis 패키지가 필요합니다: pip install redis"
+            ) from e
+
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._script = self._redis.register_script(_REDIS_BUCKET_SCRIPT)
+        self.prefix = prefix
+
+    def _update(self, key: str, delta: float, rate: float, capacity: float, clamp: bool) -> float:
+        result = self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[delta, rate, capacity, "1" if clamp else "0"],
+        )
+        return float(result)
+
+    def reserve(self, key: str, cost: float, rate: float, capacity: float) -> float:
+        tokens = self._update(key, -cost, rate, capacity, clamp=False)
+        return max(0.0, -tokens / rate)
+
+    def refund(self, key: str, amount: float, rate: float, capacity: float):
+        self._update(key, amount, rate, capacity, clamp=True)
+
+
+class ProviderLimiter:
+    """
+    외부 API 제공자 1개의 호출 속도 제한
+
+    - 요청 버킷: 초당 rps회 충전, 최대 1초분 버스트
+    - 토큰 버킷: 분당 tpm 토큰 충전 (tpm=0이면 사용 안 함)
+    """
+
+    def __init__(self, name: str, rps: float, tpm: float = 0, store: Optional[BucketStore] = None):
+        self.name = name
+        self.rps = rps
+        self.tpm = tpm
+        self.store = store or LocalBucketStore()
+
+        # 통계
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._tokens = 0
+        self._throttled = 0
+        self._wait_samples: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rps > 0 or self.tpm > 0
+
+    def _buckets(self, requests: int, tokens: int):
+        """(버킷 이름, 차감량, 초당 충전량, 최대 보유량) 목록"""
+        buckets = []
+        if self.rps > 0:
+            capacity = max(1.0, self.rps)
+            buckets.append((f"{self.name}:requests", min(requests, capacity), self.rps, capacity))
+        if self.tpm > 0 and tokens > 0:
+            # 한도보다 큰 요청은 한도만큼만 예약 (무한 대기 방지)
+            buckets.append((f"{self.name}:tokens", min(tokens, self.tpm), self.tpm / 60, self.tpm))
+        return buckets
+
+    def _reserve(self, requests: int, tokens: int) -> float:
+        wait = 0.0
+        for key, cost, rate, capacity in self._buckets(requests, tokens):
+            wait = max(wait, self.store.reserve(key, cost, rate, capacity))
+        return wait
+
+    def _cancel(self, requests: int, tokens: int):
+        for key, cost, rate, capacity in self._buckets(requests, tokens):
+            self.store.refund(key, cost, rate, capacity)
+
+    def _record(self, tokens: int, wait: float):
+        with self._lock:
+            self._requests += 1
+            self._tokens += tokens
+            if wait > 0:
+                self._throttled += 1
+            self._wait_samples.append(wait)
+
+    async def acquire(self, tokens: int = 0, requests: int = 1) -> float:
+        """
+        호출 전 한도 예약 (한도 초과 시 차례가 올 때까지 대기)
+
+        Args:
+            tokens: 예상 토큰 수 (TPM 버킷 차감량)
+            requests: 요청 수 (RPS 버킷 차감량)
+
+        Returns:
+            float: 대기한 시간 (초)
+        """
+        if not self.enabled:
+            return 0.0
+
+        if isinstance(self.store, LocalBucketStore):
+            wait = self._reserve(requests, tokens)
+        else:
+            wait = await asyncio.to_thread(self._reserve, requests, tokens)
+
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # 호출하지 않은 예약은 반납 (공유 저장소는 이벤트 루프 밖에서)
+                if isinstance(self.store, LocalBucketStore):
+                    self._cancel(requests, tokens)
+                else:
+                    asyncio.get_running_loop().run_in_executor(None, self._cancel, requests, tokens)
+                raise
+        self._record(tokens, wait)
+        return wait
+
+    def acquire_sync(self, tokens: int = 0, requests: int = 1) -> float:
+        """동기 호출용 acquire (스레드 풀에서 실행되는 코드용)"""
+        if not self.enabled:
+            return 0.0
+
+        wait = self._reserve(requests, tokens)
+        if wait > 0:
+            time.sleep(wait)
+        self._record(tokens, wait)
+        return wait
+
+    async def settle(self, estimated: int, actual: Optional[int]):
+        """
+        실제 사용 토큰으로 예약량 정산 (남으면 반납, 모자라면 추가 차감)
+        공유 저장소(sqlite/redis)는 acquire와 마찬가지로 이벤트 루프 밖에서 처리
+
+        Args:
+            estimated: acquire 시 예약한 토큰 수
+            actual: 응답의 실제 사용 토큰 수 (모르면 None)
+        """
+        if isinstance(self.store, LocalBucketStore):
+            self.settle_sync(estimated, actual)
+        else:
+            await asyncio.to_thread(self.settle_sync, estimated, actual)
+
+    def settle_sync(self, estimated: int, actual: Optional[int]):
+        """동기 호출용 settle (스레드 풀에서 실행되는 코드용)"""
+        if self.tpm <= 0 or actual is None:
+            return
+        estimated = min(estimated, self.tpm)
+        if actual == estimated:
+            return
+        self.store.refund(f"{self.name}:tokens", estimated - actual, self.tpm / 60, self.tpm)
+        with self._lock:
+            self._tokens += actual - estimated
+
+    def stats(self) -> Dict[str, Any]:
+        """요청 수, 대기 발생 횟수, 대기 시간 통계"""
+        with self._lock:
+            samples = sorted(self._wait_samples)
+            requests, tokens, throttled = self._requests, self._tokens, self._throttled
+        return {
+            "rps": self.rps,
+            "tpm": self.tpm,
+            "requests": requests,
+            "tokens": tokens,
+            "throttled": throttled,
+            "wait_avg_ms": round(sum(samples) / len(samples) * 1000, 1) if samples else 0.0,
+            "wait_p95_ms": round(
+                samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1
+            )
+            if samples
+            else 0.0,
+            "wait_max_ms": round(samples[-1] * 1000, 1) if samples else 0.0,
+        }
+
+
+def response_total_tokens(response: Any) -> Optional[int]:
+    """OpenAI 응답의 usage.total_tokens (없으면 None)"""
+    usage = getattr(response, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return int(total) if total is not None else None
+
+
+def embedding_requests(count: int, chunk_size: int = 1000) -> int:
+    """임베딩 텍스트 수에 해당하는 API 요청 수 (langchain 기본 chunk_size 기준)"""
+    return max(1, math.ceil(count / chunk_size))
+
+
+# 싱글톤 인스턴스
+_limiters: Optional[Dict[str, ProviderLimiter]] = None
+_limiters_lock = threading.Lock()
+
+
+def _create_bucket_store() -> BucketStore:
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketStore()
+    if RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketStore()
+    return LocalBucketStore()
+
+
+def get_provider_limiters() -> Dict[str, ProviderLimiter]:
+    """제공자별 속도 제한기 싱글톤 반환"""
+    global _limiters
+    if _limiters is None:
+        with _limiters_lock:
+            if _limiters is None:
+                store = _create_bucket_store()
+                # 프로세스별 버킷이면 배치 워커 프로세스 수만큼 한도를 나눠 사용
+                share = 1
+                if isinstance(store, LocalBucketStore):
+                    share = max(1, int(os.getenv("BATCH_SCHEDULER_SHARE", "1")))
+                _limiters = {
+                    PROVIDER_NAVER_OCR: ProviderLimiter(
+                        PROVIDER_NAVER_OCR, NAVER_OCR_RPS / share, store=store
+                    ),
+                    PROVIDER_OPENAI_RESPONSES: ProviderLimiter(
+                        PROVIDER_OPENAI_RESPONSES,
+                        OPENAI_RESPONSES_RPS / share,
+                        OPENAI_RESPONSES_TPM / share,
+                        store=store,
+                    ),
+                    PROVIDER_OPENAI_EMBEDDINGS: ProviderLimiter(
+                        PROVIDER_OPENAI_EMBEDDINGS,
+                        OPENAI_EMBEDDINGS_RPS / share,
+                        OPENAI_EMBEDDINGS_TPM / share,
+                        store=store,
+                    ),
+                }
+                print(f"[RateLimit] 외부 API 속도 제한 초기화 ({RATE_LIMIT_BACKEND})")
+    return _limiters
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """제공자 이름으로 속도 제한기 반환"""
+    return get_provider_limiters()[provider]
+
+
+def provider_limit_stats() -> Dict[str, Any]:
+    """제공자별 속도 제한 통계"""
+    return {name: limiter.stats() for name, limiter in get_provider_limiters().items()}
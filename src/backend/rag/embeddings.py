@@ -0,0 +1,234 @@
+"""
+임베딩 백엔드 모듈
+EMBEDDING_BACKEND 설정에 따라 OpenAI 임베딩 API 또는 CPU 로컬 다국어 임베딩 모델을 사용
+
+- openai (기본): text-embedding-3-small, 호출 한도/재시도 적용
+- local: fastembed(ONNX Runtime, 양자화 모델) 기반 다국어 문장 임베딩, 네트워크/과금 없이 일괄 추론
+  (fastembed 패키지 필요: pip install fastembed)
+
+Chroma 컬렉션은 임베딩 모델별로 분리 (collection_name_for)하여 모델을 바꿔도 기존 인덱스와 섞이지 않음
+"""
+
+from typing import Callable, List, Optional
+import hashlib
+import os
+import re
+import threading
+
+from langchain_core.embeddings import Embeddings
+
+from provider_limits import (
+    PROVIDER_OPENAI_EMBEDDINGS,
+    embedding_requests,
+    estimate_tokens,
+    get_provider_limiter,
+)
+from resilience import call_with_retry_sync
+from result_cache import get_embedding_cache, make_cache_key
+
+# 임베딩 백엔드
+EMBEDDING_BACKEND_OPENAI = "openai"
+EMBEDDING_BACKEND_LOCAL = "local"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", EMBEDDING_BACKEND_OPENAI).lower()
+
+# OpenAI 임베딩 모델
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# 로컬 임베딩 모델 (fastembed 지원 모델, 한국어 포함 다국어)
+LOCAL_EMBEDDING_MODEL = os.getenv(
+    "LOCAL_EMBEDDING_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+LOCAL_EMBEDDING_BATCH_SIZE = int(os.getenv("LOCAL_EMBEDDING_BATCH_SIZE", "32"))
+LOCAL_EMBEDDING_THREADS = int(os.getenv("LOCAL_EMBEDDING_THREADS", "0"))  # 0이면 onnxruntime 기본값
+LOCAL_EMBEDDING_CACHE_DIR = os.getenv("LOCAL_EMBEDDING_CACHE_DIR")  # 모델 파일 저장 위치
+
+# 기본 컬렉션 이름과, 모델별 분리 이전부터 사용하던 컬렉션 (기존 인덱스 유지)
+COLLECTION_BASE_NAME = "medical_laws"
+LEGACY_COLLECTIONS = {f"{EMBEDDING_BACKEND_OPENAI}:{EMBEDDING_MODEL}": COLLECTION_BASE_NAME}
+
+
+def collection_name_for(model_id: str, base: str = COLLECTION_BASE_NAME) -> str:
+    """
+    임베딩 모델별 Chroma 컬렉션 이름 (Chroma 규칙: 3-63자, 영숫자/._-)
+
+    Args:
+        model_id: "백엔드:모델" 형식의 임베딩 모델 식별자
+        base: 컬렉션 이름 접두사
+    """
+    if base == COLLECTION_BASE_NAME and model_id in LEGACY_COLLECTIONS:
+        return LEGACY_COLLECTIONS[model_id]
+    slug = re.sub(r"[^a-z0-9]+", "-", model_id.rsplit("/", 1)[-1].lower()).strip("-")
+    digest = hashlib.sha1(model_id.encode("utf-8")).hexdigest()[:8]
+    return f"{base}_{slug[:32].strip('-')}_{digest}"
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    fastembed 기반 CPU 로컬 임베딩 (ONNX Runtime, 양자화 모델 일괄 추론)
+    모델은 첫 사용 시 로드하며, 벡터는 L2 정규화하여 반환 (내적 = 코사인 유사도)
+    """
+
+    def __init__(
+        self,
+        model_name: str = LOCAL_EMBEDDING_MODEL,
+        batch_size: int = LOCAL_EMBEDDING_BATCH_SIZE,
+        threads: int = LOCAL_EMBEDDING_THREADS,
+        cache_dir: Optional[str] = LOCAL_EMBEDDING_CACHE_DIR,
+    ):
+        self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.threads = threads or None
+        self.cache_dir = cache_dir
+        self._model = None
+        self._lock = threading.Lock()
+
+        # e5 계열은 쿼리/문서 접두어를 붙여야 검색 품질이 유지됨
+        is_e5 = "e5" in model_name.lower()
+        self.query_prefix = "query: " if is_e5 else ""
+        self.passage_prefix = "passage: " if is_e5 else ""
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                try:
+                    from fastembed import TextEmbedding
+                except ImportError as e:
+                    raise RuntimeError(
+                        "EMBEDDING_BACKEND=local 사용 시 fastembed 패키지가 필요합니다: pip install fastembed"
+                    ) from e
+
+                print(f"[RAG] 로컬 임베딩 모델 로드: {self.model_name}")
+                self._model = TextEmbedding(
+                    model_name=self.model_name, threads=self.threads, cache_dir=self.cache_dir
+                )
+        return self._model
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        if not texts:
+            return []
+        vectors = np.asarray(
+            list(self._get_model().embed(texts, batch_size=self.batch_size)), dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-12)
+        return vectors.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed([self.passage_prefix + text for text in texts])
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([self.query_prefix + text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return self._embed([self.query_prefix + text for text in texts])
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    쿼리 임베딩 캐시 래퍼
+    동일한 광고 텍스트의 재임베딩을 막고, 여러 쿼리를 한 번의 호출(일괄 추론)로 임베딩
+    """
+
+    def __init__(self, base: Embeddings, model_name: str, provider: Optional[str] = None):
+        """
+        Args:
+            base: 실제 임베딩 구현
+            model_name: 캐시 키/컬렉션 구분용 모델 식별자
+            provider: 외부 API 제공자 이름 (지정 시 호출 한도/재시도 적용, 로컬 모델은 None)
+        """
+        self.base = base
+        self.model_name = model_name
+        self.provider = provider
+
+    def _cache_key(self, text: str) -> str:
+        return make_cache_key("embedding", self.model_name, text)
+
+    def _call(self, texts: List[str], embed: Callable[[List[str]], List[List[float]]]):
+        """임베딩 호출 (외부 API는 호출 한도 내에서 실행, 일시적 오류는 재시도)"""
+        if self.provider is None:
+            return embed(texts)
+
+        limiter = get_provider_limiter(self.provider)
+
+        def request():
+            limiter.acquire_sync(
+                sum(estimate_tokens(text) for text in texts),
+                requests=embedding_requests(len(texts)),
+            )
+            return embed(texts)
+
+        return call_with_retry_sync(self.provider, request)
+
+    def _embed_queries_uncached(self, texts: List[str]) -> List[List[float]]:
+        embed_queries = getattr(self.base, "embed_queries", None)
+        return self._call(texts, embed_queries or self.base.embed_documents)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (인덱싱용, 캐시하지 않음)"""
+        return self._call(texts, self.base.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        """단일 쿼리 임베딩 (캐시 사용)"""
+        return self.embed_queries([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        여러 쿼리 일괄 임베딩
+        캐시에 없는 고유 텍스트만 모아 한 번의 임베딩 호출로 처리
+
+        Args:
+            texts: 쿼리 텍스트 리스트
+
+        Returns:
+            입력 순서와 동일한 임베딩 벡터 리스트
+        """
+        cache = get_embedding_cache()
+        vectors = {}
+
+        if cache is not None:
+            for text in set(texts):
+                cached = cache.get(self._cache_key(text))
+                if cached is not None:
+                    vectors[text] = cached
+
+        missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            embedded = self._embed_queries_uncached(missing)
+            for text, vector in zip(missing, embedded):
+                vectors[text] = vector
+                if cache is not None:
+                    cache.set(self._cache_key(text), vector)
+
+        return [vectors[text] for text in texts]
+
+
+def create_embeddings(backend: Optional[str] = None) -> CachedQueryEmbeddings:
+    """
+    설정된 백엔드의 임베딩 생성 (쿼리 캐시 적용)
+
+    Args:
+        backend: openai 또는 local (None이면 EMBEDDING_BACKEND 설정)
+
+    Returns:
+        CachedQueryEmbeddings (model_name은 "백엔드:모델" 형식)
+    """
+    backend = (backend or EMBEDDING_BACKEND).lower()
+
+    if backend == EMBEDDING_BACKEND_LOCAL:
+        return CachedQueryEmbeddings(
+            LocalEmbeddings(), f"{EMBEDDING_BACKEND_LOCAL}:{LOCAL_EMBEDDING_MODEL}"
+        )
+
+    if backend != EMBEDDING_BACKEND_OPENAI:
+        raise ValueError(f"지원하지 않는 EMBEDDING_BACKEND: {backend}")
+
+    from langchain_openai import OpenAIEmbeddings
+
+    # 재시도는 래퍼에서 처리
+    return CachedQueryEmbeddings(
+        OpenAIEmbeddings(model=EMBEDDING_MODEL, max_retries=0),
+        f"{EMBEDDING_BACKEND_OPENAI}:{EMBEDDING_MODEL}",
+        provider=PROVIDER_OPENAI_EMBEDDINGS,
+    )
@@ -0,0 +1,249 @@
+"""
+NumPy 전수 검색 벡터 저장소
+법규 코퍼스(data/)는 수백 청크 규모이므로 Chroma(SQLite + HNSW) 대신
+전체 청크 임베딩을 하나의 연속 float32 행렬(.npy, 메모리 매핑)로 두고 정확한 top-k 검색
+
+- 검색: 쿼리 행렬 x 문서 행렬 내적 1회 + argpartition (여러 쿼리도 행렬 곱 1회)
+- 벡터는 L2 정규화하여 저장하므로 내적 = 코사인 유사도
+- 거리는 Chroma 기본값(제곱 L2)과 같은 2 * (1 - 코사인 유사도)로 반환 (백엔드 간 점수 호환)
+- 저장 위치: {persist_directory}/{컬렉션 이름}/embeddings.npy, documents.json
+
+VECTOR_STORE_BACKEND=numpy 설정 시 get_vector_store()가 이 저장소를 사용
+"""
+
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+import threading
+
+import numpy as np
+from langchain_core.documents import Document
+
+from .embeddings import CachedQueryEmbeddings, collection_name_for, create_embeddings
+from .vector_store import MedicalLawVectorStore
+
+
+def _normalize(vectors) -> np.ndarray:
+    """(N, D) float32 행렬로 변환 후 행별 L2 정규화"""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.maximum(norms, 1e-12)
+    return matrix
+
+
+class NumpyVectorStore(MedicalLawVectorStore):
+    """메모리 매핑 float32 행렬 기반 의료법 벡터 저장소 (정확한 코사인 top-k)"""
+
+    MATRIX_FILE = "embeddings.npy"
+    DOCUMENTS_FILE = "documents.json"
+
+    def __init__(
+        self,
+        persist_directory: str = None,
+        collection_name: str = None,
+        embeddings: Optional[CachedQueryEmbeddings] = None,
+    ):
+        # 기본 경로: backend/vector_index (절대 경로)
+        if persist_directory is None:
+            persist_directory = str(Path(__file__).parent.parent / "vector_index")
+        self.persist_directory = persist_directory
+
+        self.embeddings = embeddings or create_embeddings()
+        self.collection_name = collection_name or collection_name_for(
+            self.embeddings.model_name
+        )
+
+        self.index_dir = Path(persist_directory) / self.collection_name
+        self.matrix_path = self.index_dir / self.MATRIX_FILE
+        self.documents_path = self.index_dir / self.DOCUMENTS_FILE
+
+        # 검색은 (행렬, 문서) 스냅샷을 읽고, 쓰기는 파일 교체 후 다시 매핑
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # (N, D) float32, 읽기 전용 memmap
+        self._documents: List[Document] = []
+
+        print(f"[RAG] 임베딩: {self.embeddings.model_name} (NumPy 인덱스: {self.index_dir})")
+        self._load()
+
+    def _load(self):
+        """저장된 행렬을 메모리 매핑하고 문서 목록을 읽음 (행 수가 맞지 않으면 빈 인덱스)"""
+        self._matrix = None
+        self._documents = []
+        if not (self.matrix_path.exists() and self.documents_path.exists()):
+            return
+
+        with open(self.documents_path, "r", encoding="utf-8") as f:
+            documents = [
+                Document(page_content=item["page_content"], metadata=item["metadata"])
+                for item in json.load(f)
+            ]
+        matrix = np.load(self.matrix_path, mmap_mode="r")
+
+        if matrix.ndim != 2 or matrix.shape[0] != len(documents):
+            print(f"[RAG] 경고: NumPy 인덱스 손상 (행렬 {matrix.shape}, 문서 {len(documents)}개) - 재인덱싱 필요")
+            return
+
+        self._matrix = matrix
+        self._documents = documents
+
+    def _save(self, matrix: np.ndarray, documents: List[Document]):
+        """행렬/문서를 임시 파일에 쓴 뒤 교체하고 다시 매핑 (호출 측에서 _lock 보유)"""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        matrix_tmp = self.index_dir / f"{self.MATRIX_FILE}.tmp"
+        documents_tmp = self.index_dir / f"{self.DOCUMENTS_FILE}.tmp"
+        with open(matrix_tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        with open(documents_tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                [{"page_content": d.page_content, "metadata": d.metadata} for d in documents],
+                f,
+                ensure_ascii=False,
+            )
+
+        # 기존 매핑을 해제해야 Windows에서도 파일 교체 가능
+        self._matrix = None
+        os.replace(matrix_tmp, self.matrix_path)
+        os.replace(documents_tmp, self.documents_path)
+        self._load()
+
+    def load_and_index_documents(self, file_path: str) -> int:
+        """
+        법규 문서를 로드하고 NumPy 인덱스에 추가
+        지원 형식: .txt, .pdf
+
+        Args:
+            file_path: 법규 문서 파일 경로
+
+        Returns:
+            인덱싱된 청크 수
+        """
+        documents = self.split_document(file_path)
+        if not documents:
+            return 0
+
+        vectors = _normalize(self.embeddings.embed_documents([d.page_content for d in documents]))
+
+        with self._lock:
+            if self._matrix is not None and len(self._documents) > 0:
+                matrix = np.concatenate([self._matrix, vectors])
+            else:
+                matrix = vectors
+            self._save(matrix, self._documents + documents)
+
+        return len(documents)
+
+    def search(self, query: str, top_k: int = 3) -> List[Document]:
+        """
+        쿼리와 유사한 법규 조항 검색
+
+        Args:
+            query: 검색 쿼리 (광고 텍스트)
+            top_k: 반환할 결과 수
+
+        Returns:
+            관련 법규 문서 리스트
+        """
+        return [doc for doc, _ in self.search_with_score(query, top_k=top_k)]
+
+    def search_with_score(self, query: str, top_k: int = 3) -> List[tuple]:
+        """
+        거리와 함께 검색
+
+        Args:
+            query: 검색 쿼리
+            top_k: 반환할 결과 수
+
+        Returns:
+            (Document, 거리) 튜플 리스트 (거리 = 제곱 L2 = 2 * (1 - 코사인 유사도))
+        """
+        return self.search_by_vectors_with_score([self.embeddings.embed_query(query)], top_k)[0]
+
+    def search_by_vectors_with_score(
+        self, vectors: List[List[float]], top_k: int = 3
+    ) -> List[List[tuple]]:
+        """
+        쿼리 벡터들을 행렬 곱 1회로 검색 (쿼리별 argpartition 후 상위 k개만 정렬)
+
+        Args:
+            vectors: 쿼리 임베딩 벡터 리스트
+            top_k: 벡터별 반환할 결과 수
+
+        Returns:
+            벡터 순서와 동일한 (Document, 거리) 튜플 리스트의 리스트
+        """
+        if len(vectors) == 0:
+            return []
+
+        with self._lock:
+            matrix, documents = self._matrix, self._documents
+
+        k = min(top_k, len(documents))
+        if matrix is None or k <= 0:
+            return [[] for _ in vectors]
+
+        scores = _normalize(vectors) @ matrix.T  # (쿼리 수, 문서 수) 코사인 유사도
+        if k < len(documents):
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(len(documents)), scores.shape)
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            # 정규화 벡터의 제곱 L2 거리 (Chroma 기본 거리와 동일한 척도)
+            [(documents[index], float(2.0 * (1.0 - score))) for index, score in zip(row, row_scores)]
+            for row, row_scores in zip(top.tolist(), top_scores.tolist())
+        ]
+
+    def get_collection_count(self) -> int:
+        """인덱스에 저장된 문서 수 반환"""
+        return len(self._documents)
+
+    def clear(self):
+        """인덱스 초기화"""
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        """인덱스 파일 삭제 (호출 측에서 _lock 보유)"""
+        self._matrix = None
+        self._documents = []
+        for path in (self.matrix_path, self.documents_path):
+            if path.exists():
+                path.unlink()
+
+    def remove_documents_by_source(self, source_path: str) -> int:
+        """
+        특정 소스 파일의 문서들을 인덱스에서 제거
+
+        Args:
+            source_path: 제거할 문서의 소스 경로
+
+        Returns:
+            제거된 문서 수
+        """
+        try:
+            with self._lock:
+                keep = [
+                    i
+                    for i, doc in enumerate(self._documents)
+                    if doc.metadata.get("source") != source_path
+                ]
+                count = len(self._documents) - len(keep)
+                if count == 0:
+                    return 0
+
+                if keep:
+                    self._save(self._matrix[keep], [self._documents[i] for i in keep])
+                else:
+                    self._reset()
+
+            print(f"[RAG] 문서 제거: {source_path} ({count} chunks)")
+            return count
+        except Exception as e:
+            print(f"[RAG] 문서 제거 실패: {e}")
+            return 0
@@ -25,7 +25,27 @@ class MedicalLawRetriever:
             관련 법규 조항 리스트
         """
         results = self.vector_store.search_with_score(ad_text, top_k=top_k)
+        return self._to_laws(results)
 
+    def retrieve_relevant_laws_batch(
+        self, ad_texts: List[str], top_k: int = 5
+    ) -> List[List[Dict]]:
+        """
+        여러 광고 텍스트의 관련 법규 일괄 검색 (임베딩 1회 호출)
+
+        Args:
+            ad_texts: 광고 텍스트 리스트
+            top_k: 텍스트별 검색할 조항 수
+
+        Returns:
+            텍스트 순서와 동일한 관련 법규 조항 리스트의 리스트
+        """
+        results = self.vector_store.batch_search_with_score(ad_texts, top_k=top_k)
+        return [self._to_laws(r) for r in results]
+
+    @staticmethod
+    def _to_laws(results: List[tuple]) -> List[Dict]:
+        """(Document, score) 검색 결과를 법규 조항 딕셔너리로 변환"""
         relevant_laws = []
         for doc, score in results:
             relevant_laws.append(
@@ -51,7 +71,25 @@ class MedicalLawRetriever:
             법규 컨텍스트 문자열
         """
         laws = self.retrieve_relevant_laws(ad_text, top_k=top_k)
+        return self._format_context(laws)
+
+    def build_rag_context_batch(self, ad_texts: List[str], top_k: int = 5) -> List[str]:
+        """
+        여러 광고 텍스트의 RAG 컨텍스트 일괄 생성
+
+        Args:
+            ad_texts: 광고 텍스트 리스트
+            top_k: 텍스트별 검색할 조항 수
+
+        Returns:
+            텍스트 순서와 동일한 법규 컨텍스트 문자열 리스트
+        """
+        laws_list = self.retrieve_relevant_laws_batch(ad_texts, top_k=top_k)
+        return [self._format_context(laws) for laws in laws_list]
 
+    @staticmethod
+    def _format_context(laws: List[Dict]) -> str:
+        """법규 조항 리스트를 프롬프트용 컨텍스트 문자열로 변환"""
         if not laws:
             return ""
 
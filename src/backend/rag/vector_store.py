@@ -6,16 +6,23 @@ Chroma PersistentClient를 사용하여 의료법 문서를 임베딩하고 저
 
 from pathlib import Path
 from typing import List, Optional
+import os
 
 from dotenv import load_dotenv
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pypdf import PdfReader
 
+from .embeddings import CachedQueryEmbeddings, collection_name_for, create_embeddings
+
 load_dotenv()
 
+# 벡터 저장소 백엔드: chroma (기본, PersistentClient) 또는 numpy (메모리 매핑 행렬 전수 검색)
+VECTOR_STORE_BACKEND_CHROMA = "chroma"
+VECTOR_STORE_BACKEND_NUMPY = "numpy"
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", VECTOR_STORE_BACKEND_CHROMA).lower()
+
 
 class MedicalLawVectorStore:
     """의료법 문서를 위한 벡터 저장소"""
@@ -23,20 +30,26 @@ class MedicalLawVectorStore:
     def __init__(
         self,
         persist_directory: str = None,
-        collection_name: str = "medical_laws",
+        collection_name: str = None,
+        embeddings: Optional[CachedQueryEmbeddings] = None,
     ):
         # 기본 경로: backend/chroma_db (절대 경로)
         if persist_directory is None:
             persist_directory = str(Path(__file__).parent.parent / "chroma_db")
         self.persist_directory = persist_directory
-        self.collection_name = collection_name
 
-        # OpenAI 임베딩 모델
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+        # 임베딩 백엔드 (EMBEDDING_BACKEND 설정, 쿼리 임베딩 캐시 적용)
+        self.embeddings = embeddings or create_embeddings()
+
+        # 임베딩 모델별 컬렉션 (모델을 바꾸면 새 컬렉션에 다시 인덱싱)
+        self.collection_name = collection_name or collection_name_for(
+            self.embeddings.model_name
+        )
 
         # Chroma 벡터 스토어
+        print(f"[RAG] 임베딩: {self.embeddings.model_name} (컬렉션: {self.collection_name})")
         self.vectorstore = Chroma(
-            collection_name=collection_name,
+            collection_name=self.collection_name,
             embedding_function=self.embeddings,
             persist_directory=persist_directory,
         )
@@ -56,16 +69,16 @@ class MedicalLawVectorStore:
         with open(file_path, "r", encoding="utf-8") as f:
             return f.read()
 
-    def load_and_index_documents(self, file_path: str) -> int:
+    def split_document(self, file_path: str) -> List[Document]:
         """
-        법규 문서를 로드하고 벡터 DB에 인덱싱
+        법규 문서를 읽어 청크 단위 Document로 분할
         지원 형식: .txt, .pdf
 
         Args:
             file_path: 법규 문서 파일 경로
 
         Returns:
-            인덱싱된 청크 수
+            청크 Document 리스트 (빈 파일이면 빈 리스트)
         """
         file_path = Path(file_path)
         ext = file_path.suffix.lower()
@@ -80,7 +93,7 @@ class MedicalLawVectorStore:
 
         if not content.strip():
             print(f"[RAG] 경고: 빈 파일 - {file_path.name}")
-            return 0
+            return []
 
         # 텍스트 분할 (섹션 단위로)
         text_splitter = RecursiveCharacterTextSplitter(
@@ -109,6 +122,23 @@ class MedicalLawVectorStore:
             )
             documents.append(doc)
 
+        return documents
+
+    def load_and_index_documents(self, file_path: str) -> int:
+        """
+        법규 문서를 로드하고 벡터 DB에 인덱싱
+        지원 형식: .txt, .pdf
+
+        Args:
+            file_path: 법규 문서 파일 경로
+
+        Returns:
+            인덱싱된 청크 수
+        """
+        documents = self.split_document(file_path)
+        if not documents:
+            return 0
+
         # 벡터 스토어에 추가
         self.vectorstore.add_documents(documents)
 
@@ -142,6 +172,44 @@ class MedicalLawVectorStore:
         results = self.vectorstore.similarity_search_with_score(query=query, k=top_k)
         return results
 
+    def batch_search_with_score(
+        self, queries: List[str], top_k: int = 3
+    ) -> List[List[tuple]]:
+        """
+        여러 쿼리를 한 번에 임베딩한 뒤 벡터별로 검색
+
+        Args:
+            queries: 검색 쿼리 리스트
+            top_k: 쿼리별 반환할 결과 수
+
+        Returns:
+            쿼리 순서와 동일한 (Document, score) 튜플 리스트의 리스트
+        """
+        if not queries:
+            return []
+
+        return self.search_by_vectors_with_score(self.embeddings.embed_queries(queries), top_k)
+
+    def search_by_vectors_with_score(
+        self, vectors: List[List[float]], top_k: int = 3
+    ) -> List[List[tuple]]:
+        """
+        임베딩된 쿼리 벡터들로 검색 (임베딩 호출 없음)
+
+        Args:
+            vectors: 쿼리 임베딩 벡터 리스트
+            top_k: 벡터별 반환할 결과 수
+
+        Returns:
+            벡터 순서와 동일한 (Document, 거리) 튜플 리스트의 리스트
+        """
+        return [
+            self.vectorstore.similarity_search_by_vector_with_relevance_scores(
+                embedding=vector, k=top_k
+            )
+            for vector in vectors
+        ]
+
     def get_collection_count(self) -> int:
         """벡터 DB에 저장된 문서 수 반환"""
         return self.vectorstore._collection.count()
@@ -185,11 +253,32 @@ class MedicalLawVectorStore:
 _vector_store_instance: Optional[MedicalLawVectorStore] = None
 
 
+def create_vector_store(backend: Optional[str] = None, **kwargs) -> MedicalLawVectorStore:
+    """
+    설정된 백엔드의 벡터 스토어 생성
+
+    Args:
+        backend: chroma 또는 numpy (None이면 VECTOR_STORE_BACKEND 설정)
+        **kwargs: 백엔드 생성자 인자 (persist_directory, collection_name, embeddings)
+    """
+    backend = (backend or VECTOR_STORE_BACKEND).lower()
+
+    if backend == VECTOR_STORE_BACKEND_NUMPY:
+        from .numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore(**kwargs)
+
+    if backend != VECTOR_STORE_BACKEND_CHROMA:
+        raise ValueError(f"지원하지 않는 VECTOR_STORE_BACKEND: {backend}")
+
+    return MedicalLawVectorStore(**kwargs)
+
+
 def get_vector_store() -> MedicalLawVectorStore:
     """벡터 스토어 싱글톤 인스턴스 반환"""
     global _vector_store_instance
     if _vector_store_instance is None:
-        _vector_store_instance = MedicalLawVectorStore()
+        _vector_store_instance = create_vector_store()
     return _vector_store_instance
 
 
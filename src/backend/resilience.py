@@ -0,0 +1,321 @@
+"""
+외부 API 호출 재시도 / 서킷 브레이커
+Naver OCR, OpenAI 호출의 일시적 오류(429, 5xx, 타임아웃)는 지터가 적용된 지수 백오프로
+제한된 횟수만 재시도하고, 제공자가 계속 실패하면 서킷을 열어 즉시 실패 처리
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+import asyncio
+import os
+import random
+import threading
+import time
+
+import httpx
+
+# 재시도 설정
+EXTERNAL_RETRY_MAX_ATTEMPTS = int(os.getenv("EXTERNAL_RETRY_MAX_ATTEMPTS", "3"))
+EXTERNAL_RETRY_BASE_DELAY = float(os.getenv("EXTERNAL_RETRY_BASE_DELAY", "0.5"))
+EXTERNAL_RETRY_MAX_DELAY = float(os.getenv("EXTERNAL_RETRY_MAX_DELAY", "20"))
+
+# 서킷 브레이커 설정
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 서킷 상태
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+class ProviderHTTPError(Exception):
+    """외부 API의 비정상 HTTP 응답"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 호출하지 않고 즉시 실패"""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} 서비스 일시 차단 중 ({retry_in:.0f}초 후 재시도)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Retry-After / retry-after-ms 헤더를 초 단위로 변환
+
+    Args:
+        headers: 응답 헤더 (httpx.Headers 등 get 지원 객체)
+
+    Returns:
+        대기 시간(초) 또는 None
+    """
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        from email.utils import parsedate_to_datetime
+
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    일시적 오류 여부 판단
+
+    Returns:
+        (재시도 가능 여부, Retry-After 초)
+    """
+    if isinstance(error, ProviderHTTPError):
+        return error.status_code in RETRYABLE_STATUS_CODES, error.retry_after
+
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return True, None
+
+    try:
+        import openai
+    except ImportError:
+        return False, None
+
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True, None
+    if isinstance(error, openai.APIStatusError):
+        response = getattr(error, "response", None)
+        retry_after = parse_retry_after(getattr(response, "headers", None))
+        return error.status_code in RETRYABLE_STATUS_CODES, retry_after
+
+    return False, None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    재시도 대기 시간 (full jitter 지수 백오프, Retry-After가 더 길면 그만큼 대기)
+
+    Args:
+        attempt: 실패한 시도 횟수 (1부터)
+        retry_after: 서버가 알려준 대기 시간
+    """
+    ceiling = min(EXTERNAL_RETRY_MAX_DELAY, EXTERNAL_RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class CircuitBreaker:
+    """
+    제공자별 서킷 브레이커 (스레드 안전)
+
+    - closed: 정상 호출, 연속 일시적 오류가 threshold에 도달하면 open
+    - open: reset_seconds 동안 호출 없이 즉시 실패
+    - half_open: 시험 호출 1건만 허용, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+
+        self._lock = threading.Lock()
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # 통계
+        self._rejected = 0
+        self._opened_count = 0
+        self._retries = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == CIRCUIT_OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._state = CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def before_call(self):
+        """호출 전 확인 (열려 있으면 CircuitOpenError)"""
+        with self._lock:
+            state = self._current_state()
+            if state == CIRCUIT_CLOSED:
+                return
+            if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._rejected += 1
+            retry_in = max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+        raise CircuitOpenError(self.name, retry_in)
+
+    def record_success(self):
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """일시적 오류 기록 (제공자 장애로 볼 수 있는 오류만)"""
+        with self._lock:
+            self._failures += 1
+            if self._state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != CIRCUIT_OPEN:
+                    self._opened_count += 1
+                    print(f"[Circuit] {self.name} 서킷 열림 ({self._failures}회 연속 실패)")
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def record_ignored(self):
+        """제공자 장애와 무관한 오류 (4xx 등) - 시험 호출 슬롯만 반납"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_retry(self):
+        with self._lock:
+            self._retries += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "opened": self._opened_count,
+                "rejected": self._rejected,
+                "retries": self._retries,
+            }
+
+
+async def call_with_retry(
+    provider: str,
+    func: Callable[[], Awaitable[T]],
+    max_attempts: int = EXTERNAL_RETRY_MAX_ATTEMPTS,
+) -> T:
+    """
+    외부 API 비동기 호출 (재시도 + 서킷 브레이커)
+
+    Args:
+        provider: 제공자 이름 (서킷 브레이커 단위)
+        func: 호출할 코루틴 함수 (시도마다 새로 호출)
+        max_attempts: 최대 시도 횟수
+
+    Returns:
+        func의 반환값 (마지막 오류는 그대로 raise)
+    """
+    breaker = get_circuit_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            breaker.record_ignored()
+            raise
+        except Exception as e:
+            retryable, retry_after = classify_error(e)
+            if not retryable:
+                breaker.record_ignored()
+                raise
+            breaker.record_failure()
+            if (
+                attempt >= max_attempts
+                or breaker.state == CIRCUIT_OPEN
+                or (retry_after is not None and retry_after > EXTERNAL_RETRY_MAX_DELAY)
+            ):
+                raise
+            delay = backoff_delay(attempt, retry_after)
+            breaker.record_retry()
+            print(f"[Retry] {provider} {attempt}회 실패, {delay:.1f}초 후 재시도: {e}")
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+def call_with_retry_sync(
+    provider: str,
+    func: Callable[[], T],
+    max_attempts: int = EXTERNAL_RETRY_MAX_ATTEMPTS,
+) -> T:
+    """외부 API 동기 호출 (스레드 풀에서 실행되는 코드용, call_with_retry와 동일 규칙)"""
+    breaker = get_circuit_breaker(provider)
+    attempt = 0
+    while True:
+        attempt += 1
+        breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            retryable, retry_after = classify_error(e)
+            if not retryable:
+                breaker.record_ignored()
+                raise
+            breaker.record_failure()
+            if (
+                attempt >= max_attempts
+                or breaker.state == CIRCUIT_OPEN
+                or (retry_after is not None and retry_after > EXTERNAL_RETRY_MAX_DELAY)
+            ):
+                raise
+            delay = backoff_delay(attempt, retry_after)
+            breaker.record_retry()
+            print(f"[Retry] {provider} {attempt}회 실패, {delay:.1f}초 후 재시도: {e}")
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
+
+
+# 싱글톤 인스턴스 (제공자 이름 → 서킷 브레이커)
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """제공자별 서킷 브레이커 반환 (없으면 생성)"""
+    breaker = _circuit_breakers.get(provider)
+    if breaker is None:
+        with _circuit_breakers_lock:
+            breaker = _circuit_breakers.setdefault(provider, CircuitBreaker(provider))
+    return breaker
+
+
+def circuit_stats() -> Dict[str, Any]:
+    """제공자별 서킷 상태/재시도 통계"""
+    return {name: breaker.stats() for name, breaker in list(_circuit_breakers.items())}
@@ -0,0 +1,331 @@
+"""
+결과 캐시 모듈
+메모리 LRU + SQLite 디스크 2단계 캐시 (OCR/LLM 결과 등 비싼 외부 호출 결과 재사용)
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# 캐시 파일 저장 폴더 (uploads/cache)
+CACHE_DIR = Path(__file__).parent / "uploads" / "cache"
+
+# OCR 캐시 설정
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "true").lower() == "true"
+OCR_CACHE_MEMORY_ENTRIES = int(os.getenv("OCR_CACHE_MEMORY_ENTRIES", "512"))
+OCR_CACHE_DISK_MAX_MB = float(os.getenv("OCR_CACHE_DISK_MAX_MB", "64"))
+
+# LLM 분석 결과 캐시 설정
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_MEMORY_ENTRIES = int(os.getenv("LLM_CACHE_MEMORY_ENTRIES", "256"))
+LLM_CACHE_DISK_MAX_MB = float(os.getenv("LLM_CACHE_DISK_MAX_MB", "128"))
+
+# RAG 쿼리 임베딩 캐시 설정
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", "512"))
+EMBEDDING_CACHE_DISK_MAX_MB = float(os.getenv("EMBEDDING_CACHE_DISK_MAX_MB", "64"))
+
+
+class ResultCache:
+    """메모리 LRU + SQLite 디스크 2단계 캐시 (JSON 직렬화 가능한 값 저장)"""
+
+    def __init__(
+        self,
+        name: str,
+        db_path: Path,
+        memory_max_entries: int = 256,
+        disk_max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            name: 캐시 이름 (통계 표시용)
+            db_path: SQLite 파일 경로
+            memory_max_entries: 메모리 캐시 최대 항목 수
+            disk_max_bytes: 디스크 캐시 최대 크기 (초과 시 오래 사용되지 않은 항목부터 삭제)
+            ttl_seconds: 항목 유효 기간 (None이면 만료 없음)
+        """
+        self.name = name
+        self.db_path = Path(db_path)
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # key → (저장 시각, 값)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계 카운터
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries(accessed_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries(created_at)"
+        )
+        self._conn.commit()
+
+    # ------------------------------------------------------------
+    # 메모리 계층
+    # ------------------------------------------------------------
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        if key in self._memory:
+            created_at, value = self._memory[key]
+            if self._is_expired(created_at):
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+        return None
+
+    def _memory_set(self, key: str, value: Any, created_at: Optional[float] = None):
+        self._memory[key] = (created_at or time.time(), value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------
+    # 디스크 계층
+    # ------------------------------------------------------------
+
+    def _disk_get(self, key: str) -> Optional[tuple]:
+        row = self._conn.execute(
+            "SELECT value, created_at, size FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        if self._is_expired(row[1]):
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._conn.commit()
+            self.expirations += 1
+            return None
+
+        self._conn.execute(
+            "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+            (time.time(), key),
+        )
+        self._conn.commit()
+        return row[1], json.loads(row[0])
+
+    def _disk_set(self, key: str, value: Any):
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO cache_entries (key, value, size, created_at, accessed_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (key, payload, size, now, now),
+        )
+        self._evict_disk()
+        self._conn.commit()
+
+    def _disk_size(self) -> int:
+        """디스크 캐시 전체 크기 (여러 워커 프로세스가 같은 파일을 공유하므로 매번 DB에서 계산)"""
+        row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+        return int(row[0])
+
+    def _evict_disk(self):
+        """
+        만료 항목 삭제 후, 디스크 용량 초과 시 오래 사용되지 않은 항목부터 삭제 (90%까지)
+        _disk_set의 쓰기 트랜잭션 안에서 실행되므로 크기 계산과 삭제 사이에 다른 프로세스가 끼어들지 않음
+        """
+        if self.ttl_seconds is not None:
+            cutoff = time.time() - self.ttl_seconds
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE created_at < ?",
+                (cutoff,),
+            ).fetchone()
+            if row[0]:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE created_at < ?", (cutoff,)
+                )
+                self.expirations += row[0]
+
+        disk_bytes = self._disk_size()
+        if disk_bytes <= self.disk_max_bytes:
+            return
+
+        target = int(self.disk_max_bytes * 0.9)
+        rows = self._conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY accessed_at ASC"
+        )
+        to_delete = []
+        for key, size in rows:
+            if disk_bytes <= target:
+                break
+            to_delete.append((key,))
+            disk_bytes -= size
+
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", to_delete)
+        self.evictions += len(to_delete)
+
+    # ------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        """캐시 조회 (메모리 → 디스크 순서, 디스크 적중 시 메모리로 승격)"""
+        with self._lock:
+            value = self._memory_get(key)
+            if value is not None:
+                self.memory_hits += 1
+                return value
+
+            entry = self._disk_get(key)
+            if entry is not None:
+                created_at, value = entry
+                self.disk_hits += 1
+                self._memory_set(key, value, created_at)
+                return value
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        """캐시 저장 (메모리 + 디스크)"""
+        with self._lock:
+            self._memory_set(key, value)
+            self._disk_set(key, value)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """비동기 캐시 조회 (디스크 I/O는 스레드에서 실행)"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any):
+        """비동기 캐시 저장 (디스크 I/O는 스레드에서 실행)"""
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM cache_entries")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중/실패 통계 반환"""
+        with self._lock:
+            disk_entries = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries"
+            ).fetchone()[0]
+            disk_bytes = self._disk_size()
+
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "name": self.name,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / total * 100, 1) if total > 0 else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl_seconds": self.ttl_seconds,
+            "memory_entries": len(self._memory),
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+        }
+
+
+def hash_file(file_path: Path) -> str:
+    """파일 내용의 SHA-256 해시 반환"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """여러 구성 요소로 캐시 키 생성 (SHA-256)"""
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 싱글톤 인스턴스
+_ocr_cache: Optional[ResultCache] = None
+_llm_cache: Optional[ResultCache] = None
+_embedding_cache: Optional[ResultCache] = None
+
+
+def get_ocr_cache() -> Optional[ResultCache]:
+    """OCR 결과 캐시 싱글톤 반환 (비활성화 시 None)"""
+    global _ocr_cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    if _ocr_cache is None:
+        _ocr_cache = ResultCache(
+            name="ocr",
+            db_path=CACHE_DIR / "ocr_cache.sqlite3",
+            memory_max_entries=OCR_CACHE_MEMORY_ENTRIES,
+            disk_max_bytes=int(OCR_CACHE_DISK_MAX_MB * 1024 * 1024),
+        )
+    return _ocr_cache
+
+
+def get_llm_cache() -> Optional[ResultCache]:
+    """LLM 분석 결과 캐시 싱글톤 반환 (비활성화 시 None)"""
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        _llm_cache = ResultCache(
+            name="llm",
+            db_path=CACHE_DIR / "llm_cache.sqlite3",
+            memory_max_entries=LLM_CACHE_MEMORY_ENTRIES,
+            disk_max_bytes=int(LLM_CACHE_DISK_MAX_MB * 1024 * 1024),
+            ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+        )
+    return _llm_cache
+
+
+def get_embedding_cache() -> Optional[ResultCache]:
+    """RAG 쿼리 임베딩 캐시 싱글톤 반환 (비활성화 시 None)"""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    if _embedding_cache is None:
+        _embedding_cache = ResultCache(
+            name="embedding",
+            db_path=CACHE_DIR / "embedding_cache.sqlite3",
+            memory_max_entries=EMBEDDING_CACHE_MEMORY_ENTRIES,
+            disk_max_bytes=int(EMBEDDING_CACHE_DISK_MAX_MB * 1024 * 1024),
+        )
+    return _embedding_cache
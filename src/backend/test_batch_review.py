@@ -0,0 +1,330 @@
+"""
+OpenAI Batch API 오프라인 분석 테스트 스크립트
+로컬 스텁 서버가 OpenAI API(파일 업로드, Batch 생성/조회, 출력 파일, 2차 판정 응답)를 대신함
+
+사용법 (backend 폴더에서 실행, 실제 OpenAI API는 호출하지 않음):
+    python test_batch_review.py
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import json
+import os
+import threading
+
+# ad_analyzer/batch_review 임포트 전에 스텁 서버 주소와 테스트 설정 지정
+STUB_PORT = 18765
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{STUB_PORT}/v1"
+os.environ["OPENAI_API_KEY"] = "test-key"
+os.environ["OPENAI_BATCH_POLL_SECONDS"] = "0.1"
+os.environ["LLM_CACHE_ENABLED"] = "false"
+
+STUB_ANALYSIS = "**위반 사항:**\n- 치료 효과 보장 표현\n\n**전체 평가:**\n- 위험도: 높음"
+STUB_JUDGMENT = (
+    '```json\n{"is_medical_ad": true, "risk_score": 72, '
+    '"violations": [{"type": "효과 보장", "description": "100% 만족 보장", "severity": "HIGH"}], '
+    '"summary": "치료 효과 보장 표현"}\n```'
+)
+
+
+def _analysis_text(custom_id: str) -> str:
+    """요청별로 구분되는 1차 분석 스텁 응답 (결과가 다른 파일에 붙지 않았는지 확인용)"""
+    return f"{STUB_ANALYSIS}\n- 요청: {custom_id}"
+
+
+def _response_body(text: str) -> dict:
+    """Responses API 응답 형식"""
+    return {
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": 0,
+        "model": "stub",
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_stub",
+                "role": "assistant",
+                "status": "completed",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {"input_tokens": 100, "output_tokens": 50, "total_tokens": 150},
+    }
+
+
+class StubOpenAI:
+    """스텁 서버 상태 (업로드 파일, Batch, 호출 기록)"""
+
+    def __init__(self, fail_custom_ids=(), final_status="completed"):
+        self.fail_custom_ids = set(fail_custom_ids)
+        self.final_status = final_status  # 진행 중 다음 조회부터의 종료 상태 (completed, expired 등)
+        self.files = {}
+        self.batches = {}
+        self.retrieve_count = 0
+        self.response_calls = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    stub: StubOpenAI = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, data: dict, status: int = 200):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, text: str):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        stub = self.stub
+        body = self._read_body()
+
+        if self.path == "/v1/files":
+            # multipart 본문에서 JSONL 줄만 추출
+            lines = [
+                line
+                for line in body.decode("utf-8", errors="ignore").splitlines()
+                if line.startswith('{"custom_id"')
+            ]
+            file_id = f"file-in-{len(stub.files)}"
+            stub.files[file_id] = "\n".join(lines)
+            self._send_json(
+                {"id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                 "filename": "review_requests.jsonl", "purpose": "batch", "status": "processed"}
+            )
+
+        elif self.path == "/v1/batches":
+            payload = json.loads(body)
+            batch_id = f"batch_{len(stub.batches)}"
+            requests = [json.loads(line) for line in stub.files[payload["input_file_id"]].splitlines()]
+            stub.batches[batch_id] = {"payload": payload, "requests": requests}
+            self._send_json(self._batch_object(batch_id, "validating"))
+
+        elif self.path == "/v1/responses":
+            # 2차 판정 호출
+            stub.response_calls += 1
+            self._send_json(_response_body(STUB_JUDGMENT))
+
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    def do_GET(self):
+        stub = self.stub
+        if self.path.startswith("/v1/batches/"):
+            batch_id = self.path.rsplit("/", 1)[-1]
+            stub.retrieve_count += 1
+            # 첫 조회는 진행 중, 이후 종료
+            status = "in_progress" if stub.retrieve_count == 1 else stub.final_status
+            self._send_json(self._batch_object(batch_id, status))
+
+        elif self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+            file_id = self.path.split("/")[3]
+            batch_id = file_id.split("-", 2)[-1]
+            requests = stub.batches[batch_id]["requests"]
+            lines = []
+            for request in requests:
+                custom_id = request["custom_id"]
+                if file_id.startswith("file-err") and custom_id in stub.fail_custom_ids:
+                    lines.append({"id": "req", "custom_id": custom_id, "response": None,
+                                  "error": {"code": "server_error", "message": "stub failure"}})
+                elif file_id.startswith("file-out") and custom_id not in stub.fail_custom_ids:
+                    lines.append({"id": "req", "custom_id": custom_id,
+                                  "response": {"status_code": 200, "request_id": "req",
+                                               "body": _response_body(_analysis_text(custom_id))},
+                                  "error": None})
+            self._send_text("\n".join(json.dumps(line, ensure_ascii=False) for line in lines))
+
+        else:
+            self._send_json({"error": {"message": "not found"}}, 404)
+
+    def _batch_object(self, batch_id: str, status: str) -> dict:
+        total = len(self.stub.batches[batch_id]["requests"])
+        finished = status == self.stub.final_status
+        failed = len(self.stub.fail_custom_ids) if finished else 0
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": "/v1/responses",
+            "input_file_id": self.stub.batches[batch_id]["payload"]["input_file_id"],
+            "completion_window": "24h",
+            "status": status,
+            "created_at": 0,
+            "output_file_id": f"file-out-{batch_id}" if finished else None,
+            "error_file_id": f"file-err-{batch_id}" if finished and failed else None,
+            "request_counts": {
+                "total": total,
+                "completed": total - failed if finished else 0,
+                "failed": failed,
+            },
+        }
+
+
+def start_stub_server(stub: StubOpenAI) -> ThreadingHTTPServer:
+    StubHandler.stub = stub
+    server = ThreadingHTTPServer(("127.0.0.1", STUB_PORT), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# 파일별 고정 custom_id (main._file_id 형식)
+ITEMS = [
+    {"custom_id": "f0000", "text": "최고의 성형외과! 100% 만족 보장!", "rag_context": ""},
+    {"custom_id": "f0001", "text": "당일 수술 가능, 무료 상담 이벤트", "rag_context": "의료법 제56조"},
+    {"custom_id": "f0002", "text": "완치 보장! 영구적 효과!", "rag_context": ""},
+]
+
+
+def _run_offline(stub: StubOpenAI, items, **kwargs):
+    """스텁 서버를 띄워 run_offline_analysis 실행"""
+    from batch_review import run_offline_analysis
+
+    server = start_stub_server(stub)
+    try:
+        return asyncio.run(run_offline_analysis("test_batch", items, **kwargs))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _assert_checks(checks):
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+    for name, ok in checks:
+        assert ok, name
+
+
+def test_offline_analysis():
+    """JSONL 제출 → 완료 대기 → 출력 파싱 → 2차 판정"""
+    print("\n" + "=" * 80)
+    print("Batch API 오프라인 분석 테스트")
+    print("=" * 80)
+
+    stub = StubOpenAI(fail_custom_ids={"f0002"})
+    submitted = []
+    progress = []
+
+    results = _run_offline(
+        stub,
+        ITEMS,
+        on_submitted=lambda batch_id, custom_ids: submitted.append((batch_id, custom_ids)),
+        on_progress=lambda done, total: progress.append((done, total)),
+    )
+
+    _assert_checks(
+        [
+            ("Batch 1건 제출 (custom_id 목록 포함)",
+             submitted == [("batch_0", ["f0000", "f0001", "f0002"])]),
+            ("JSONL 요청 3건", len(stub.batches["batch_0"]["requests"]) == 3),
+            ("Responses 엔드포인트 지정", stub.batches["batch_0"]["payload"]["endpoint"] == "/v1/responses"),
+            ("완료까지 상태 재조회", stub.retrieve_count == 2 and progress[-1] == (3, 3)),
+            ("성공 파일 2건만 2차 판정", stub.response_calls == 2),
+            ("1차 분석 텍스트 반영", results["f0000"].ai_analysis == _analysis_text("f0000")),
+            ("2차 판정 위험점수 반영", results["f0001"].risk_score == 72 and results["f0001"].judgment == "수정권고"),
+            ("실패 요청은 키워드 결과 유지", results["f0002"].ai_analysis.startswith("AI 분석 실패")
+             and results["f0002"].risk_score == results["f0002"].keyword_risk_score),
+        ]
+    )
+
+
+def test_offline_expired_partial():
+    """만료된 Batch: 처리된 요청의 출력은 사용하고 만료된 요청만 실패 처리"""
+    print("\n" + "=" * 80)
+    print("Batch API 만료(부분 결과) 테스트")
+    print("=" * 80)
+
+    stub = StubOpenAI(fail_custom_ids={"f0002"}, final_status="expired")
+    results = _run_offline(stub, ITEMS)
+
+    _assert_checks(
+        [
+            ("처리된 요청의 1차 분석 반영",
+             all(results[cid].ai_analysis == _analysis_text(cid) for cid in ("f0000", "f0001"))),
+            ("처리된 요청만 2차 판정", stub.response_calls == 2),
+            ("만료된 요청은 키워드 결과 유지", results["f0002"].ai_analysis.startswith("AI 분석 실패")),
+        ]
+    )
+
+
+def test_offline_resume():
+    """제출된 Batch 재개: 남은 파일 순서/개수가 달라도 파일별 결과가 섞이지 않음"""
+    print("\n" + "=" * 80)
+    print("Batch API 재개 테스트")
+    print("=" * 80)
+
+    stub = StubOpenAI()
+    submitted = []
+    _run_offline(
+        stub, ITEMS, on_submitted=lambda batch_id, custom_ids: submitted.append(custom_ids)
+    )
+    calls_before = stub.response_calls
+
+    # f0000은 이미 결과가 있어 제외, 나머지는 OCR 완료 순서가 바뀐 상태로 재개
+    remaining = [ITEMS[2], ITEMS[1]]
+    resubmitted = []
+    results = _run_offline(
+        stub,
+        remaining,
+        openai_batch_id="batch_0",
+        submitted_ids=submitted[0],
+        on_submitted=lambda batch_id, custom_ids: resubmitted.append(batch_id),
+    )
+
+    batches_after_resume = len(stub.batches)
+    judged_on_resume = stub.response_calls - calls_before
+
+    # 제출하지 않았던 파일이 섞이면 새로 제출
+    extra = {"custom_id": "f0003", "text": "무통 시술 보장", "rag_context": ""}
+    results_new = _run_offline(
+        stub,
+        [ITEMS[1], extra],
+        openai_batch_id="batch_0",
+        submitted_ids=submitted[0],
+        on_submitted=lambda batch_id, custom_ids: resubmitted.append(batch_id),
+    )
+
+    _assert_checks(
+        [
+            ("기존 Batch 재사용 (재제출 없음)", batches_after_resume == 1),
+            ("남은 파일만 결과 반환", set(results) == {"f0001", "f0002"}),
+            ("파일별 1차 분석이 자기 custom_id 결과",
+             all(results[cid].ai_analysis == _analysis_text(cid) for cid in results)),
+            ("남은 파일만 2차 판정", judged_on_resume == 2),
+            ("제출하지 않은 파일이 있으면 새 Batch 제출", resubmitted == ["batch_1"]
+             and {r["custom_id"] for r in stub.batches["batch_1"]["requests"]} == {"f0001", "f0003"}),
+            ("새 Batch 결과 반영", results_new["f0003"].ai_analysis == _analysis_text("f0003")),
+        ]
+    )
+
+
+def main():
+    tests = [test_offline_analysis, test_offline_expired_partial, test_offline_resume]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__}: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print("테스트 완료!" if not failed else f"테스트 실패 ({failed}건)")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
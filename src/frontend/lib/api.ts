@@ -1,6 +1,10 @@
 import type {
   BatchStatus,
   BatchFileResult,
+  BatchResultEvent,
+  BatchStatusEvent,
+  BatchStatusDelta,
+  FileStatus,
   DocumentListResponse,
   DocumentUploadResponse,
   DocumentDeleteResponse,
@@ -76,6 +80,86 @@ export async function getBatchStatus(batchId: string): Promise<BatchStatus> {
   return response.json();
 }
 
+// 배치 상태 증분 조회 (since 커서 이후 변경분만)
+export async function getBatchStatusDelta(
+  batchId: string,
+  since: number,
+  options: { compact?: boolean; includeAi?: boolean } = {}
+): Promise<BatchStatusDelta> {
+  const { compact = false, includeAi = false } = options;
+  const searchParams = new URLSearchParams({
+    since: since.toString(),
+    compact: compact.toString(),
+    include_ai: includeAi.toString(),
+  });
+
+  const response = await fetch(
+    `${getApiBaseUrl()}/api/batch-status/${batchId}?${searchParams.toString()}`
+  );
+
+  if (!response.ok) {
+    throw new Error('상태 조회 실패');
+  }
+
+  return response.json();
+}
+
+// 배치 진행 이벤트 구독 (Server-Sent Events)
+export interface BatchEventHandlers {
+  onSnapshot: (status: BatchStatus) => void;
+  onFileStatus: (fileStatus: FileStatus) => void;
+  onResult: (event: BatchResultEvent) => void;
+  onStatus: (event: BatchStatusEvent) => void;
+  onError: () => void;
+}
+
+export function isBatchEventsSupported(): boolean {
+  return typeof window !== 'undefined' && typeof EventSource !== 'undefined';
+}
+
+/**
+ * 배치 진행 이벤트 스트림 구독
+ * - 최초 snapshot 이후 변경분만 수신
+ * - 반환된 함수로 구독 종료
+ */
+export function subscribeBatchEvents(
+  batchId: string,
+  handlers: BatchEventHandlers
+): () => void {
+  const source = new EventSource(
+    `${getApiBaseUrl()}/api/batch-events/${encodeURIComponent(batchId)}`
+  );
+
+  source.addEventListener('snapshot', (e) => {
+    const data: BatchStatus = JSON.parse((e as MessageEvent).data);
+    if (data.status === 'completed' || data.status === 'failed') {
+      source.close();
+    }
+    handlers.onSnapshot(data);
+  });
+  source.addEventListener('file_status', (e) => {
+    handlers.onFileStatus(JSON.parse((e as MessageEvent).data));
+  });
+  source.addEventListener('result', (e) => {
+    handlers.onResult(JSON.parse((e as MessageEvent).data));
+  });
+  source.addEventListener('status', (e) => {
+    const data: BatchStatusEvent = JSON.parse((e as MessageEvent).data);
+    // 종료 상태 수신 후 서버가 연결을 닫으면 자동 재연결하지 않도록 먼저 종료
+    if (data.status === 'completed' || data.status === 'failed') {
+      source.close();
+    }
+    handlers.onStatus(data);
+  });
+  source.onerror = () => {
+    if (source.readyState === EventSource.CLOSED) {
+      handlers.onError();
+    }
+  };
+
+  return () => source.close();
+}
+
 export async function classifyFiles(
   batchId: string,
   classifications: FileClassification[]
@@ -1,6 +1,12 @@
 import { create } from 'zustand';
-import { OCREngine, BatchFileResult, FileStatus } from '@/types';
-import { startBatchAnalysis, getBatchStatus, classifyFiles } from '@/lib/api';
+import { OCREngine, BatchFileResult, BatchStatus, FileStatus } from '@/types';
+import {
+  startBatchAnalysis,
+  getBatchStatusDelta,
+  classifyFiles,
+  isBatchEventsSupported,
+  subscribeBatchEvents,
+} from '@/lib/api';
 import { getCategory } from '@/components/ui/Badge';
 
 interface Message {
@@ -33,6 +39,7 @@ interface AnalysisState {
 
   // Polling
   pollIntervalId: NodeJS.Timeout | null;
+  closeEventStream: (() => void) | null;
 }
 
 interface AnalysisActions {
@@ -76,6 +83,7 @@ const initialState: AnalysisState = {
   isClassifying: false,
   message: null,
   pollIntervalId: null,
+  closeEventStream: null,
 };
 
 export const useAnalysisStore = create<AnalysisState & AnalysisActions>((set, get) => ({
@@ -132,48 +140,130 @@ export const useAnalysisStore = create<AnalysisState & AnalysisActions>((set, ge
       if (response.batch_id) {
         set({ batchId: response.batch_id, lastBatchId: response.batch_id });
 
-        // Start polling
-        const pollIntervalId = setInterval(async () => {
-          try {
-            const status = await getBatchStatus(response.batch_id);
+        const batchId = response.batch_id;
+
+        // 완료/실패 처리 (스트림, 폴링 공통)
+        const finishBatch = (
+          status: Pick<BatchStatus, 'status' | 'results' | 'errors'>
+        ) => {
+          get().stopPolling();
+
+          set({
+            isAnalyzing: false,
+            batchId: null,
+            results: status.results || [],
+          });
+
+          if (status.status === 'completed') {
+            const errorCount = status.results?.filter((r) => !r.success).length || 0;
+            const successCount = (status.results?.length || 0) - errorCount;
+            set({
+              message: {
+                type: 'success',
+                text: `분석 완료: ${successCount}개 성공, ${errorCount}개 실패`,
+              },
+            });
+          } else {
+            set({
+              message: {
+                type: 'error',
+                text: status.errors?.[0] || '분석 중 오류가 발생했습니다.',
+              },
+            });
+          }
+        };
+
+        // 폴링 (이벤트 스트림 미지원/실패 시, 커서 이후 변경분만 조회)
+        const startPolling = () => {
+          let cursor = 0;
+          let polledResults: BatchFileResult[] = [];
+          let inFlight = false;
+
+          const pollIntervalId = setInterval(async () => {
+            // 이전 요청이 끝나기 전에는 같은 커서로 중복 조회하지 않음
+            if (inFlight) return;
+            inFlight = true;
+
+            try {
+              const delta = await getBatchStatusDelta(batchId, cursor);
+              cursor = delta.cursor;
+
+              if (delta.full) {
+                polledResults = delta.results;
+                set({ fileStatuses: delta.file_statuses });
+              } else {
+                polledResults = [...polledResults, ...delta.results];
+                if (delta.file_statuses.length > 0) {
+                  set((state) => {
+                    const changed = new Map(delta.file_statuses.map((f) => [f.filename, f]));
+                    return {
+                      fileStatuses: state.fileStatuses.map((f) => changed.get(f.filename) ?? f),
+                    };
+                  });
+                }
+              }
+
+              if (delta.status === 'completed' || delta.status === 'failed') {
+                finishBatch({ status: delta.status, results: polledResults, errors: delta.errors });
+              }
+            } catch (error) {
+              console.error('Polling error:', error);
+            } finally {
+              inFlight = false;
+            }
+          }, 1000);
 
+          set({ pollIntervalId });
+        };
+
+        if (!isBatchEventsSupported()) {
+          startPolling();
+          return;
+        }
+
+        // 이벤트 스트림 구독 (변경분만 수신하여 로컬 상태에 반영)
+        let streamResults: BatchFileResult[] = [];
+
+        const closeEventStream = subscribeBatchEvents(batchId, {
+          onSnapshot: (status) => {
+            streamResults = status.results || [];
             if (status.file_statuses) {
               set({ fileStatuses: status.file_statuses });
             }
-
             if (status.status === 'completed' || status.status === 'failed') {
-              get().stopPolling();
-
-              set({
-                isAnalyzing: false,
-                batchId: null,
-                results: status.results || [],
-              });
-
-              if (status.status === 'completed') {
-                const errorCount = status.results?.filter((r) => !r.success).length || 0;
-                const successCount = (status.results?.length || 0) - errorCount;
-                set({
-                  message: {
-                    type: 'success',
-                    text: `분석 완료: ${successCount}개 성공, ${errorCount}개 실패`,
-                  },
-                });
-              } else {
-                set({
-                  message: {
-                    type: 'error',
-                    text: status.errors?.[0] || '분석 중 오류가 발생했습니다.',
-                  },
-                });
-              }
+              finishBatch(status);
             }
-          } catch (error) {
-            console.error('Polling error:', error);
-          }
-        }, 1000);
+          },
+          onFileStatus: (fileStatus) => {
+            set((state) => {
+              const exists = state.fileStatuses.some((f) => f.filename === fileStatus.filename);
+              return {
+                fileStatuses: exists
+                  ? state.fileStatuses.map((f) =>
+                      f.filename === fileStatus.filename ? fileStatus : f
+                    )
+                  : [...state.fileStatuses, fileStatus],
+              };
+            });
+          },
+          onResult: (event) => {
+            streamResults = [...streamResults, event.result];
+          },
+          onStatus: (event) => {
+            if (event.status === 'completed' || event.status === 'failed') {
+              finishBatch({ status: event.status, results: streamResults, errors: event.errors });
+            }
+          },
+          onError: () => {
+            // 스트림 연결 실패 시 폴링으로 전환
+            set({ closeEventStream: null });
+            if (get().batchId === batchId) {
+              startPolling();
+            }
+          },
+        });
 
-        set({ pollIntervalId });
+        set({ closeEventStream });
       } else {
         throw new Error('배치 ID를 받지 못했습니다.');
       }
@@ -189,11 +279,15 @@ export const useAnalysisStore = create<AnalysisState & AnalysisActions>((set, ge
   },
 
   stopPolling: () => {
-    const { pollIntervalId } = get();
+    const { pollIntervalId, closeEventStream } = get();
     if (pollIntervalId) {
       clearInterval(pollIntervalId);
       set({ pollIntervalId: null });
     }
+    if (closeEventStream) {
+      closeEventStream();
+      set({ closeEventStream: null });
+    }
   },
 
   // Result actions
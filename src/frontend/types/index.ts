@@ -72,6 +72,7 @@ export type FileStatusType = 'uploading' | 'pending' | 'ocr' | 'analyzing' | 'co
 
 export interface FileStatus {
   filename: string;
+  file_id?: string;  // 배치 내 파일 고유 ID
   status: FileStatusType;
   progress: number;
   error?: string;
@@ -79,7 +80,7 @@ export interface FileStatus {
 
 export interface BatchStatus {
   batch_id: string;
-  status: 'uploading' | 'processing' | 'completed' | 'failed';
+  status: 'uploading' | 'queued' | 'processing' | 'completed' | 'failed';
   total_files: number;
   processed_files: number;
   progress_percent: number;
@@ -88,10 +89,44 @@ export interface BatchStatus {
   start_time?: string;
   estimated_completion?: string;
   elapsed_seconds?: number;
-  current_phase?: 'uploading' | 'analyzing';
+  current_phase?: 'uploading' | 'analyzing' | 'batch_api';
   file_statuses?: FileStatus[];  // 파일별 상태
 }
 
+// 배치 상태 증분 응답 (/api/batch-status/{batch_id}?since=...)
+export interface BatchStatusDelta {
+  batch_id: string;
+  status: BatchStatus['status'];
+  total_files: number;
+  processed_files: number;
+  progress_percent: number;
+  elapsed_seconds?: number;
+  estimated_completion?: string;
+  current_phase?: 'uploading' | 'analyzing' | 'batch_api';
+  cursor: number;  // 다음 요청의 since 값
+  full: boolean;  // true면 file_statuses/results가 전체 목록
+  file_statuses: FileStatus[];  // 변경된 파일 상태만
+  results: BatchFileResult[];  // 새 결과만
+  errors: string[];
+}
+
+// 배치 진행 이벤트 (SSE /api/batch-events/{batch_id})
+export interface BatchResultEvent {
+  result: BatchFileResult;
+  processed_files: number;
+  total_files: number;
+  progress_percent: number;
+  elapsed_seconds?: number;
+  estimated_completion?: string;
+}
+
+export interface BatchStatusEvent {
+  status: BatchStatus['status'];
+  processed_files: number;
+  progress_percent: number;
+  errors: string[];
+}
+
 // Admin Document Types
 export interface Document {
   filename: string;